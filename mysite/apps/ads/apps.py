@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
 
 
 class AdsConfig(AppConfig):
@@ -13,3 +14,21 @@ class AdsConfig(AppConfig):
 
     default_auto_field: str = "django.db.models.BigAutoField"
     name: str = "apps.ads"
+
+    def ready(self) -> None:
+        """
+        Подключает обработчики, поддерживающие статистику кампаний актуальной.
+
+        Returns:
+            None
+        """
+        from . import signals
+
+        post_save.connect(signals.advertisement_saved, sender="ads.Advertisement")
+        pre_save.connect(signals.lead_pre_save, sender="leads.Lead")
+        post_save.connect(signals.lead_saved, sender="leads.Lead")
+        post_delete.connect(signals.lead_deleted, sender="leads.Lead")
+        pre_save.connect(signals.customer_pre_save, sender="customers.Customer")
+        post_save.connect(signals.customer_saved, sender="customers.Customer")
+        post_delete.connect(signals.customer_deleted, sender="customers.Customer")
+        post_save.connect(signals.contract_saved, sender="contracts.Contract")
@@ -1,6 +1,9 @@
 from typing import Type
 
 from django import forms
+from django.urls import reverse_lazy
+
+from apps.core.widgets import AutocompleteSelect
 
 from .models import Advertisement
 
@@ -17,7 +20,13 @@ class AdvertisementForm(forms.ModelForm):
         Attributes:
             model (Type[Advertisement]): Модель, связанная с формой.
             fields (list[str]): Поля, доступные для редактирования.
+            widgets (dict[str, Widget]): Виджеты полей формы.
         """
 
         model: Type[Advertisement] = Advertisement
         fields: list[str] = ["name", "product", "channel", "budget"]
+        widgets: dict[str, forms.Widget] = {
+            "product": AutocompleteSelect(
+                url=reverse_lazy("products:product_autocomplete")
+            ),
+        }
@@ -0,0 +1,147 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count, DecimalField, Sum
+
+from apps.ads.models import Advertisement
+from apps.contracts.models import Contract
+from apps.core.seeding import CrmSeeder
+from apps.customers.models import Customer
+from apps.leads.models import Lead
+
+
+def legacy_stats_queryset():
+    """
+    Возвращает прежний вариант статистики: одно соединение
+    leads -> customers -> contracts с агрегатами поверх него.
+
+    Returns:
+        AdvertisementQuerySet: QuerySet с аннотированными данными.
+    """
+    return Advertisement.objects.annotate(
+        leads_count=Count("leads", distinct=True),
+        customers_count=Count("leads__customer_leads", distinct=True),
+        contracts_sum=Sum(
+            "leads__customer_leads__contract__price",
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        ),
+    )
+
+
+class Command(BaseCommand):
+    """
+    Команда для сравнения прежнего и нового запроса статистики кампаний.
+
+    Заполняет базу детерминированными данными (по умолчанию 100 тыс.
+    кампаний и 10 млн лидов), выполняет оба запроса несколько раз
+    и выводит JSON с временем выполнения, планами запросов и количеством
+    кампаний, для которых результаты расходятся.
+
+    Attributes:
+        help (str): Краткое описание команды.
+    """
+
+    help = "Benchmark legacy join-based and subquery-based campaign statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--campaigns", type=int, default=100_000)
+        parser.add_argument("--leads", type=int, default=10_000_000)
+        parser.add_argument(
+            "--customer-ratio",
+            type=float,
+            default=0.2,
+            help="Share of leads converted to customers",
+        )
+        parser.add_argument(
+            "--customers-per-contract",
+            type=int,
+            default=3,
+            help="Maximum number of customers sharing one contract",
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument(
+            "--skip-seed",
+            action="store_true",
+            help="Benchmark the data already present in the database",
+        )
+        parser.add_argument(
+            "--no-analyze",
+            action="store_true",
+            help="Print estimated plans without executing EXPLAIN ANALYZE",
+        )
+
+    def handle(self, *args, **options):
+        if not options["skip_seed"]:
+            self.seed(options)
+
+        report = {
+            "vendor": connection.vendor,
+            "campaigns": Advertisement.objects.count(),
+            "leads": Lead.objects.count(),
+            "customers": Customer.objects.count(),
+            "contracts": Contract.objects.count(),
+            "queries": {},
+        }
+        results = {}
+        querysets = {
+            "legacy": legacy_stats_queryset(),
+            "subquery": Advertisement.objects.with_stats(live=True),
+        }
+        for label, queryset in querysets.items():
+            rows = queryset.order_by("pk").values_list(
+                "pk", "leads_count", "customers_count", "contracts_sum"
+            )
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                results[label] = list(rows.all())
+                timings.append(time.perf_counter() - started)
+            report["queries"][label] = {
+                "min_s": round(min(timings), 4),
+                "median_s": round(statistics.median(timings), 4),
+                "plan": self.explain(rows, analyze=not options["no_analyze"]),
+            }
+        report["mismatched_campaigns"] = sum(
+            old != new for old, new in zip(results["legacy"], results["subquery"])
+        )
+        self.stdout.write(json.dumps(report, ensure_ascii=False, indent=2))
+
+    @staticmethod
+    def explain(queryset, analyze: bool) -> str:
+        """
+        Возвращает план выполнения запроса.
+
+        Args:
+            queryset (QuerySet): Исследуемый запрос.
+            analyze (bool): Выполнять ли запрос (только PostgreSQL).
+
+        Returns:
+            str: Текст плана.
+        """
+        if connection.vendor == "postgresql" and analyze:
+            return queryset.explain(analyze=True, buffers=True)
+        return queryset.explain()
+
+    def seed(self, options) -> None:
+        """
+        Заполняет базу детерминированным набором данных.
+
+        Часть контрактов делится между несколькими клиентами одной
+        кампании, чтобы расхождение прежнего запроса было видно.
+
+        Args:
+            options (dict): Параметры команды.
+        """
+        seeder = CrmSeeder(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            customer_ratio=options["customer_ratio"],
+            customers_per_contract=options["customers_per_contract"],
+            log=self.stderr.write,
+        )
+        seeder.seed(products=1, campaigns=options["campaigns"], leads=options["leads"])
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from apps.ads.services import AdvertisementStatsService
+
+
+class Command(BaseCommand):
+    """
+    Команда для полного пересчета сохраненной статистики рекламных кампаний.
+
+    Нужна после массовых операций, которые обходят сигналы моделей
+    (bulk_create, QuerySet.update, загрузка дампов).
+
+    Attributes:
+        help (str): Краткое описание команды.
+    """
+
+    help = "Rebuild persisted statistics for all advertisement campaigns"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of campaigns recalculated per query",
+        )
+
+    def handle(self, *args, **options):
+        total = AdvertisementStatsService.rebuild_stats(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt statistics for {total} campaigns")
+        )
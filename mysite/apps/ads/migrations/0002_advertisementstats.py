@@ -0,0 +1,105 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_stats(apps, schema_editor):
+    """
+    Заполняет статистику для уже существующих кампаний.
+    """
+    Advertisement = apps.get_model("ads", "Advertisement")
+    AdvertisementStats = apps.get_model("ads", "AdvertisementStats")
+    campaigns = Advertisement.objects.annotate(
+        leads_total=Count("leads", distinct=True),
+        customers_total=Count("leads__customer_leads", distinct=True),
+        contracts_total=Sum("leads__customer_leads__contract__price"),
+    ).values_list("pk", "budget", "leads_total", "customers_total", "contracts_total")
+    AdvertisementStats.objects.bulk_create(
+        [
+            AdvertisementStats(
+                advertisement_id=pk,
+                leads_count=leads_total,
+                customers_count=customers_total,
+                contracts_sum=contracts_total,
+                profit=(
+                    None
+                    if contracts_total is None
+                    else round(contracts_total / budget, 2) if budget else 0
+                ),
+            )
+            for pk, budget, leads_total, customers_total, contracts_total in campaigns
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0001_initial"),
+        ("contracts", "0001_initial"),
+        ("customers", "0001_initial"),
+        ("leads", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AdvertisementStats",
+            fields=[
+                (
+                    "advertisement",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="ads.advertisement",
+                        verbose_name="Рекламная кампания",
+                    ),
+                ),
+                (
+                    "leads_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество лидов"
+                    ),
+                ),
+                (
+                    "customers_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество активных клиентов"
+                    ),
+                ),
+                (
+                    "contracts_sum",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=14,
+                        null=True,
+                        verbose_name="Сумма контрактов",
+                    ),
+                ),
+                (
+                    "profit",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=10,
+                        null=True,
+                        verbose_name="Соотношение контрактов к затратам",
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="Обновлено"),
+                ),
+            ],
+            options={
+                "verbose_name": "Статистика рекламной кампании",
+                "verbose_name_plural": "Статистика рекламных кампаний",
+            },
+        ),
+        migrations.RunPython(populate_stats, migrations.RunPython.noop),
+    ]
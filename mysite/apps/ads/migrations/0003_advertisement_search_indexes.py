@@ -0,0 +1,29 @@
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations
+from django.db.models.functions import Upper
+
+from apps.core.indexes import TrigramIndex
+from apps.core.operations import AddIndexConcurrently, TrigramExtension
+
+
+class Migration(migrations.Migration):
+    """
+    Триграммный индекс для поиска кампаний по названию.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("ads", "0002_advertisementstats"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="advertisement",
+            index=TrigramIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="ads_advertisement_name_trgm",
+            ),
+        ),
+    ]
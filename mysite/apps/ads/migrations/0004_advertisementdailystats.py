@@ -0,0 +1,127 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:09
+
+from collections import defaultdict
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def populate_daily_stats(apps, schema_editor):
+    """
+    Заполняет статистику по дням для уже существующих кампаний.
+    """
+    Lead = apps.get_model("leads", "Lead")
+    Customer = apps.get_model("customers", "Customer")
+    AdvertisementDailyStats = apps.get_model("ads", "AdvertisementDailyStats")
+    days = defaultdict(
+        lambda: {"leads_count": 0, "customers_count": 0, "revenue": Decimal(0)}
+    )
+    leads = (
+        Lead.objects.filter(advertisement__isnull=False)
+        .annotate(day=TruncDate("created_at"))
+        .values_list("advertisement_id", "day")
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+    for campaign_id, day, total in leads:
+        days[campaign_id, day]["leads_count"] = total
+    customers = (
+        Customer.objects.filter(lead__advertisement__isnull=False)
+        .annotate(day=TruncDate("created_at"))
+        .values_list("lead__advertisement_id", "day")
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+    for campaign_id, day, total in customers:
+        days[campaign_id, day]["customers_count"] = total
+    contracts = (
+        Customer.objects.filter(
+            lead__advertisement__isnull=False, contract__isnull=False
+        )
+        .annotate(day=TruncDate("contract__created_at"))
+        .values_list("lead__advertisement_id", "contract_id", "day", "contract__price")
+        .order_by()
+        .distinct()
+    )
+    for campaign_id, _, day, price in contracts:
+        days[campaign_id, day]["revenue"] += price
+    AdvertisementDailyStats.objects.bulk_create(
+        [
+            AdvertisementDailyStats(advertisement_id=campaign_id, day=day, **values)
+            for (campaign_id, day), values in days.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0003_advertisement_search_indexes"),
+        ("contracts", "0003_contract_created_at"),
+        ("customers", "0002_customer_created_at"),
+        ("leads", "0004_lead_created_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AdvertisementDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(verbose_name="День")),
+                (
+                    "leads_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество лидов"
+                    ),
+                ),
+                (
+                    "customers_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество активных клиентов"
+                    ),
+                ),
+                (
+                    "revenue",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=14,
+                        verbose_name="Выручка",
+                    ),
+                ),
+                (
+                    "advertisement",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="ads.advertisement",
+                        verbose_name="Рекламная кампания",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Статистика рекламной кампании за день",
+                "verbose_name_plural": "Статистика рекламных кампаний по дням",
+                "indexes": [models.Index(fields=["day"], name="ads_daily_stats_day")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("advertisement", "day"),
+                        name="ads_daily_stats_campaign_day",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_daily_stats, migrations.RunPython.noop),
+    ]
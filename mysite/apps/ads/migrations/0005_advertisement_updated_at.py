@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ads", "0004_advertisementdailystats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="advertisement",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Изменен"),
+        ),
+    ]
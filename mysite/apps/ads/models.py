@@ -1,10 +1,24 @@
+from datetime import date, datetime
 from decimal import Decimal
 
+from django.apps import apps
+from django.conf import settings
 from django.db import models
-from django.db.models import Case, Count, DecimalField, F, Sum, When
-from django.db.models.functions import Round
+from django.db.models import (
+    Case,
+    Count,
+    DecimalField,
+    F,
+    Func,
+    OuterRef,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Round
 from django.urls import reverse
 
+from apps.core.indexes import trigram_index
 from apps.products.models import Product
 
 
@@ -13,19 +27,77 @@ class AdvertisementQuerySet(models.QuerySet):
     Кастомный QuerySet для модели Advertisement.
     """
 
-    def with_stats(self):
+    def with_stats(self, live: bool | None = None):
         """
         Возвращает QuerySet с дополнительными статистическими данными.
 
+        По умолчанию данные читаются из таблицы AdvertisementStats,
+        которая обновляется при изменении лидов, клиентов и контрактов.
+
+        Args:
+            live (bool | None): Если True, статистика считается агрегацией
+            по связанным таблицам. Если None, используется настройка
+            ADS_LIVE_STATS.
+
         Returns:
             AdvertisementQuerySet: QuerySet с аннотированными данными.
         """
+        if live is None:
+            live = getattr(settings, "ADS_LIVE_STATS", False)
+        if live:
+            return self.with_live_stats()
         return self.annotate(
-            leads_count=Count("leads", distinct=True),
-            customers_count=Count("leads__customer_leads", distinct=True),
-            contracts_sum=Sum(
-                "leads__customer_leads__contract__price",
-                output_field=models.DecimalField(max_digits=10, decimal_places=2),
+            leads_count=Coalesce(F("stats__leads_count"), Value(0)),
+            customers_count=Coalesce(F("stats__customers_count"), Value(0)),
+            contracts_sum=F("stats__contracts_sum"),
+            profit=F("stats__profit"),
+        )
+
+    def with_live_stats(self):
+        """
+        Возвращает QuerySet со статистикой, посчитанной по связанным таблицам.
+
+        Каждая метрика считается отдельным коррелированным подзапросом,
+        поэтому соединения не размножают строки: контракт, общий для
+        нескольких клиентов кампании, учитывается в сумме один раз.
+
+        Returns:
+            AdvertisementQuerySet: QuerySet с аннотированными данными.
+        """
+        lead_model = apps.get_model("leads", "Lead")
+        customer_model = apps.get_model("customers", "Customer")
+        contract_model = apps.get_model("contracts", "Contract")
+
+        leads = (
+            lead_model.objects.filter(advertisement=OuterRef("pk"))
+            .order_by()
+            .values("advertisement")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        customers = (
+            customer_model.objects.filter(lead__advertisement=OuterRef("pk"))
+            .order_by()
+            .values("lead__advertisement")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        campaign_contracts = customer_model.objects.filter(
+            lead__advertisement=OuterRef(OuterRef("pk"))
+        ).values("contract_id")
+        # SUM без GROUP BY: подзапрос всегда возвращает ровно одну строку.
+        contracts_sum = (
+            contract_model.objects.filter(pk__in=campaign_contracts)
+            .order_by()
+            .annotate(total=Func(F("price"), function="SUM"))
+            .values("total")
+        )
+        return self.annotate(
+            leads_count=Coalesce(Subquery(leads), Value(0)),
+            customers_count=Coalesce(Subquery(customers), Value(0)),
+            contracts_sum=Subquery(
+                contracts_sum,
+                output_field=DecimalField(max_digits=14, decimal_places=2),
             ),
             profit=Round(
                 Case(
@@ -52,14 +124,18 @@ class AdvertisementManager(models.Manager):
         """
         return AdvertisementQuerySet(self.model, using=self._db)
 
-    def with_stats(self):
+    def with_stats(self, live: bool | None = None):
         """
         Возвращает QuerySet с дополнительными статистическими данными.
 
+        Args:
+            live (bool | None): Считать ли статистику агрегацией
+            по связанным таблицам вместо чтения из AdvertisementStats.
+
         Returns:
             AdvertisementQuerySet: QuerySet с аннотированными данными.
         """
-        return self.get_queryset().with_stats()
+        return self.get_queryset().with_stats(live=live)
 
 
 class Advertisement(models.Model):
@@ -71,6 +147,7 @@ class Advertisement(models.Model):
         product (Product): Продукт, связанный с кампанией.
         channel (str): Канал продвижения.
         budget (Decimal): Бюджет кампании.
+        updated_at (datetime): Время последнего изменения кампании.
     """
 
     name: str = models.CharField(max_length=200, verbose_name="Название")
@@ -84,6 +161,7 @@ class Advertisement(models.Model):
     budget: Decimal = models.DecimalField(
         max_digits=10, decimal_places=2, verbose_name="Бюджет"
     )
+    updated_at: datetime = models.DateTimeField(auto_now=True, verbose_name="Изменен")
 
     objects = AdvertisementManager()
 
@@ -103,10 +181,14 @@ class Advertisement(models.Model):
         Attributes:
             verbose_name (str): Название модели в единственном числе.
             verbose_name_plural (str): Название модели во множественном числе.
+            indexes (list[Index]): Триграммный индекс поиска по названию.
         """
 
         verbose_name: str = "Рекламная кампания"
         verbose_name_plural: str = "Рекламные кампании"
+        indexes: list[models.Index] = [
+            trigram_index("name", "ads_advertisement_name_trgm")
+        ]
 
     def __str__(self) -> str:
         """
@@ -116,3 +198,138 @@ class Advertisement(models.Model):
             str: Название кампании.
         """
         return str(self.name)
+
+
+class AdvertisementStats(models.Model):
+    """
+    Сохраненная статистика рекламной кампании.
+
+    Строка пересчитывается при изменении лидов, клиентов и контрактов
+    кампании, а также командой rebuild_campaign_stats.
+
+    Attributes:
+        advertisement (Advertisement): Рекламная кампания.
+        leads_count (int): Количество лидов.
+        customers_count (int): Количество активных клиентов.
+        contracts_sum (Decimal | None): Сумма контрактов.
+        profit (Decimal | None): Соотношение контрактов к затратам.
+        updated_at (datetime): Время последнего пересчета.
+    """
+
+    advertisement: Advertisement = models.OneToOneField(
+        "ads.Advertisement",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+        verbose_name="Рекламная кампания",
+    )
+    leads_count: int = models.PositiveIntegerField(
+        default=0, verbose_name="Количество лидов"
+    )
+    customers_count: int = models.PositiveIntegerField(
+        default=0, verbose_name="Количество активных клиентов"
+    )
+    contracts_sum: Decimal | None = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Сумма контрактов",
+    )
+    profit: Decimal | None = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name="Соотношение контрактов к затратам",
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Обновлено")
+
+    class Meta:
+        """
+        Метаданные модели.
+
+        Attributes:
+            verbose_name (str): Название модели в единственном числе.
+            verbose_name_plural (str): Название модели во множественном числе.
+        """
+
+        verbose_name: str = "Статистика рекламной кампании"
+        verbose_name_plural: str = "Статистика рекламных кампаний"
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление объекта.
+
+        Returns:
+            str: Идентификатор кампании.
+        """
+        return f"Статистика кампании {self.advertisement_id}"
+
+
+class AdvertisementDailyStats(models.Model):
+    """
+    Статистика рекламной кампании за один день.
+
+    Лиды учитываются по дню создания, клиенты - по дню перевода лида
+    в клиенты, выручка - по дню заключения контракта. Строки
+    пересчитываются вместе с AdvertisementStats.
+
+    Attributes:
+        advertisement (Advertisement): Рекламная кампания.
+        day (date): День.
+        leads_count (int): Количество новых лидов.
+        customers_count (int): Количество новых активных клиентов.
+        revenue (Decimal): Сумма заключенных контрактов.
+    """
+
+    advertisement: Advertisement = models.ForeignKey(
+        "ads.Advertisement",
+        on_delete=models.CASCADE,
+        related_name="daily_stats",
+        verbose_name="Рекламная кампания",
+    )
+    day: date = models.DateField(verbose_name="День")
+    leads_count: int = models.PositiveIntegerField(
+        default=0, verbose_name="Количество лидов"
+    )
+    customers_count: int = models.PositiveIntegerField(
+        default=0, verbose_name="Количество активных клиентов"
+    )
+    revenue: Decimal = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0, verbose_name="Выручка"
+    )
+
+    class Meta:
+        """
+        Метаданные модели.
+
+        Attributes:
+            verbose_name (str): Название модели в единственном числе.
+            verbose_name_plural (str): Название модели во множественном числе.
+            constraints (list[UniqueConstraint]): Одна строка на кампанию
+            и день; индекс ограничения используется для выборки периода
+            по одной кампании.
+            indexes (list[Index]): Индекс для выборки периода по всем
+            кампаниям.
+        """
+
+        verbose_name: str = "Статистика рекламной кампании за день"
+        verbose_name_plural: str = "Статистика рекламных кампаний по дням"
+        constraints: list[models.UniqueConstraint] = [
+            models.UniqueConstraint(
+                fields=["advertisement", "day"], name="ads_daily_stats_campaign_day"
+            )
+        ]
+        indexes: list[models.Index] = [
+            models.Index(fields=["day"], name="ads_daily_stats_day")
+        ]
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление объекта.
+
+        Returns:
+            str: Идентификатор кампании и день.
+        """
+        return f"Статистика кампании {self.advertisement_id} за {self.day}"
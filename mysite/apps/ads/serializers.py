@@ -0,0 +1,38 @@
+from rest_framework import serializers
+
+from apps.core.api import SparseFieldsetSerializer
+
+from .models import Advertisement
+
+
+class AdvertisementSerializer(SparseFieldsetSerializer):
+    """
+    Сериализатор рекламной кампании для API.
+
+    Статистика кампании берется из аннотаций with_stats() и доступна
+    только для чтения.
+    """
+
+    product_name = serializers.CharField(source="product.name", read_only=True)
+    leads_count = serializers.IntegerField(read_only=True)
+    customers_count = serializers.IntegerField(read_only=True)
+    contracts_sum = serializers.DecimalField(
+        max_digits=14, decimal_places=2, read_only=True
+    )
+    profit = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = Advertisement
+        fields = [
+            "id",
+            "name",
+            "product",
+            "product_name",
+            "channel",
+            "budget",
+            "leads_count",
+            "customers_count",
+            "contracts_sum",
+            "profit",
+            "updated_at",
+        ]
@@ -1,6 +1,42 @@
-from typing import Dict
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable
 
-from .models import Advertisement
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate, TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from apps.core.cache import ModelVersionService, get_or_set_versioned
+from apps.customers.models import Customer
+from apps.leads.models import Lead
+
+from .models import Advertisement, AdvertisementDailyStats, AdvertisementStats
+
+STATS_FIELDS: list[str] = [
+    "leads_count",
+    "customers_count",
+    "contracts_sum",
+    "profit",
+]
+
+# Модели, от которых зависит статистика кампании: сохраненная
+# статистика или, при ADS_LIVE_STATS, связанные лиды, клиенты и контракты.
+STATS_CACHE_MODELS: tuple[str, ...] = (
+    "ads.Advertisement",
+    "ads.AdvertisementStats",
+    "leads.Lead",
+    "customers.Customer",
+    "contracts.Contract",
+)
+
+SERIES_PERIODS: dict[str, type[TruncDay]] = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
 
 
 class AdvertisementStatsService:
@@ -13,6 +49,8 @@ class AdvertisementStatsService:
         """
         Возвращает статистику рекламной кампании по ее ID.
 
+        Результат кешируется под ключом с версиями STATS_CACHE_MODELS.
+
         Args:
             campaign_id (int): ID рекламной кампании.
 
@@ -25,9 +63,388 @@ class AdvertisementStatsService:
         Raises:
             Advertisement.DoesNotExist: Если кампания с указанным ID не существует.
         """
+        return get_or_set_versioned(
+            "campaign-stats",
+            STATS_CACHE_MODELS,
+            lambda: cls._get_campaign_stats(campaign_id),
+            campaign_id,
+        )
+
+    @staticmethod
+    def _get_campaign_stats(campaign_id: int) -> Dict[str, int | float]:
+        """
+        Читает статистику рекламной кампании из базы.
+
+        Args:
+            campaign_id (int): ID рекламной кампании.
+
+        Returns:
+            Dict[str, int | float]: Статистика кампании.
+        """
         campaign = Advertisement.objects.with_stats().get(pk=campaign_id)
         return {
             "leads_count": campaign.leads_count,
             "customers_count": campaign.customers_count,
             "profit": campaign.profit,
         }
+
+    @classmethod
+    def get_campaign_series(
+        cls,
+        campaign_ids: Iterable[int],
+        period: str = "day",
+        start: date | None = None,
+        end: date | None = None,
+    ) -> Dict[int, list[dict]]:
+        """
+        Возвращает временные ряды статистики кампаний.
+
+        Ряды строятся по таблице AdvertisementDailyStats, поэтому
+        запрос читает только строки выбранных кампаний за период.
+
+        Args:
+            campaign_ids (Iterable[int]): ID кампаний, не больше
+            ADS_SERIES_MAX_CAMPAIGNS.
+            period (str): Шаг ряда: day, week или month.
+            start (date | None): Первый день периода. По умолчанию
+            год назад от end.
+            end (date | None): Последний день периода. По умолчанию сегодня.
+
+        Returns:
+            Dict[int, list[dict]]: Ряды по ID кампаний. Каждая точка
+            содержит ключи bucket, leads_count, customers_count и revenue.
+
+        Raises:
+            ValueError: Если указан неизвестный шаг ряда, не указаны
+            кампании или их больше ADS_SERIES_MAX_CAMPAIGNS.
+        """
+        if period not in SERIES_PERIODS:
+            raise ValueError(f"Unknown period: {period}")
+        campaign_ids = set(campaign_ids)
+        if not campaign_ids:
+            raise ValueError("At least one campaign is required")
+        if len(campaign_ids) > settings.ADS_SERIES_MAX_CAMPAIGNS:
+            raise ValueError(
+                f"At most {settings.ADS_SERIES_MAX_CAMPAIGNS} campaigns are allowed"
+            )
+        end = end or timezone.localdate()
+        start = start or end - timedelta(days=365)
+        rows = (
+            AdvertisementDailyStats.objects.filter(
+                advertisement_id__in=campaign_ids, day__range=(start, end)
+            )
+            .annotate(bucket=SERIES_PERIODS[period]("day"))
+            .values("advertisement_id", "bucket")
+            .annotate(
+                leads=Sum("leads_count"),
+                customers=Sum("customers_count"),
+                total=Sum("revenue"),
+            )
+            .order_by("advertisement_id", "bucket")
+        )
+        series = defaultdict(list)
+        for row in rows:
+            series[row["advertisement_id"]].append(
+                {
+                    "bucket": row["bucket"],
+                    "leads_count": row["leads"],
+                    "customers_count": row["customers"],
+                    "revenue": row["total"],
+                }
+            )
+        return dict(series)
+
+    @classmethod
+    def refresh_stats(
+        cls,
+        campaign_ids: Iterable[int | None],
+        days: dict[int, set[date]] | None = None,
+    ) -> int:
+        """
+        Пересчитывает сохраненную статистику указанных кампаний.
+
+        Сначала пересчитываются затронутые дни, затем итоговая статистика
+        складывается из строк по дням, поэтому изменение одного объекта
+        не агрегирует все лиды, клиентов и контракты кампании. Пересчеты
+        одной кампании выполняются по очереди под блокировкой ее строки
+        AdvertisementStats, иначе итог мог бы не учесть дни, записанные
+        параллельным пересчетом.
+
+        Кампании, которых уже нет в базе, пропускаются. Статистика
+        сохраняется через bulk_create без сигналов, поэтому версия
+        AdvertisementStats в кеше (общая для статистики по дням)
+        увеличивается явно.
+
+        Args:
+            campaign_ids (Iterable[int | None]): ID рекламных кампаний.
+            days (dict[int, set[date]] | None): Дни, статистику по которым
+            нужно пересчитать, по ID кампаний. Для кампаний, которых нет
+            в словаре, статистика по дням пересчитывается целиком.
+
+        Returns:
+            int: Количество обновленных строк статистики.
+        """
+        ids = {campaign_id for campaign_id in campaign_ids if campaign_id}
+        if not ids:
+            return 0
+        budgets = dict(
+            Advertisement.objects.filter(pk__in=ids).values_list("pk", "budget")
+        )
+        if not budgets:
+            return 0
+        with transaction.atomic():
+            cls._lock_stats(budgets)
+            cls._save_daily_stats(set(budgets), days)
+            saved = cls._save_stats(budgets)
+        ModelVersionService.schedule_bump(AdvertisementStats)
+        return saved
+
+    @classmethod
+    def rebuild_stats(cls, batch_size: int = 1000) -> int:
+        """
+        Полностью пересчитывает статистику всех рекламных кампаний.
+
+        Кампании обрабатываются пачками по возрастанию ID.
+
+        Args:
+            batch_size (int): Количество кампаний в одной пачке.
+
+        Returns:
+            int: Количество обновленных строк статистики.
+        """
+        total = 0
+        last_id = 0
+        while True:
+            ids = list(
+                Advertisement.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                return total
+            total += cls.refresh_stats(ids)
+            last_id = ids[-1]
+
+    @staticmethod
+    def _lock_stats(campaign_ids: Iterable[int]) -> None:
+        """
+        Создает недостающие строки статистики кампаний и блокирует их
+        до конца транзакции.
+
+        Строки блокируются в порядке ID, чтобы пересчеты нескольких
+        кампаний не ждали друг друга по кругу.
+
+        Args:
+            campaign_ids (Iterable[int]): ID рекламных кампаний.
+        """
+        campaign_ids = sorted(campaign_ids)
+        AdvertisementStats.objects.bulk_create(
+            [AdvertisementStats(advertisement_id=pk) for pk in campaign_ids],
+            ignore_conflicts=True,
+        )
+        list(
+            AdvertisementStats.objects.select_for_update()
+            .filter(advertisement_id__in=campaign_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+    @staticmethod
+    def _save_stats(budgets: dict[int, Decimal]) -> int:
+        """
+        Сохраняет итоговую статистику кампаний, сложенную из строк по дням.
+
+        Сумма выручки по дням равна сумме контрактов кампании, так как
+        каждый контракт учитывается в дне своего заключения один раз.
+        Нулевая сумма сохраняется как None, как у кампании без контрактов,
+        а соотношение к затратам считается так же, как в with_live_stats().
+
+        Args:
+            budgets (dict[int, Decimal]): Бюджеты по ID рекламных кампаний.
+
+        Returns:
+            int: Количество сохраненных строк статистики.
+        """
+        totals = {
+            row.pop("advertisement_id"): row
+            for row in AdvertisementDailyStats.objects.filter(
+                advertisement_id__in=list(budgets)
+            )
+            .values("advertisement_id")
+            .annotate(
+                leads_count=Sum("leads_count"),
+                customers_count=Sum("customers_count"),
+                contracts_sum=Sum("revenue"),
+            )
+            .order_by()
+        }
+        rows = []
+        for campaign_id, budget in sorted(budgets.items()):
+            row = totals.get(campaign_id, {})
+            contracts_sum = row.get("contracts_sum") or None
+            profit = None
+            if not budget:
+                profit = Decimal(0)
+            elif contracts_sum is not None:
+                profit = (contracts_sum / budget).quantize(
+                    Decimal("0.01"), rounding=ROUND_HALF_UP
+                )
+            rows.append(
+                AdvertisementStats(
+                    advertisement_id=campaign_id,
+                    leads_count=row.get("leads_count", 0),
+                    customers_count=row.get("customers_count", 0),
+                    contracts_sum=contracts_sum,
+                    profit=profit,
+                )
+            )
+        AdvertisementStats.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["advertisement"],
+            update_fields=[*STATS_FIELDS, "updated_at"],
+        )
+        return len(rows)
+
+    @classmethod
+    def _save_daily_stats(
+        cls, campaign_ids: set[int], days: dict[int, set[date]] | None = None
+    ) -> int:
+        """
+        Пересчитывает статистику кампаний по дням.
+
+        Для кампаний из days пересчитываются только указанные дни,
+        для остальных - вся история. Строки сохраняются upsert'ом
+        по ограничению ads_daily_stats_campaign_day без удаления, поэтому
+        параллельные пересчеты одной кампании не конфликтуют. Дни, в которых
+        не осталось данных, сохраняются с нулевыми значениями.
+
+        Контракт, общий для нескольких клиентов кампании,
+        учитывается в выручке один раз.
+
+        Args:
+            campaign_ids (set[int]): ID рекламных кампаний.
+            days (dict[int, set[date]] | None): Пересчитываемые дни
+            по ID кампаний.
+
+        Returns:
+            int: Количество сохраненных строк статистики.
+        """
+        days = {
+            campaign_id: campaign_days
+            for campaign_id, campaign_days in (days or {}).items()
+            if campaign_id in campaign_ids
+        }
+        full_ids = campaign_ids - days.keys()
+        scoped = {
+            campaign_id: campaign_days
+            for campaign_id, campaign_days in days.items()
+            if campaign_days
+        }
+        if not full_ids and not scoped:
+            return 0
+
+        def empty() -> dict:
+            return {"leads_count": 0, "customers_count": 0, "revenue": Decimal(0)}
+
+        stats = defaultdict(empty)
+        # Прежние строки обнуляются, если данных за их день больше нет.
+        for key in AdvertisementDailyStats.objects.filter(
+            advertisement_id__in=full_ids
+        ).values_list("advertisement_id", "day"):
+            stats[key] = empty()
+        for campaign_id, campaign_days in scoped.items():
+            for day in campaign_days:
+                stats[campaign_id, day] = empty()
+
+        leads = (
+            Lead.objects.filter(
+                cls._days_filter(full_ids, scoped, "advertisement_id", "created_at")
+            )
+            .annotate(day=TruncDate("created_at"))
+            .values_list("advertisement_id", "day")
+            .annotate(total=Count("pk"))
+            .order_by()
+        )
+        for campaign_id, day, total in leads:
+            stats[campaign_id, day]["leads_count"] = total
+        customers = (
+            Customer.objects.filter(
+                cls._days_filter(
+                    full_ids, scoped, "lead__advertisement_id", "created_at"
+                )
+            )
+            .annotate(day=TruncDate("created_at"))
+            .values_list("lead__advertisement_id", "day")
+            .annotate(total=Count("pk"))
+            .order_by()
+        )
+        for campaign_id, day, total in customers:
+            stats[campaign_id, day]["customers_count"] = total
+        contracts = (
+            Customer.objects.filter(
+                cls._days_filter(
+                    full_ids, scoped, "lead__advertisement_id", "contract__created_at"
+                ),
+                contract__isnull=False,
+            )
+            .annotate(day=TruncDate("contract__created_at"))
+            .values_list(
+                "lead__advertisement_id", "contract_id", "day", "contract__price"
+            )
+            .order_by()
+            .distinct()
+        )
+        for campaign_id, _, day, price in contracts:
+            stats[campaign_id, day]["revenue"] += price
+
+        # Строки пишутся в порядке ключа, чтобы параллельные пересчеты
+        # блокировали их в одном порядке.
+        rows = [
+            AdvertisementDailyStats(advertisement_id=campaign_id, day=day, **values)
+            for (campaign_id, day), values in sorted(stats.items())
+        ]
+        AdvertisementDailyStats.objects.bulk_create(
+            rows,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=["advertisement", "day"],
+            update_fields=["leads_count", "customers_count", "revenue"],
+        )
+        return len(rows)
+
+    @staticmethod
+    def _days_filter(
+        full_ids: set[int],
+        scoped: dict[int, set[date]],
+        campaign_field: str,
+        time_field: str,
+    ) -> Q:
+        """
+        Возвращает условие выборки строк пересчитываемых кампаний и дней.
+
+        День задается диапазоном времени в текущем часовом поясе,
+        чтобы условие использовало индексы по времени создания.
+
+        Args:
+            full_ids (set[int]): ID кампаний, пересчитываемых целиком.
+            scoped (dict[int, set[date]]): Пересчитываемые дни по ID кампаний.
+            campaign_field (str): Путь к ID кампании.
+            time_field (str): Путь ко времени, по которому определяется день.
+
+        Returns:
+            Q: Условие выборки.
+        """
+        condition = Q(**{f"{campaign_field}__in": full_ids})
+        for campaign_id, campaign_days in scoped.items():
+            periods = Q()
+            for day in campaign_days:
+                start = timezone.make_aware(datetime.combine(day, time.min))
+                periods |= Q(
+                    **{
+                        f"{time_field}__gte": start,
+                        f"{time_field}__lt": start + timedelta(days=1),
+                    }
+                )
+            condition |= Q(**{campaign_field: campaign_id}) & periods
+        return condition
@@ -0,0 +1,277 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime
+from typing import Iterable, Iterator
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.contracts.models import Contract
+from apps.customers.models import Customer
+from apps.leads.models import Lead
+
+from .services import AdvertisementStatsService
+
+# Пересчитываемые дни по ID кампаний: None - вся история, пустое
+# множество - только итоговая статистика кампании.
+RefreshDays = dict[int, set[date] | None]
+
+# Кампании, статистика которых пересчитывается при выходе
+# из collect_stats_refresh().
+collected_refresh: ContextVar[RefreshDays | None] = ContextVar(
+    "collected_refresh", default=None
+)
+
+
+def merge_refresh(
+    target: RefreshDays, ids: Iterable[int | None], days: Iterable[date] | None
+) -> None:
+    """
+    Добавляет пересчитываемые дни объектов к уже запланированным.
+
+    Args:
+        target (RefreshDays): Запланированные дни по ID объектов.
+        ids (Iterable[int | None]): ID объектов.
+        days (Iterable[date] | None): Дни или None - вся история.
+    """
+    days = None if days is None else set(days)
+    for pk in ids:
+        if not pk:
+            continue
+        if days is None or (pk in target and target[pk] is None):
+            target[pk] = None
+        else:
+            target.setdefault(pk, set()).update(days)
+
+
+def local_days(*moments: datetime | None) -> set[date]:
+    """
+    Возвращает дни, в которые статистика учитывает указанные моменты.
+
+    Args:
+        *moments (datetime | None): Время создания объектов.
+
+    Returns:
+        set[date]: Дни в текущем часовом поясе.
+    """
+    return {timezone.localdate(moment) for moment in moments if moment}
+
+
+def contract_days(contract_id: int | None) -> set[date]:
+    """
+    Возвращает день заключения контракта.
+
+    Args:
+        contract_id (int | None): ID контракта.
+
+    Returns:
+        set[date]: День заключения или пустое множество.
+    """
+    if not contract_id:
+        return set()
+    return local_days(
+        *Contract.objects.filter(pk=contract_id).values_list("created_at", flat=True)
+    )
+
+
+def schedule_stats_refresh(
+    campaign_ids: Iterable[int | None], days: Iterable[date] | None = None
+) -> None:
+    """
+    Планирует пересчет статистики кампаний после фиксации транзакции.
+
+    Внутри collect_stats_refresh() кампании только запоминаются,
+    а пересчет планируется один раз при выходе из блока.
+
+    Args:
+        campaign_ids (Iterable[int | None]): ID рекламных кампаний.
+        days (Iterable[date] | None): Дни, статистику по которым нужно
+        пересчитать. Если None, пересчитывается вся история кампаний.
+    """
+    refresh: RefreshDays = {}
+    merge_refresh(refresh, campaign_ids, days)
+    collected = collected_refresh.get()
+    if collected is not None:
+        for campaign_id, campaign_days in refresh.items():
+            merge_refresh(collected, [campaign_id], campaign_days)
+    elif refresh:
+        refresh_on_commit(refresh)
+
+
+def refresh_on_commit(refresh: RefreshDays) -> None:
+    """
+    Пересчитывает статистику кампаний после фиксации транзакции.
+
+    Args:
+        refresh (RefreshDays): Пересчитываемые дни по ID кампаний.
+    """
+    days = {pk: value for pk, value in refresh.items() if value is not None}
+    transaction.on_commit(
+        lambda: AdvertisementStatsService.refresh_stats(list(refresh), days)
+    )
+
+
+def schedule_lead_stats_refresh(
+    lead_ids: Iterable[int | None], days: Iterable[date] | None = None
+) -> None:
+    """
+    Планирует пересчет статистики кампаний указанных лидов.
+
+    Кампании лидов определяются сразу: при каскадном удалении лиды
+    удаляются вслед за клиентами, и к выходу из collect_stats_refresh()
+    их уже нет в базе.
+
+    Args:
+        lead_ids (Iterable[int | None]): ID лидов.
+        days (Iterable[date] | None): Дни, статистику по которым нужно
+        пересчитать. Если None, пересчитывается вся история кампаний.
+    """
+    schedule_stats_refresh(lead_campaign_ids(lead_ids), days)
+
+
+@contextmanager
+def collect_stats_refresh() -> Iterator[None]:
+    """
+    Объединяет пересчеты статистики, запланированные внутри блока.
+
+    Массовое удаление отправляет сигнал на каждый объект; внутри блока
+    статистика всех затронутых кампаний пересчитывается одним вызовом
+    refresh_stats после фиксации транзакции. Вложенный блок добавляет
+    пересчеты к внешнему.
+    """
+    if collected_refresh.get() is not None:
+        yield
+        return
+    collected: RefreshDays = {}
+    token = collected_refresh.set(collected)
+    try:
+        yield
+    finally:
+        collected_refresh.reset(token)
+    if collected:
+        refresh_on_commit(collected)
+
+
+def lead_campaign_ids(lead_ids: Iterable[int | None]) -> set[int]:
+    """
+    Возвращает ID кампаний, к которым относятся указанные лиды.
+
+    Args:
+        lead_ids (Iterable[int | None]): ID лидов.
+
+    Returns:
+        set[int]: ID рекламных кампаний.
+    """
+    ids = {lead_id for lead_id in lead_ids if lead_id}
+    if not ids:
+        return set()
+    return set(
+        Lead.objects.filter(pk__in=ids, advertisement__isnull=False)
+        .values_list("advertisement_id", flat=True)
+        .distinct()
+    )
+
+
+def advertisement_saved(sender, instance, **kwargs) -> None:
+    """
+    Пересчитывает итоговую статистику кампании после ее сохранения.
+
+    От полей кампании зависит только соотношение контрактов к бюджету,
+    поэтому статистика по дням не пересчитывается.
+    """
+    schedule_stats_refresh([instance.pk], days=())
+
+
+def lead_pre_save(sender, instance, **kwargs) -> None:
+    """
+    Запоминает прежнюю кампанию лида перед сохранением.
+
+    Кампания берется из значения, с которым лид загружен из базы
+    (Lead.from_db); запрос выполняется, только если поле было отложено
+    или у созданного в коде лида уже есть ID.
+    """
+    if hasattr(instance, "_loaded_advertisement_id"):
+        old_id = instance._loaded_advertisement_id
+        instance._stats_old_campaign_ids = {old_id} if old_id else set()
+    else:
+        instance._stats_old_campaign_ids = lead_campaign_ids([instance.pk])
+
+
+def lead_saved(sender, instance, created: bool, **kwargs) -> None:
+    """
+    Пересчитывает статистику кампаний, затронутых сохранением лида.
+
+    Новый лид меняет статистику своей кампании за день создания.
+    При переносе лида в другую кампанию вместе с ним переходят его
+    клиенты и контракты, поэтому обе кампании пересчитываются целиком.
+    """
+    new_ids = {instance.advertisement_id} - {None}
+    old_ids = getattr(instance, "_stats_old_campaign_ids", set())
+    if created:
+        schedule_stats_refresh(new_ids, local_days(instance.created_at))
+    elif old_ids != new_ids:
+        schedule_stats_refresh(old_ids | new_ids)
+    instance._loaded_advertisement_id = instance.advertisement_id
+
+
+def lead_deleted(sender, instance, **kwargs) -> None:
+    """
+    Пересчитывает статистику кампании удаленного лида за день его создания.
+
+    Клиенты лида удаляются каскадно и пересчитывают свои дни сами.
+    """
+    schedule_stats_refresh([instance.advertisement_id], local_days(instance.created_at))
+
+
+def customer_pre_save(sender, instance, **kwargs) -> None:
+    """
+    Запоминает кампанию прежнего лида и день прежнего контракта клиента.
+    """
+    instance._stats_old_campaign_ids = set()
+    instance._stats_old_days = set()
+    if instance.pk:
+        for campaign_id, contract_created_at in Customer.objects.filter(
+            pk=instance.pk
+        ).values_list("lead__advertisement_id", "contract__created_at"):
+            instance._stats_old_campaign_ids = {campaign_id} - {None}
+            instance._stats_old_days = local_days(contract_created_at)
+
+
+def customer_saved(sender, instance, **kwargs) -> None:
+    """
+    Пересчитывает статистику кампаний, затронутых изменением клиента,
+    за день перевода в клиенты и дни прежнего и нового контрактов.
+    """
+    days = {
+        *local_days(instance.created_at),
+        *contract_days(instance.contract_id),
+        *getattr(instance, "_stats_old_days", set()),
+    }
+    schedule_lead_stats_refresh([instance.lead_id], days)
+    schedule_stats_refresh(getattr(instance, "_stats_old_campaign_ids", set()), days)
+
+
+def customer_deleted(sender, instance, **kwargs) -> None:
+    """
+    Пересчитывает статистику кампании удаленного клиента за день
+    перевода в клиенты и день его контракта.
+    """
+    schedule_lead_stats_refresh(
+        [instance.lead_id],
+        local_days(instance.created_at) | contract_days(instance.contract_id),
+    )
+
+
+def contract_saved(sender, instance, created: bool, **kwargs) -> None:
+    """
+    Пересчитывает статистику кампаний, клиенты которых связаны с контрактом,
+    за день заключения контракта.
+    """
+    if created:
+        return
+    schedule_stats_refresh(
+        Lead.objects.filter(customer_leads__contract_id=instance.pk)
+        .values_list("advertisement_id", flat=True)
+        .distinct(),
+        local_days(instance.created_at),
+    )
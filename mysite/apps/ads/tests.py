@@ -1,3 +1,260 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.contracts.models import Contract
+from apps.customers.models import Customer
+from apps.leads.models import Lead
+from apps.leads.services import LeadBulkService
+from apps.myauth.models import User
+from apps.products.models import Product
+
+from .models import Advertisement, AdvertisementDailyStats, AdvertisementStats
+from .services import AdvertisementStatsService
+
+
+class AdvertisementDailyStatsTest(TestCase):
+    """
+    Проверяет пересчет статистики кампаний по дням.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.product = Product.objects.create(name="Услуга", description="", cost=1)
+        cls.campaign = Advertisement.objects.create(
+            name="Весна", product=cls.product, channel="search", budget=100
+        )
+        cls.today = timezone.localdate()
+        cls.yesterday = cls.today - timedelta(days=1)
+
+    def create_lead(self, name: str, days_ago: int = 0) -> Lead:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Lead.objects.create(
+                first_name=name,
+                last_name="Иванов",
+                phone="",
+                email=f"{name}@example.com",
+                advertisement=self.campaign,
+                created_at=timezone.now() - timedelta(days=days_ago),
+            )
+
+    def daily(self) -> dict:
+        return {
+            row.pop("day"): row
+            for row in AdvertisementDailyStats.objects.filter(
+                advertisement=self.campaign
+            ).values("day", "leads_count", "customers_count", "revenue")
+        }
+
+    def test_only_changed_days_are_recomputed(self) -> None:
+        self.create_lead("old", days_ago=1)
+        lead = self.create_lead("new")
+        contract = Contract.objects.create(
+            name="Контракт", product=self.product, price=50
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Customer.objects.create(lead=lead, contract=contract)
+        self.assertEqual(
+            self.daily(),
+            {
+                self.yesterday: {
+                    "leads_count": 1,
+                    "customers_count": 0,
+                    "revenue": Decimal(0),
+                },
+                self.today: {
+                    "leads_count": 1,
+                    "customers_count": 1,
+                    "revenue": Decimal(50),
+                },
+            },
+        )
+
+        # Строка за вчера не входит в пересчет сегодняшнего лида.
+        AdvertisementDailyStats.objects.filter(day=self.yesterday).update(
+            leads_count=10
+        )
+        self.create_lead("third")
+        self.assertEqual(self.daily()[self.yesterday]["leads_count"], 10)
+        self.assertEqual(self.daily()[self.today]["leads_count"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.filter(first_name="third").get().delete()
+            lead.delete()
+        self.assertEqual(
+            self.daily()[self.today],
+            {"leads_count": 0, "customers_count": 0, "revenue": Decimal(0)},
+        )
+
+        AdvertisementStatsService.rebuild_stats()
+        self.assertEqual(self.daily()[self.yesterday]["leads_count"], 1)
+
+    def test_series_require_limited_campaign_filter(self) -> None:
+        self.client.force_login(
+            User.objects.create_superuser(username="admin", password="admin")
+        )
+        url = reverse("ads:advertisement_series")
+        self.assertEqual(self.client.get(url).status_code, 400)
+        response = self.client.get(url, {"campaign": self.campaign.pk})
+        self.assertEqual(response.status_code, 200)
+        other = Advertisement.objects.create(
+            name="Осень", product=self.product, channel="search", budget=1
+        )
+        with override_settings(ADS_SERIES_MAX_CAMPAIGNS=1):
+            response = self.client.get(url, {"campaign": [self.campaign.pk, other.pk]})
+        self.assertEqual(response.status_code, 400)
+
+
+class AdvertisementStatsTest(TestCase):
+    """
+    Проверяет, что сохраненная статистика кампаний совпадает
+    с посчитанной по связанным таблицам после изменений.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.product = Product.objects.create(name="Услуга", description="", cost=1)
+        cls.spring = Advertisement.objects.create(
+            name="Весна", product=cls.product, channel="search", budget=100
+        )
+        cls.autumn = Advertisement.objects.create(
+            name="Осень", product=cls.product, channel="search", budget=0
+        )
+        AdvertisementStatsService.refresh_stats([cls.spring.pk, cls.autumn.pk])
+
+    def assertStatsMatchLive(self) -> None:
+        # Соотношение к затратам сверяется отдельно: SQLite делит
+        # в with_live_stats() нацело.
+        fields = ["leads_count", "customers_count", "contracts_sum"]
+        live = Advertisement.objects.with_stats(live=True).values("pk", *fields)
+        saved = {
+            stats.advertisement_id: stats
+            for stats in AdvertisementStats.objects.select_related("advertisement")
+        }
+        for row in live:
+            stats = saved[row.pop("pk")]
+            self.assertEqual({field: getattr(stats, field) for field in fields}, row)
+            budget = stats.advertisement.budget
+            if not budget:
+                self.assertEqual(stats.profit, 0)
+            elif stats.contracts_sum is None:
+                self.assertIsNone(stats.profit)
+            else:
+                self.assertEqual(stats.profit, round(stats.contracts_sum / budget, 2))
+
+    def test_saved_stats_follow_changes(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            leads = [
+                Lead.objects.create(
+                    first_name=str(number),
+                    last_name="Иванов",
+                    phone="",
+                    email=f"{number}@example.com",
+                    advertisement=self.spring,
+                    created_at=timezone.now() - timedelta(days=number),
+                )
+                for number in range(3)
+            ]
+            contract = Contract.objects.create(
+                name="Контракт", product=self.product, price=30
+            )
+            for lead in leads[:2]:
+                Customer.objects.create(lead=lead, contract=contract)
+        self.assertStatsMatchLive()
+        self.assertEqual(self.spring.stats.contracts_sum, 30)
+
+        lead = Lead.objects.get(pk=leads[0].pk)
+        lead.first_name = "Петр"
+        with mock.patch.object(AdvertisementStatsService, "refresh_stats") as refresh:
+            with self.assertNumQueries(1), self.captureOnCommitCallbacks(execute=True):
+                lead.save()
+        refresh.assert_not_called()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            contract.price = 45
+            contract.save()
+            lead.advertisement = self.autumn
+            lead.save()
+        self.assertStatsMatchLive()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Customer.objects.get(lead=leads[1]).delete()
+            leads[2].delete()
+            Advertisement.objects.filter(pk=self.spring.pk).get().save()
+        self.assertStatsMatchLive()
+
+        AdvertisementStats.objects.update(leads_count=0)
+        AdvertisementStatsService.rebuild_stats()
+        self.assertStatsMatchLive()
+
+    def test_bulk_delete_refreshes_customer_and_contract_days(self) -> None:
+        now = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            lead = Lead.objects.create(
+                first_name="Иван",
+                last_name="Иванов",
+                phone="",
+                email="ivan@example.com",
+                advertisement=self.spring,
+                created_at=now - timedelta(days=3),
+            )
+            contract = Contract.objects.create(
+                name="Контракт",
+                product=self.product,
+                price=50,
+                created_at=now - timedelta(days=2),
+            )
+            Customer.objects.create(
+                lead=lead, contract=contract, created_at=now - timedelta(days=1)
+            )
+        self.assertEqual(self.spring.stats.customers_count, 1)
+        self.assertEqual(AdvertisementDailyStats.objects.count(), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            LeadBulkService().delete([lead.pk])
+        self.assertStatsMatchLive()
+        self.assertEqual(
+            list(
+                AdvertisementDailyStats.objects.exclude(
+                    leads_count=0, customers_count=0, revenue=0
+                )
+            ),
+            [],
+        )
+
+    def test_live_stats_count_shared_contract_once(self) -> None:
+        contract = Contract.objects.create(name="Общий", product=self.product, price=30)
+        other = Contract.objects.create(name="Другой", product=self.product, price=5)
+        for number, (campaign, customer_contract) in enumerate(
+            [
+                (self.spring, contract),
+                (self.spring, contract),
+                (self.spring, contract),
+                (self.spring, other),
+                (self.autumn, contract),
+            ]
+        ):
+            lead = Lead.objects.create(
+                first_name=str(number),
+                last_name="Иванов",
+                phone="",
+                email=f"{number}@example.com",
+                advertisement=campaign,
+            )
+            Customer.objects.create(lead=lead, contract=customer_contract)
+        stats = {
+            row.pop("pk"): row
+            for row in Advertisement.objects.with_stats(live=True).values(
+                "pk", "customers_count", "contracts_sum"
+            )
+        }
+        self.assertEqual(
+            stats[self.spring.pk], {"customers_count": 4, "contracts_sum": 35}
+        )
+        self.assertEqual(
+            stats[self.autumn.pk], {"customers_count": 1, "contracts_sum": 30}
+        )
@@ -1,10 +1,13 @@
 from django.urls import path
 
 from .views import (
+    AdvertisementAutocompleteView,
     AdvertisementCreateView,
     AdvertisementDeleteView,
     AdvertisementDetailView,
     AdvertisementListView,
+    AdvertisementSeriesView,
+    AdvertisementStatisticExportView,
     AdvertisementStatisticView,
     AdvertisementUpdateView,
 )
@@ -14,6 +17,11 @@ app_name = "ads"
 
 urlpatterns = [
     path("", AdvertisementListView.as_view(), name="advertisement_list"),
+    path(
+        "autocomplete/",
+        AdvertisementAutocompleteView.as_view(),
+        name="advertisement_autocomplete",
+    ),
     path("new/", AdvertisementCreateView.as_view(), name="advertisement_create"),
     path("<int:pk>/", AdvertisementDetailView.as_view(), name="advertisement_detail"),
     path(
@@ -29,4 +37,14 @@ urlpatterns = [
         AdvertisementStatisticView.as_view(),
         name="advertisement_statistic",
     ),
+    path(
+        "statistic/export/",
+        AdvertisementStatisticExportView.as_view(),
+        name="advertisement_statistic_export",
+    ),
+    path(
+        "statistic/series/",
+        AdvertisementSeriesView.as_view(),
+        name="advertisement_series",
+    ),
 ]
@@ -1,7 +1,11 @@
+from datetime import date
+
 from django.contrib.auth.mixins import PermissionRequiredMixin
-from django.http import HttpResponseRedirect
+from django.http import HttpRequest, HttpResponseRedirect, JsonResponse
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
+from django.utils import timezone
+from django.views import View
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -10,11 +14,25 @@ from django.views.generic import (
     UpdateView,
 )
 
+from apps.core.api import CrmModelViewSet
+from apps.core.cache import VersionedCacheMixin
+from apps.core.mixins import CsvExportMixin, QueryShapeMixin, SearchMixin
+from apps.core.pagination import KeysetPaginationMixin
+from apps.core.views import AutocompleteView
+
 from .forms import AdvertisementForm
 from .models import Advertisement, AdvertisementQuerySet
+from .serializers import AdvertisementSerializer
+from .services import AdvertisementStatsService
 
 
-class AdvertisementListView(PermissionRequiredMixin, ListView):
+class AdvertisementListView(
+    PermissionRequiredMixin,
+    QueryShapeMixin,
+    SearchMixin,
+    KeysetPaginationMixin,
+    ListView,
+):
     """
     Представление для отображения списка рекламных кампаний.
 
@@ -25,15 +43,25 @@ class AdvertisementListView(PermissionRequiredMixin, ListView):
         для списка рекламных кампаний.
         permission_required (str): Необходимое разрешение
         для доступа к представлению.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
+        search_fields (tuple[str, ...]): Поля для поиска.
     """
 
     model: Advertisement = Advertisement
     template_name: str = "ads-list.html"
     context_object_name: str = "ads"
     permission_required: str = "ads.view_advertisement"
+    only_fields: tuple[str, ...] = ("id", "name")
+    search_fields: tuple[str, ...] = ("name",)
 
 
-class AdvertisementStatisticView(PermissionRequiredMixin, ListView):
+class AdvertisementStatisticView(
+    PermissionRequiredMixin,
+    QueryShapeMixin,
+    SearchMixin,
+    KeysetPaginationMixin,
+    ListView,
+):
     """
     Представление для отображения статистики рекламных кампаний.
 
@@ -44,12 +72,18 @@ class AdvertisementStatisticView(PermissionRequiredMixin, ListView):
         для списка рекламных кампаний.
         permission_required (str): Необходимое разрешение
         для доступа к представлению.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
+        search_fields (tuple[str, ...]): Поля для поиска.
+        replica_reads (bool): Читать данные с реплики.
     """
 
     model: Advertisement = Advertisement
     template_name: str = "ads-statistic.html"
     context_object_name: str = "ads"
     permission_required: str = "ads.view_advertisement"
+    only_fields: tuple[str, ...] = ("id", "name", "budget")
+    search_fields: tuple[str, ...] = ("name",)
+    replica_reads: bool = True
 
     def get_queryset(self) -> AdvertisementQuerySet:
         """
@@ -58,15 +92,106 @@ class AdvertisementStatisticView(PermissionRequiredMixin, ListView):
         Returns:
             AdvertisementQuerySet: QuerySet с аннотированными данными.
         """
-        return Advertisement.objects.with_stats()
+        return super().get_queryset().with_stats()
+
+
+class AdvertisementStatisticExportView(CsvExportMixin, AdvertisementStatisticView):
+    """
+    Выгрузка статистики рекламных кампаний в CSV с учетом поиска.
+
+    Attributes:
+        export_columns (dict[str, str]): Заголовки колонок и поля кампании.
+        export_filename (str): Имя выгружаемого файла.
+    """
+
+    export_columns: dict[str, str] = {
+        "ID": "id",
+        "Название": "name",
+        "Канал продвижения": "channel",
+        "Бюджет": "budget",
+        "Лидов": "leads_count",
+        "Активных клиентов": "customers_count",
+        "Сумма контрактов": "contracts_sum",
+        "Соотношение контрактов к затратам": "profit",
+    }
+    export_filename: str = "ads-statistic.csv"
+
+
+class AdvertisementSeriesView(PermissionRequiredMixin, VersionedCacheMixin, View):
+    """
+    JSON-эндпоинт временных рядов статистики рекламных кампаний.
+
+    Параметры запроса:
+        period: шаг ряда (day, week или month), по умолчанию day.
+        start, end: границы периода в формате YYYY-MM-DD.
+        campaign: ID кампании, обязательный параметр; его можно
+        повторять до ADS_SERIES_MAX_CAMPAIGNS раз.
+
+    Attributes:
+        permission_required (str): Необходимое разрешение
+        для доступа к представлению.
+        cache_models (tuple[str, ...]): Модели, от которых зависит ответ.
+    """
+
+    permission_required: str = "ads.view_advertisement"
+    cache_models: tuple[str, ...] = ("ads.AdvertisementStats",)
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        """
+        Возвращает ряды статистики кампаний за период.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            JsonResponse: Ряды по ID кампаний или описание ошибки
+            со статусом 400.
+        """
+        period = request.GET.get("period", "day")
+        try:
+            start = self.parse_date(request.GET.get("start"))
+            end = self.parse_date(request.GET.get("end"))
+            campaign_ids = [int(pk) for pk in request.GET.getlist("campaign")]
+            series = AdvertisementStatsService.get_campaign_series(
+                campaign_ids, period=period, start=start, end=end
+            )
+        except ValueError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        return JsonResponse(
+            {
+                "period": period,
+                "campaigns": {str(pk): points for pk, points in series.items()},
+            }
+        )
+
+    @staticmethod
+    def parse_date(value: str | None) -> date | None:
+        """
+        Разбирает дату из параметра запроса.
+
+        Args:
+            value (str | None): Дата в формате YYYY-MM-DD.
+
+        Returns:
+            date | None: Дата или None, если параметр не передан.
+
+        Raises:
+            ValueError: Если дата указана в неверном формате.
+        """
+        return date.fromisoformat(value) if value else None
+
+    def get_cache_parts(self) -> list:
+        """
+        Добавляет к ключу кеша текущую дату, от которой зависит
+        период по умолчанию.
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context["ads"] = self.get_queryset()
-        return context
+        Returns:
+            list: Параметры, от которых зависит ответ.
+        """
+        return [*super().get_cache_parts(), timezone.localdate()]
 
 
-class AdvertisementDetailView(PermissionRequiredMixin, DetailView):
+class AdvertisementDetailView(PermissionRequiredMixin, QueryShapeMixin, DetailView):
     """
     Представление для отображения детальной информации о рекламной кампании.
 
@@ -77,12 +202,17 @@ class AdvertisementDetailView(PermissionRequiredMixin, DetailView):
         для рекламной кампании.
         permission_required (str): Необходимое разрешение
         для доступа к представлению.
+        select_related_fields (tuple[str, ...]): Связанные объекты,
+        загружаемые вместе с записью.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
     """
 
     model: Advertisement = Advertisement
     template_name: str = "ads-detail.html"
     context_object_name: str = "object"
     permission_required: str = "ads.view_advertisement"
+    select_related_fields: tuple[str, ...] = ("product",)
+    only_fields: tuple[str, ...] = ("id", "name", "budget", "product__name")
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
@@ -168,3 +298,50 @@ class AdvertisementDeleteView(PermissionRequiredMixin, DeleteView):
         Перенаправляет пользователя на список рекламных кампаний.
         """
         return redirect(reverse_lazy("ads:advertisement_list"))
+
+
+class AdvertisementAutocompleteView(AutocompleteView):
+    """
+    Эндпоинт автодополнения для выбора рекламных кампаний в формах.
+
+    Attributes:
+        model (Advertisement): Модель, по которой идет поиск.
+        permission_required (str): Необходимое разрешение
+        для доступа к представлению.
+        search_fields (tuple[str, ...]): Поля для поиска по префиксу.
+        only_fields (tuple[str, ...]): Поля, нужные для названия объекта.
+    """
+
+    model: Advertisement = Advertisement
+    permission_required: str = "ads.view_advertisement"
+    search_fields: tuple[str, ...] = ("name",)
+    only_fields: tuple[str, ...] = ("id", "name")
+
+
+class AdvertisementViewSet(SearchMixin, CrmModelViewSet):
+    """
+    API рекламных кампаний со статистикой.
+
+    Attributes:
+        queryset (QuerySet): Кампании со статистикой.
+        serializer_class (type): Сериализатор кампании.
+        search_fields (tuple[str, ...]): Поля для поиска ?q=.
+        etag_fields (tuple[str, ...]): Поля, от которых зависит
+        представление кампании.
+        last_modified_fields (tuple[str, ...]): Поля с временем изменения.
+    """
+
+    queryset = Advertisement.objects.with_stats()
+    serializer_class = AdvertisementSerializer
+    search_fields: tuple[str, ...] = ("name",)
+    etag_fields: tuple[str, ...] = (
+        "id",
+        "updated_at",
+        "product__updated_at",
+        "stats__updated_at",
+    )
+    last_modified_fields: tuple[str, ...] = (
+        "updated_at",
+        "product__updated_at",
+        "stats__updated_at",
+    )
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
 
 
 class ContractsConfig(AppConfig):
@@ -19,9 +20,13 @@ class ContractsConfig(AppConfig):
 
     def ready(self) -> None:
         """
-        Метод для выполнения кода при готовности приложения.
+        Подключает обработчики, удаляющие неиспользуемые документы.
 
         Returns:
             None
         """
-        pass
+        from . import signals
+
+        pre_save.connect(signals.contract_pre_save, sender="contracts.Contract")
+        post_save.connect(signals.contract_saved, sender="contracts.Contract")
+        post_delete.connect(signals.contract_deleted, sender="contracts.Contract")
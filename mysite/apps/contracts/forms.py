@@ -1,6 +1,9 @@
 from typing import Type
 
 from django import forms
+from django.urls import reverse_lazy
+
+from apps.core.widgets import AutocompleteSelect
 
 from .models import Contract
 
@@ -17,6 +20,7 @@ class ContractForm(forms.ModelForm):
         Attributes:
             model (Type[Contract]): Модель контракта.
             fields (list[str]): Поля, которые будут отображаться в форме.
+            widgets (dict[str, Widget]): Виджеты полей формы.
         """
 
         model: type[Contract] = Contract
@@ -28,3 +32,8 @@ class ContractForm(forms.ModelForm):
             "end_date",
             "price",
         ]
+        widgets: dict[str, forms.Widget] = {
+            "product": AutocompleteSelect(
+                url=reverse_lazy("products:product_autocomplete")
+            ),
+        }
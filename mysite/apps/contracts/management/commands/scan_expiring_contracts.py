@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.contracts.services import ContractRenewalService
+
+
+class Command(BaseCommand):
+    """
+    Команда для создания задач на продление истекающих контрактов.
+
+    Рассчитана на ежедневный запуск по расписанию: повторный запуск
+    не создает задачи, которые уже есть.
+
+    Attributes:
+        help (str): Краткое описание команды.
+    """
+
+    help = "Create renewal tasks for contracts ending within the given days"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.CONTRACT_EXPIRING_DAYS,
+            help="Contracts ending within this many days are considered expiring",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of contracts processed per query",
+        )
+
+    def handle(self, *args, **options):
+        created = ContractRenewalService.create_renewal_tasks(
+            options["days"], options["batch_size"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Created {created} renewal tasks"))
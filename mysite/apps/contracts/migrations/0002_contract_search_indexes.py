@@ -0,0 +1,29 @@
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations
+from django.db.models.functions import Upper
+
+from apps.core.indexes import TrigramIndex
+from apps.core.operations import AddIndexConcurrently, TrigramExtension
+
+
+class Migration(migrations.Migration):
+    """
+    Триграммный индекс для поиска контрактов по названию.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("contracts", "0001_initial"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="contract",
+            index=TrigramIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="contracts_contract_name_trgm",
+            ),
+        ),
+    ]
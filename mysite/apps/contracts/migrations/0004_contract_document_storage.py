@@ -0,0 +1,47 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:10
+
+import os
+
+from django.db import migrations, models
+
+import apps.core.storage
+
+
+def populate_document_names(apps, schema_editor):
+    """
+    Заполняет исходные имена документов уже существующих контрактов.
+    """
+    Contract = apps.get_model("contracts", "Contract")
+    contracts = Contract.objects.exclude(document="").exclude(document__isnull=True)
+    for contract in contracts.only("pk", "document").iterator():
+        contract.document_name = os.path.basename(contract.document.name)[:255]
+        contract.save(update_fields=["document_name"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0003_contract_created_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contract",
+            name="document_name",
+            field=models.CharField(
+                blank=True, editable=False, max_length=255, verbose_name="Имя документа"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="contract",
+            name="document",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=apps.core.storage.ContentAddressedStorage(),
+                upload_to="media",
+                verbose_name="Документ",
+            ),
+        ),
+        migrations.RunPython(populate_document_names, migrations.RunPython.noop),
+    ]
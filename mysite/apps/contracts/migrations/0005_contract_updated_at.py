@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0004_contract_document_storage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="contract",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, verbose_name="Изменен"),
+        ),
+    ]
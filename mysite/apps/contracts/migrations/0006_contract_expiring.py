@@ -0,0 +1,68 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contracts", "0005_contract_updated_at"),
+        ("products", "0002_product_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContractRenewalTask",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("end_date", models.DateField(verbose_name="Дата окончания")),
+                (
+                    "is_done",
+                    models.BooleanField(default=False, verbose_name="Выполнена"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="Создана",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Задача на продление контракта",
+                "verbose_name_plural": "Задачи на продление контрактов",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="contract",
+            index=models.Index(fields=["end_date", "id"], name="contracts_end_date_id"),
+        ),
+        migrations.AddField(
+            model_name="contractrenewaltask",
+            name="contract",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="renewal_tasks",
+                to="contracts.contract",
+                verbose_name="Контракт",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="contractrenewaltask",
+            constraint=models.UniqueConstraint(
+                fields=("contract", "end_date"),
+                name="contracts_renewal_task_contract_end_date",
+            ),
+        ),
+    ]
@@ -1,9 +1,15 @@
+import os
+from datetime import datetime
+
 from dateutil.relativedelta import relativedelta
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.timezone import now
+from django_cleanup import cleanup
 
+from apps.core.indexes import trigram_index
+from apps.core.storage import ContentAddressedStorage
 from apps.products.models import Product
 
 
@@ -17,17 +23,25 @@ def one_month_from_today():
     return timezone.now().date() + relativedelta(months=1)
 
 
+@cleanup.ignore
 class Contract(models.Model):
     """
     Модель контракта.
 
+    Документы хранятся в ContentAddressedStorage: одинаковые файлы
+    разных контрактов хранятся один раз, поэтому django_cleanup для модели
+    отключен, а неиспользуемые файлы удаляют сигналы приложения.
+
     Attributes:
         name (str): Название контракта.
         product (Product): Предоставляемая услуга.
         document (FileField): Файл с документом.
+        document_name (str): Исходное имя загруженного документа.
         start_date (date): Дата начала контракта.
         end_date (date): Дата окончания контракта.
         price (Decimal): Сумма контракта.
+        created_at (datetime): Время заключения контракта.
+        updated_at (datetime): Время последнего изменения контракта.
     """
 
     name: str = models.CharField(max_length=200, verbose_name="Название")
@@ -47,8 +61,19 @@ class Contract(models.Model):
         max_digits=10, decimal_places=2, verbose_name="Сумма контракта", default=0.0
     )
     document: models.FileField | None = models.FileField(
-        upload_to="media", verbose_name="Документ", null=True, blank=True
+        upload_to="media",
+        storage=ContentAddressedStorage(),
+        verbose_name="Документ",
+        null=True,
+        blank=True,
+    )
+    document_name: str = models.CharField(
+        max_length=255, blank=True, editable=False, verbose_name="Имя документа"
     )
+    created_at: datetime = models.DateTimeField(
+        default=now, editable=False, db_index=True, verbose_name="Создан"
+    )
+    updated_at: datetime = models.DateTimeField(auto_now=True, verbose_name="Изменен")
 
     def get_absolute_url(self) -> str:
         """
@@ -66,10 +91,17 @@ class Contract(models.Model):
         Attributes:
             verbose_name (str): Название модели в единственном числе.
             verbose_name_plural (str): Название модели во множественном числе.
+            indexes (list[Index]): Индекс для выборки истекающих
+            контрактов диапазоном дат окончания в порядке (end_date, id)
+            и триграммный индекс поиска по названию.
         """
 
         verbose_name: str = "Контракт"
         verbose_name_plural: str = "Контракты"
+        indexes: list[models.Index] = [
+            models.Index(fields=["end_date", "id"], name="contracts_end_date_id"),
+            trigram_index("name", "contracts_contract_name_trgm"),
+        ]
 
     def __str__(self) -> str:
         """
@@ -80,6 +112,24 @@ class Contract(models.Model):
         """
         return str(self.name)
 
+    def save(self, *args, **kwargs) -> None:
+        """
+        Запоминает исходное имя нового документа и сохраняет контракт.
+
+        Файл и запись сохраняются в одной транзакции: блокировка имени
+        файла (ContentAddressedStorage.lock_name) держится, пока ссылка
+        на файл не зафиксирована.
+        """
+        if not self.document:
+            self.document_name = ""
+        elif not self.document._committed:
+            self.document_name = os.path.basename(self.document.name)[:255]
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "document" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "document_name"}
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     @property
     def cost(self) -> float:
         """
@@ -89,3 +139,61 @@ class Contract(models.Model):
             float: Цена контракта в виде числа с плавающей точкой.
         """
         return float(self.price)
+
+
+class ContractRenewalTask(models.Model):
+    """
+    Задача на продление истекающего контракта.
+
+    Задачи создает команда scan_expiring_contracts. На каждую дату
+    окончания контракта создается не больше одной задачи, поэтому
+    повторный запуск команды новых задач не добавляет, а продленный
+    контракт (с новой датой окончания) получает новую задачу.
+
+    Attributes:
+        contract (Contract): Истекающий контракт.
+        end_date (date): Дата окончания, к которой относится задача.
+        is_done (bool): Выполнена ли задача.
+        created_at (datetime): Время создания задачи.
+    """
+
+    contract: Contract = models.ForeignKey(
+        Contract,
+        on_delete=models.CASCADE,
+        related_name="renewal_tasks",
+        verbose_name="Контракт",
+    )
+    end_date: models.DateField = models.DateField(verbose_name="Дата окончания")
+    is_done: bool = models.BooleanField(default=False, verbose_name="Выполнена")
+    created_at: datetime = models.DateTimeField(
+        default=now, editable=False, verbose_name="Создана"
+    )
+
+    class Meta:
+        """
+        Метаданные модели.
+
+        Attributes:
+            verbose_name (str): Название модели в единственном числе.
+            verbose_name_plural (str): Название модели во множественном числе.
+            constraints (list[UniqueConstraint]): Одна задача на контракт
+            и дату окончания.
+        """
+
+        verbose_name: str = "Задача на продление контракта"
+        verbose_name_plural: str = "Задачи на продление контрактов"
+        constraints: list[models.UniqueConstraint] = [
+            models.UniqueConstraint(
+                fields=["contract", "end_date"],
+                name="contracts_renewal_task_contract_end_date",
+            )
+        ]
+
+    def __str__(self) -> str:
+        """
+        Возвращает строковое представление объекта.
+
+        Returns:
+            str: Идентификатор контракта и дата окончания.
+        """
+        return f"Продление контракта {self.contract_id} до {self.end_date}"
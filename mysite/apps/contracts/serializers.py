@@ -0,0 +1,35 @@
+from rest_framework import serializers
+
+from apps.core.api import SparseFieldsetSerializer
+
+from .models import Contract
+
+
+class ContractSerializer(SparseFieldsetSerializer):
+    """
+    Сериализатор контракта для API.
+
+    Документ загружается и скачивается через HTML-представления
+    контракта, в API доступно только его имя.
+    """
+
+    product_name = serializers.CharField(source="product.name", read_only=True)
+    customers = serializers.PrimaryKeyRelatedField(
+        source="customer_contract", many=True, read_only=True
+    )
+
+    class Meta:
+        model = Contract
+        fields = [
+            "id",
+            "name",
+            "product",
+            "product_name",
+            "start_date",
+            "end_date",
+            "price",
+            "document_name",
+            "customers",
+            "created_at",
+            "updated_at",
+        ]
@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from apps.core.pagination import NEXT, keyset_filter
+
+from .models import Contract, ContractRenewalTask
+
+EXPIRING_ORDERING: tuple[str, ...] = ("end_date", "id")
+
+
+class ContractRenewalService:
+    """
+    Сервис истекающих контрактов и задач на их продление.
+
+    Истекающие контракты выбираются диапазоном по индексу
+    (end_date, id), поэтому стоимость выборки зависит от количества
+    истекающих контрактов, а не от размера таблицы.
+    """
+
+    @classmethod
+    def parse_days(cls, value: str | None) -> int:
+        """
+        Разбирает количество дней до окончания контракта.
+
+        Args:
+            value (str | None): Значение параметра запроса.
+
+        Returns:
+            int: Количество дней или CONTRACT_EXPIRING_DAYS,
+            если значение не указано.
+
+        Raises:
+            ValueError: Если значение не является неотрицательным целым.
+        """
+        if value in (None, ""):
+            return settings.CONTRACT_EXPIRING_DAYS
+        days = int(value)
+        if days < 0:
+            raise ValueError("Количество дней не может быть отрицательным.")
+        return days
+
+    @classmethod
+    def get_period(cls, days: int, today: date | None = None) -> tuple[date, date]:
+        """
+        Возвращает диапазон дат окончания истекающих контрактов.
+
+        Args:
+            days (int): Количество дней от сегодняшнего.
+            today (date | None): Текущая дата. По умолчанию сегодня.
+
+        Returns:
+            tuple[date, date]: Даты от today до today + days включительно.
+        """
+        today = today or timezone.now().date()
+        return today, today + timedelta(days=days)
+
+    @classmethod
+    def get_expiring(cls, days: int, today: date | None = None) -> QuerySet:
+        """
+        Возвращает контракты, которые заканчиваются в ближайшие дни.
+
+        Args:
+            days (int): Количество дней от сегодняшнего.
+            today (date | None): Текущая дата. По умолчанию сегодня.
+
+        Returns:
+            QuerySet: Контракты с датой окончания в диапазоне get_period().
+        """
+        return Contract.objects.filter(end_date__range=cls.get_period(days, today))
+
+    @classmethod
+    def create_renewal_tasks(
+        cls, days: int, batch_size: int = 1000, today: date | None = None
+    ) -> int:
+        """
+        Создает задачи на продление истекающих контрактов.
+
+        Контракты обходятся пачками по ключу (end_date, id): каждая пачка
+        продолжает индексный диапазон с последней записи предыдущей.
+        Для контрактов, у которых уже есть задача на текущую дату
+        окончания, задачи не создаются, поэтому команду можно
+        запускать повторно.
+
+        Args:
+            days (int): Количество дней до окончания контракта.
+            batch_size (int): Количество контрактов в пачке.
+            today (date | None): Текущая дата. По умолчанию сегодня.
+
+        Returns:
+            int: Количество созданных задач.
+        """
+        queryset = cls.get_expiring(days, today).order_by(*EXPIRING_ORDERING)
+        created, last = 0, None
+        while True:
+            batch = queryset
+            if last is not None:
+                batch = batch.filter(keyset_filter(EXPIRING_ORDERING, last, NEXT))
+            rows = list(batch.values_list("end_date", "id")[:batch_size])
+            if not rows:
+                return created
+            existing = set(
+                ContractRenewalTask.objects.filter(
+                    contract_id__in=[pk for _, pk in rows]
+                ).values_list("end_date", "contract_id")
+            )
+            tasks = [
+                ContractRenewalTask(contract_id=pk, end_date=end_date)
+                for end_date, pk in rows
+                if (end_date, pk) not in existing
+            ]
+            # ignore_conflicts защищает от задач, созданных параллельным запуском.
+            ContractRenewalTask.objects.bulk_create(tasks, ignore_conflicts=True)
+            created += len(tasks)
+            last = rows[-1]
@@ -0,0 +1,58 @@
+from django.db import transaction
+
+from .models import Contract
+
+
+def delete_unreferenced_document(name: str) -> None:
+    """
+    Удаляет файл документа после фиксации транзакции,
+    если на него больше не ссылается ни один контракт.
+
+    Проверка и удаление выполняются под блокировкой имени файла, поэтому
+    параллельная загрузка того же содержимого либо дожидается удаления
+    и создает файл заново, либо успевает зафиксировать ссылку на него.
+
+    Args:
+        name (str): Имя файла в хранилище документов.
+    """
+    if not name:
+        return
+
+    def delete() -> None:
+        storage = Contract._meta.get_field("document").storage
+        with transaction.atomic():
+            storage.lock_name(name)
+            if not Contract.objects.filter(document=name).exists():
+                storage.delete(name)
+
+    transaction.on_commit(delete)
+
+
+def contract_pre_save(sender, instance, **kwargs) -> None:
+    """
+    Запоминает прежний документ контракта перед сохранением.
+    """
+    instance._old_document = ""
+    if instance.pk:
+        instance._old_document = (
+            Contract.objects.filter(pk=instance.pk)
+            .values_list("document", flat=True)
+            .first()
+            or ""
+        )
+
+
+def contract_saved(sender, instance, **kwargs) -> None:
+    """
+    Удаляет замененный документ, если он больше не используется.
+    """
+    old_document = getattr(instance, "_old_document", "")
+    if old_document != (instance.document.name or ""):
+        delete_unreferenced_document(old_document)
+
+
+def contract_deleted(sender, instance, **kwargs) -> None:
+    """
+    Удаляет документ удаленного контракта, если он больше не используется.
+    """
+    delete_unreferenced_document(instance.document.name)
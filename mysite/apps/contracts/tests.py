@@ -1,3 +1,221 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.myauth.models import User
+from apps.products.models import Product
+
+from .models import Contract, ContractRenewalTask
+from .uploadhandler import ContractDocumentUploadHandler
+
+
+class ExpiringContractsTest(TestCase):
+    """
+    Проверяет выборку истекающих контрактов и создание задач на продление.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+        product = Product.objects.create(name="Услуга", description="", cost=100)
+        today = timezone.now().date()
+        cls.contracts = [
+            Contract.objects.create(
+                name=f"Контракт {days}",
+                product=product,
+                end_date=today + timedelta(days=days),
+            )
+            for days in (-1, 0, 5, 5, 30, 31)
+        ]
+
+    def setUp(self) -> None:
+        # Права пользователей кешируются, а ID пользователей повторяются
+        # между тестами.
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_list_and_api_return_contracts_in_period(self) -> None:
+        response = self.client.get(reverse("contracts:contract_expiring"))
+        self.assertEqual(
+            [contract.pk for contract in response.context["contracts"]],
+            [contract.pk for contract in self.contracts[1:5]],
+        )
+        response = self.client.get(
+            reverse("api-contract-expiring"), {"days": 5, "fields": "id"}
+        )
+        self.assertEqual(
+            [item["id"] for item in response.json()["results"]],
+            [contract.pk for contract in self.contracts[1:4]],
+        )
+        response = self.client.get(reverse("api-contract-expiring"), {"days": -1})
+        self.assertEqual(response.status_code, 400)
+
+    def test_manager_can_choose_product_in_contract_form(self) -> None:
+        manager = User.objects.create_user(username="manager", password="manager")
+        manager.groups.add(Group.objects.get(name="Manager"))
+        self.assertEqual(
+            self.client.get(reverse("contracts:contract_create")).status_code, 200
+        )
+        response = self.client.get(reverse("products:product_autocomplete"))
+        self.assertEqual(
+            [item["text"] for item in response.json()["results"]], ["Услуга"]
+        )
+        self.client.force_login(User.objects.create_user(username="guest"))
+        response = self.client.get(reverse("products:product_autocomplete"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_scan_is_idempotent(self) -> None:
+        output = StringIO()
+        call_command("scan_expiring_contracts", "--batch-size", "2", stdout=output)
+        call_command("scan_expiring_contracts", "--batch-size", "2", stdout=output)
+        self.assertEqual(
+            output.getvalue().splitlines(),
+            ["Created 4 renewal tasks", "Created 0 renewal tasks"],
+        )
+        self.assertEqual(
+            sorted(ContractRenewalTask.objects.values_list("contract_id", flat=True)),
+            [contract.pk for contract in self.contracts[1:5]],
+        )
+
+    def test_api_pages_through_ties_by_end_date_and_id(self) -> None:
+        url = reverse("api-contract-expiring") + "?page_size=1&fields=id"
+        ids = []
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            ids += [item["id"] for item in response.json()["results"]]
+            pages.append(response.json())
+            url = response.json()["next"]
+        self.assertEqual(ids, [contract.pk for contract in self.contracts[1:5]])
+        previous = self.client.get(pages[-1]["previous"]).json()
+        self.assertEqual(previous["results"], pages[-2]["results"])
+        response = self.client.get(reverse("api-contract-expiring"), {"cursor": "x"})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ContractDocumentStorageTest(TestCase):
+    """
+    Проверяет хранение одинаковых документов одним файлом и удаление
+    неиспользуемых файлов.
+    """
+
+    def create(self, content: bytes, name: str) -> Contract:
+        product = Product.objects.create(name="Услуга", description="", cost=100)
+        contract = Contract(
+            name=name, product=product, document=ContentFile(content, f"{name}.PDF")
+        )
+        contract.save()
+        return contract
+
+    def test_same_content_is_stored_once_and_removed_after_last_use(self) -> None:
+        first = self.create(b"document", "first")
+        second = self.create(b"document", "second")
+        self.assertEqual(first.document.name, second.document.name)
+        self.assertTrue(first.document.name.endswith(".pdf"))
+        self.assertEqual(second.document_name, "second.PDF")
+        storage = first.document.storage
+        name = first.document.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(storage.exists(name))
+        with self.captureOnCommitCallbacks(execute=True):
+            second.document = None
+            second.save()
+        self.assertFalse(storage.exists(name))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ContractDocumentViewTest(TestCase):
+    """
+    Проверяет загрузку и скачивание документа контракта.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+        cls.product = Product.objects.create(name="Услуга", description="", cost=100)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def post_document(self, content: bytes):
+        return self.client.post(
+            reverse("contracts:contract_create"),
+            {
+                "name": "Контракт",
+                "product": self.product.pk,
+                "document": SimpleUploadedFile("contract.pdf", content),
+                "start_date": "2026-01-01",
+                "end_date": "2026-12-31",
+                "price": 100,
+            },
+        )
+
+    def test_upload_checks_permission_before_reading_body(self) -> None:
+        # Проверка CSRF читает тело запроса, поэтому она включена, чтобы
+        # чтение до проверки прав было заметно.
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.force_login(User.objects.create_user(username="guest"))
+        with mock.patch.object(
+            ContractDocumentUploadHandler, "new_file", side_effect=AssertionError
+        ):
+            response = self.post_document(b"document")
+        self.assertRedirects(
+            response,
+            reverse("contracts:contract_list"),
+            fetch_redirect_response=False,
+        )
+
+        self.client = Client()
+        self.client.force_login(self.admin)
+        with override_settings(CONTRACT_DOCUMENT_MAX_SIZE=4):
+            response = self.post_document(b"document")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            "Размер документа", response.context["form"].errors["document"][0]
+        )
+        self.assertFalse(Contract.objects.exists())
+        self.assertEqual(self.post_document(b"document").status_code, 302)
+        self.assertTrue(Contract.objects.get().document)
+
+    def test_download_supports_byte_ranges(self) -> None:
+        contract = Contract(
+            name="Контракт",
+            product=self.product,
+            document=ContentFile(b"0123456789", "contract.pdf"),
+        )
+        contract.save()
+        url = reverse("contracts:contract_document", args=[contract.pk])
+        self.client.force_login(self.admin)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"0123456789")
+        self.assertIn("contract.pdf", response["Content-Disposition"])
+
+        for header, content in (("bytes=2-4", b"234"), ("bytes=-3", b"789")):
+            response = self.client.get(url, headers={"Range": header})
+            self.assertEqual(response.status_code, 206)
+            self.assertEqual(b"".join(response.streaming_content), content)
+        self.assertEqual(response["Content-Range"], "bytes 7-9/10")
+
+        response = self.client.get(url, headers={"Range": "bytes=20-"})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */10")
@@ -0,0 +1,148 @@
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+from .models import Contract
+
+
+class HashedUploadedFile(UploadedFile):
+    """
+    Загруженный файл, уже записанный во временный каталог хранилища
+    вместе с посчитанным SHA-256.
+
+    Attributes:
+        sha256 (str): SHA-256 содержимого в шестнадцатеричном виде.
+    """
+
+    def __init__(self, path: str, sha256: str, **kwargs) -> None:
+        """
+        Инициализирует файл.
+
+        Args:
+            path (str): Абсолютный путь к временному файлу.
+            sha256 (str): SHA-256 содержимого.
+        """
+        super().__init__(open(path, "rb"), **kwargs)
+        self.path = path
+        self.sha256 = sha256
+
+    def temporary_file_path(self) -> str:
+        """
+        Возвращает путь к временному файлу.
+
+        Returns:
+            str: Абсолютный путь к временному файлу.
+        """
+        return self.path
+
+    def close(self) -> None:
+        """
+        Закрывает файл и удаляет его, если хранилище его не забрало.
+        """
+        super().close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+class ContractDocumentUploadHandler(FileUploadHandler):
+    """
+    Обработчик загрузки документа контракта.
+
+    Пишет части файла сразу во временный каталог хранилища документов
+    и считает SHA-256 на лету, поэтому при сохранении хранилищу остается
+    только создать жесткую ссылку: файл не копируется и не держится
+    в памяти. Файл больше CONTRACT_DOCUMENT_MAX_SIZE пропускается,
+    а у запроса выставляется признак document_too_large.
+
+    Attributes:
+        field_name (str): Поле формы, которое обрабатывает обработчик.
+    """
+
+    field_name: str = "document"
+
+    def __init__(self, request=None) -> None:
+        """
+        Инициализирует обработчик.
+
+        Args:
+            request (HttpRequest | None): Объект запроса.
+        """
+        super().__init__(request)
+        self.storage = Contract._meta.get_field("document").storage
+        self.max_size = settings.CONTRACT_DOCUMENT_MAX_SIZE
+        self.active = False
+
+    def new_file(self, field_name: str, *args, **kwargs) -> None:
+        """
+        Открывает временный файл для поля документа.
+        """
+        super().new_file(field_name, *args, **kwargs)
+        self.active = field_name == self.field_name
+        if not self.active:
+            return
+        self.size = 0
+        self.digest = hashlib.sha256()
+        self.path = self.storage.temporary_path()
+        self.file = open(self.path, "wb")
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes | None:
+        """
+        Дописывает часть файла и обновляет хеш.
+
+        Returns:
+            bytes | None: Данные для следующего обработчика, если файл
+            относится к другому полю.
+
+        Raises:
+            SkipFile: Если файл превысил допустимый размер.
+        """
+        if not self.active:
+            return raw_data
+        self.size += len(raw_data)
+        if self.size > self.max_size:
+            self.discard()
+            self.request.document_too_large = True
+            raise SkipFile()
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+        return None
+
+    def file_complete(self, file_size: int) -> HashedUploadedFile | None:
+        """
+        Завершает запись и возвращает загруженный файл.
+
+        Returns:
+            HashedUploadedFile | None: Файл документа или None для других полей.
+        """
+        if not self.active:
+            return None
+        self.active = False
+        self.file.close()
+        return HashedUploadedFile(
+            self.path,
+            self.digest.hexdigest(),
+            name=self.file_name,
+            content_type=self.content_type,
+            size=file_size,
+            charset=self.charset,
+            content_type_extra=self.content_type_extra,
+        )
+
+    def upload_interrupted(self) -> None:
+        """
+        Удаляет временный файл прерванной загрузки.
+        """
+        if self.active:
+            self.discard()
+
+    def discard(self) -> None:
+        """
+        Закрывает и удаляет временный файл текущей загрузки.
+        """
+        self.active = False
+        self.file.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
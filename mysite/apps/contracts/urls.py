@@ -1,11 +1,15 @@
 from django.urls import path
 
 from .views import (
+    ContractAutocompleteView,
     ContractCreateView,
     ContractDeleteView,
     ContractDetailView,
+    ContractDocumentView,
+    ContractExportView,
     ContractListView,
     ContractUpdateView,
+    ExpiringContractListView,
 )
 
 app_name = "contracts"
@@ -13,8 +17,18 @@ app_name = "contracts"
 
 urlpatterns = [
     path("", ContractListView.as_view(), name="contract_list"),
+    path("export/", ContractExportView.as_view(), name="contract_export"),
+    path("expiring/", ExpiringContractListView.as_view(), name="contract_expiring"),
+    path(
+        "autocomplete/",
+        ContractAutocompleteView.as_view(),
+        name="contract_autocomplete",
+    ),
     path("new/", ContractCreateView.as_view(), name="contract_create"),
     path("<int:pk>/", ContractDetailView.as_view(), name="contract_detail"),
+    path(
+        "<int:pk>/document/", ContractDocumentView.as_view(), name="contract_document"
+    ),
     path("<int:pk>/edit/", ContractUpdateView.as_view(), name="contract_update"),
     path("<int:pk>/delete/", ContractDeleteView.as_view(), name="contract_delete"),
 ]
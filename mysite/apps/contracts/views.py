@@ -1,11 +1,23 @@
+import mimetypes
 import os
-from typing import Optional
+import re
+from typing import Iterator
 
 from django.conf import settings
 from django.contrib.auth.mixins import PermissionRequiredMixin
-from django.http import HttpResponseRedirect
-from django.shortcuts import redirect
+from django.db.models import Count, Max, QuerySet
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseRedirect,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
+from django.utils.http import content_disposition_header
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.views.generic import (
     CreateView,
     DeleteView,
@@ -13,39 +25,83 @@ from django.views.generic import (
     ListView,
     UpdateView,
 )
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from apps.core.api import CrmModelViewSet, KeysetCursorPagination
+from apps.core.mixins import CsvExportMixin, QueryShapeMixin, SearchMixin
+from apps.core.pagination import KeysetPaginationMixin
+from apps.core.views import AutocompleteView
 
 from .forms import ContractForm
 from .models import Contract
+from .serializers import ContractSerializer
+from .services import EXPIRING_ORDERING, ContractRenewalService
+from .uploadhandler import ContractDocumentUploadHandler
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
 
 
-def checking_file(file) -> Optional[str]:
+class ContractDocumentUploadMixin:
+    """
+    Миксин, загружающий документ контракта через
+    ContractDocumentUploadHandler.
+
+    Обработчики загрузки нужно заменить до того, как будет прочитано
+    тело запроса, а CsrfViewMiddleware читает его раньше представления.
+    Поэтому проверка CSRF отключается для всего представления и выполняется
+    вручную после замены обработчиков. Миксин должен стоять в списке
+    базовых классов после PermissionRequiredMixin, чтобы тело запроса
+    читалось только после проверки прав.
     """
-    Проверяет наличие файла и возвращает уникальное имя файла.
 
-    Args:
-        file: Загружаемый файл.
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """
+        Отключает проверку CSRF в CsrfViewMiddleware.
 
-    Returns:
-        Optional[str]: Уникальное имя файла или None.
-    """
-    if file:
-        file_name, file_extension = os.path.splitext(file.name)
-        media_path = os.path.join(settings.MEDIA_ROOT, file.name)
+        Returns:
+            Callable: Функция представления.
+        """
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """
+        Подключает обработчик загрузки документа и обрабатывает запрос
+        с проверкой CSRF.
 
-        if not os.path.exists(media_path):
-            return file.name
+        Returns:
+            HttpResponse: Ответ представления.
+        """
+        request.upload_handlers.insert(0, ContractDocumentUploadHandler(request))
+        return csrf_protect(super().dispatch)(request, *args, **kwargs)
 
-        counter = 1
-        while True:
-            new_name = f"{file_name}_{counter}{file_extension}"
-            media_path = os.path.join(settings.MEDIA_ROOT, new_name)
-            if not os.path.exists(media_path):
-                return new_name
-            counter += 1
-    return None
+    def form_valid(self, form: ContractForm) -> HttpResponse:
+        """
+        Отклоняет форму, если документ превысил допустимый размер.
 
+        Args:
+            form (ContractForm): Заполненная форма.
+
+        Returns:
+            HttpResponse: Ответ представления.
+        """
+        if getattr(self.request, "document_too_large", False):
+            max_size = settings.CONTRACT_DOCUMENT_MAX_SIZE // (1024 * 1024)
+            form.add_error("document", f"Размер документа больше {max_size} МБ.")
+            return self.form_invalid(form)
+        return super().form_valid(form)
 
-class ContractListView(PermissionRequiredMixin, ListView):
+
+class ContractListView(
+    PermissionRequiredMixin,
+    QueryShapeMixin,
+    SearchMixin,
+    KeysetPaginationMixin,
+    ListView,
+):
     """
     Представление для отображения списка контрактов.
 
@@ -54,12 +110,16 @@ class ContractListView(PermissionRequiredMixin, ListView):
         template_name (str): Шаблон для отображения списка.
         context_object_name (str): Имя контекста для списка контрактов.
         permission_required (str): Разрешение для просмотра контрактов.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
+        search_fields (tuple[str, ...]): Поля для поиска.
     """
 
     model: Contract = Contract
     template_name: str = "contracts-list.html"
     context_object_name: str = "contracts"
     permission_required: str = "contracts.view_contract"
+    only_fields: tuple[str, ...] = ("id", "name")
+    search_fields: tuple[str, ...] = ("name",)
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
@@ -69,7 +129,85 @@ class ContractListView(PermissionRequiredMixin, ListView):
         return redirect(reverse_lazy('index'))
 
 
-class ContractDetailView(PermissionRequiredMixin, DetailView):
+class ContractExportView(CsvExportMixin, ContractListView):
+    """
+    Выгрузка списка контрактов в CSV с учетом поиска.
+
+    Attributes:
+        export_columns (dict[str, str]): Заголовки колонок и поля контракта.
+        export_filename (str): Имя выгружаемого файла.
+    """
+
+    export_columns: dict[str, str] = {
+        "ID": "id",
+        "Название": "name",
+        "Услуга": "product__name",
+        "Дата начала": "start_date",
+        "Дата окончания": "end_date",
+        "Сумма контракта": "price",
+        "Документ": "document_name",
+        "Создан": "created_at",
+    }
+    export_filename: str = "contracts.csv"
+
+
+class ExpiringContractListView(ContractListView):
+    """
+    Представление для отображения контрактов, которые скоро закончатся.
+
+    Количество дней до окончания задает параметр ?days=
+    (по умолчанию CONTRACT_EXPIRING_DAYS). Контракты выбираются
+    диапазоном по индексу (end_date, id) и упорядочены по дате окончания.
+
+    Attributes:
+        template_name (str): Шаблон для отображения списка.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
+        keyset_ordering (tuple[str, ...]): Поля ключа сортировки.
+    """
+
+    template_name: str = "contracts-expiring.html"
+    only_fields: tuple[str, ...] = ("id", "name", "end_date")
+    keyset_ordering: tuple[str, ...] = EXPIRING_ORDERING
+
+    def get_days(self) -> int:
+        """
+        Возвращает количество дней до окончания контракта.
+
+        Returns:
+            int: Значение параметра ?days= или значение по умолчанию,
+            если параметр указан неверно.
+        """
+        try:
+            return ContractRenewalService.parse_days(self.request.GET.get("days"))
+        except ValueError:
+            return settings.CONTRACT_EXPIRING_DAYS
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Возвращает истекающие контракты с учетом поиска.
+
+        Returns:
+            QuerySet: Контракты с датой окончания в выбранном периоде.
+        """
+        return (
+            super()
+            .get_queryset()
+            .filter(end_date__range=ContractRenewalService.get_period(self.get_days()))
+        )
+
+    def get_context_data(self, **kwargs) -> dict:
+        """
+        Добавляет в контекст количество дней до окончания.
+
+        Returns:
+            dict: Контекст шаблона.
+        """
+        context = super().get_context_data(**kwargs)
+        context["days"] = self.get_days()
+        return context
+
+
+class ContractDetailView(PermissionRequiredMixin, QueryShapeMixin, DetailView):
     """
     Представление для отображения деталей контракта.
 
@@ -78,22 +216,37 @@ class ContractDetailView(PermissionRequiredMixin, DetailView):
         template_name (str): Шаблон для отображения деталей.
         context_object_name (str): Имя контекста для контракта.
         permission_required (str): Разрешение для просмотра контракта.
+        select_related_fields (tuple[str, ...]): Связанные объекты,
+        загружаемые вместе с записью.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
     """
 
     model: Contract = Contract
     template_name: str = "contracts-detail.html"
     context_object_name: str = "contract"
     permission_required: str = "contracts.view_contract"
+    select_related_fields: tuple[str, ...] = ("product",)
+    only_fields: tuple[str, ...] = (
+        "id",
+        "name",
+        "start_date",
+        "end_date",
+        "price",
+        "document_name",
+        "product__name",
+    )
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
         Переопределяет поведение при отсутствии разрешения.
         Перенаправляет пользователя на список контрактов.
         """
-        return redirect(reverse_lazy("contract:contract_list"))
+        return redirect(reverse_lazy("contracts:contract_list"))
 
 
-class ContractCreateView(PermissionRequiredMixin, CreateView):
+class ContractCreateView(
+    PermissionRequiredMixin, ContractDocumentUploadMixin, CreateView
+):
     """
     Представление для создания нового контракта.
 
@@ -109,30 +262,17 @@ class ContractCreateView(PermissionRequiredMixin, CreateView):
     template_name: str = "contracts-create.html"
     permission_required: str = "contracts.add_contract"
 
-    def form_valid(self, form) -> None:
-        """
-        Обработка формы при создании контракта.
-
-        Args:
-            form: Форма контракта.
-
-        Returns:
-            None
-        """
-        uploaded_file = self.request.FILES.get("document")
-        if uploaded_file:
-            uploaded_file.name = checking_file(uploaded_file)
-        return super().form_valid(form)
-
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
         Переопределяет поведение при отсутствии разрешения.
         Перенаправляет пользователя на список контрактов.
         """
-        return redirect(reverse_lazy("contract:contract_list"))
+        return redirect(reverse_lazy("contracts:contract_list"))
 
 
-class ContractUpdateView(PermissionRequiredMixin, UpdateView):
+class ContractUpdateView(
+    PermissionRequiredMixin, ContractDocumentUploadMixin, UpdateView
+):
     """
     Представление для редактирования контракта.
 
@@ -148,27 +288,12 @@ class ContractUpdateView(PermissionRequiredMixin, UpdateView):
     template_name: str = "contracts-edit.html"
     permission_required: str = "contracts.change_contract"
 
-    def form_valid(self, form) -> None:
-        """
-        Обработка формы при редактировании контракта.
-
-        Args:
-            form: Форма контракта.
-
-        Returns:
-            None
-        """
-        uploaded_file = self.request.FILES.get("document")
-        if uploaded_file:
-            uploaded_file.name = checking_file(uploaded_file)
-        return super().form_valid(form)
-
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
         Переопределяет поведение при отсутствии разрешения.
         Перенаправляет пользователя на список контрактов.
         """
-        return redirect(reverse_lazy("contract:contract_list"))
+        return redirect(reverse_lazy("contracts:contract_list"))
 
 
 class ContractDeleteView(PermissionRequiredMixin, DeleteView):
@@ -187,26 +312,270 @@ class ContractDeleteView(PermissionRequiredMixin, DeleteView):
     success_url: str = "/contracts/"
     permission_required: str = "contracts.delete_contract"
 
-    def delete(self, request, *args, **kwargs) -> None:
+    def handle_no_permission(self) -> HttpResponseRedirect:
+        """
+        Переопределяет поведение при отсутствии разрешения.
+        Перенаправляет пользователя на список контрактов.
+        """
+        return redirect(reverse_lazy("contracts:contract_list"))
+
+
+class ContractDocumentView(PermissionRequiredMixin, View):
+    """
+    Представление для скачивания документа контракта.
+
+    Файл отдается с исходным именем. Если задана настройка
+    CONTRACT_DOCUMENT_ACCEL_REDIRECT, отдачу выполняет nginx по заголовку
+    X-Accel-Redirect. Иначе целый файл отдается через FileResponse
+    (сервер приложений может использовать sendfile), а запрос
+    с заголовком Range получает нужный диапазон байтов частями.
+
+    Attributes:
+        permission_required (str): Разрешение для просмотра контракта.
+        chunk_size (int): Размер части файла при отдаче диапазона.
+    """
+
+    permission_required: str = "contracts.view_contract"
+    chunk_size: int = 64 * 1024
+
+    def get(self, request: HttpRequest, pk: int) -> HttpResponse:
         """
-        Обработка удаления контракта.
+        Отдает документ контракта.
 
         Args:
-            request: Запрос.
-            *args: Дополнительные аргументы.
-            **kwargs: Именованные аргументы.
+            request (HttpRequest): Объект запроса.
+            pk (int): ID контракта.
 
         Returns:
-            None
+            HttpResponse: Файл, его часть или ответ для nginx.
+        """
+        contract = get_object_or_404(
+            Contract.objects.only("id", "document", "document_name"), pk=pk
+        )
+        if not contract.document:
+            return HttpResponse(status=404)
+        filename = contract.document_name or os.path.basename(contract.document.name)
+        content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+        accel_prefix = settings.CONTRACT_DOCUMENT_ACCEL_REDIRECT
+        if accel_prefix:
+            response = HttpResponse(content_type=content_type)
+            response["X-Accel-Redirect"] = (
+                accel_prefix.rstrip("/") + "/" + contract.document.name
+            )
+            self.set_attachment(response, filename)
+            return response
+
+        try:
+            file = contract.document.open("rb")
+        except FileNotFoundError:
+            return HttpResponse(status=404)
+        size = contract.document.size
+        byte_range = self.parse_range(request.headers.get("Range"), size)
+        if byte_range is None:
+            response = FileResponse(
+                file, as_attachment=True, filename=filename, content_type=content_type
+            )
+        elif byte_range is False:
+            file.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                self.read_range(file, start, end),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Length"] = str(end - start + 1)
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            self.set_attachment(response, filename)
+        response["Accept-Ranges"] = "bytes"
+        return response
+
+    @staticmethod
+    def parse_range(header: str | None, size: int) -> tuple[int, int] | bool | None:
         """
-        contract = self.get_object()
-        if contract.document:
-            contract.document.delete(save=False)
-        return super().delete(request, *args, **kwargs)
+        Разбирает заголовок Range с одним диапазоном байтов.
 
-    def handle_no_permission(self) -> HttpResponseRedirect:
+        Args:
+            header (str | None): Значение заголовка Range.
+            size (int): Размер файла.
+
+        Returns:
+            tuple[int, int] | bool | None: Первый и последний байт
+            диапазона, False для недопустимого диапазона или None,
+            если нужно отдать файл целиком.
         """
-        Переопределяет поведение при отсутствии разрешения.
-        Перенаправляет пользователя на список контрактов.
+        if not header:
+            return None
+        match = RANGE_RE.match(header.strip())
+        if not match or match.groups() == ("", ""):
+            return None
+        first, last = match.groups()
+        if first:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+        else:
+            start = max(size - int(last), 0)
+            end = size - 1
+        if start > end or start >= size:
+            return False
+        return start, end
+
+    def read_range(self, file, start: int, end: int) -> Iterator[bytes]:
+        """
+        Читает диапазон байтов файла частями.
+
+        Args:
+            file (File): Открытый файл.
+            start (int): Первый байт диапазона.
+            end (int): Последний байт диапазона.
+
+        Yields:
+            bytes: Очередная часть диапазона.
+        """
+        with file:
+            file.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    return
+                remaining -= len(chunk)
+                yield chunk
+
+    @staticmethod
+    def set_attachment(response: HttpResponse, filename: str) -> None:
+        """
+        Добавляет заголовок Content-Disposition с исходным именем файла.
+
+        Args:
+            response (HttpResponse): Ответ.
+            filename (str): Имя файла для сохранения.
+        """
+        disposition = content_disposition_header(True, filename)
+        if disposition:
+            response["Content-Disposition"] = disposition
+
+
+class ContractAutocompleteView(AutocompleteView):
+    """
+    Эндпоинт автодополнения для выбора контрактов в формах.
+
+    Attributes:
+        model (Contract): Модель, по которой идет поиск.
+        permission_required (str): Необходимое разрешение
+        для доступа к представлению.
+        search_fields (tuple[str, ...]): Поля для поиска по префиксу.
+        only_fields (tuple[str, ...]): Поля, нужные для названия объекта.
+    """
+
+    model: Contract = Contract
+    permission_required: str = "contracts.view_contract"
+    search_fields: tuple[str, ...] = ("name",)
+    only_fields: tuple[str, ...] = ("id", "name")
+
+
+class EndDateCursorPagination(KeysetCursorPagination):
+    """
+    Курсорная пагинация API по дате окончания и ID контракта
+    (индекс contracts_end_date_id).
+
+    Attributes:
+        ordering (tuple[str, ...]): Поля сортировки.
+    """
+
+    ordering: tuple[str, ...] = EXPIRING_ORDERING
+
+
+class ContractViewSet(SearchMixin, CrmModelViewSet):
+    """
+    API контрактов.
+
+    Список клиентов контракта меняется без изменения самого контракта,
+    поэтому в ETag учитываются количество клиентов и время последнего
+    изменения клиента. Действие expiring/ отдает контракты, которые
+    заканчиваются в ближайшие ?days= дней, по возрастанию даты окончания.
+
+    Attributes:
+        queryset (QuerySet): Контракты.
+        serializer_class (type): Сериализатор контракта.
+        search_fields (tuple[str, ...]): Поля для поиска ?q=.
+        etag_fields (tuple[str, ...]): Поля, от которых зависит
+        представление контракта.
+        last_modified_fields (tuple[str, ...]): Поля с временем изменения.
+    """
+
+    queryset = Contract.objects.all()
+    serializer_class = ContractSerializer
+    search_fields: tuple[str, ...] = ("name",)
+    etag_fields: tuple[str, ...] = (
+        "id",
+        "updated_at",
+        "product__updated_at",
+        "customers_count",
+        "customers_updated_at",
+    )
+    last_modified_fields: tuple[str, ...] = (
+        "updated_at",
+        "product__updated_at",
+        "customers_updated_at",
+    )
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Возвращает контракты; для expiring/ - только истекающие.
+
+        Returns:
+            QuerySet: QuerySet набора представлений.
+
+        Raises:
+            ValidationError: Если параметр ?days= указан неверно.
+        """
+        queryset = super().get_queryset()
+        if self.action != "expiring":
+            return queryset
+        try:
+            days = ContractRenewalService.parse_days(
+                self.request.query_params.get("days")
+            )
+        except ValueError:
+            raise ValidationError({"days": "Ожидается неотрицательное целое число."})
+        return queryset.filter(end_date__range=ContractRenewalService.get_period(days))
+
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="expiring",
+        url_name="expiring",
+        pagination_class=EndDateCursorPagination,
+    )
+    def expiring(self, request: Request) -> Response:
+        """
+        Возвращает страницу истекающих контрактов.
+
+        Args:
+            request (Request): Запрос.
+
+        Returns:
+            Response: Страница контрактов или ответ 304.
+        """
+        return self.list(request)
+
+    def get_validator_rows(self, queryset: QuerySet) -> QuerySet:
+        """
+        Добавляет к значениям для ETag сводку по клиентам контракта.
+
+        Args:
+            queryset (QuerySet): QuerySet контрактов.
+
+        Returns:
+            QuerySet: Словари со значениями для ETag и Last-Modified.
         """
-        return redirect(reverse_lazy("contract:contract_list"))
+        return super().get_validator_rows(
+            queryset.annotate(
+                customers_count=Count("customer_contract"),
+                customers_updated_at=Max("customer_contract__updated_at"),
+            )
+        )
@@ -0,0 +1,537 @@
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model, Prefetch, QuerySet
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from apps.myauth.permissions import ModelPermissions
+
+from .bulk import FAILED, BulkWriteService
+from .pagination import NEXT, PREVIOUS, decode_cursor, encode_cursor, keyset_filter
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация API по возрастанию ID.
+
+    Страницы выбираются условием id > последнего ID предыдущей страницы,
+    поэтому стоимость запроса не зависит от номера страницы, а новые
+    объекты появляются в конце выдачи.
+
+    Attributes:
+        page_size (int): Размер страницы по умолчанию.
+        ordering (str): Поле сортировки.
+        page_size_query_param (str): Параметр запроса с размером страницы.
+        max_page_size (int): Максимальный размер страницы.
+    """
+
+    page_size: int = 100
+    ordering: str = "id"
+    page_size_query_param: str = "page_size"
+    max_page_size: int = 1000
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Курсорная пагинация API по составному ключу сортировки.
+
+    В отличие от CursorPagination, которая сравнивает только первое поле
+    сортировки и пропускает совпадающие значения через OFFSET, страница
+    выбирается условием по всем полям ключа (a > x OR a = x AND b > y),
+    поэтому запрос читает составной индекс по ключу. Последним полем
+    ключа должно быть уникальное поле (обычно id). Страница может
+    состоять из объектов или словарей values().
+
+    Attributes:
+        page_size (int): Размер страницы по умолчанию.
+        ordering (tuple[str, ...]): Поля ключа сортировки.
+        cursor_query_param (str): Параметр запроса с курсором.
+        page_size_query_param (str): Параметр запроса с размером страницы.
+        max_page_size (int): Максимальный размер страницы.
+    """
+
+    page_size: int = 100
+    ordering: tuple[str, ...] = ("id",)
+    cursor_query_param: str = "cursor"
+    page_size_query_param: str = "page_size"
+    max_page_size: int = 1000
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view=None
+    ) -> list:
+        """
+        Возвращает записи текущей страницы.
+
+        Args:
+            queryset (QuerySet): Исходный QuerySet.
+            request (Request): Запрос.
+
+        Returns:
+            list: Записи страницы.
+
+        Raises:
+            ValidationError: Если курсор поврежден.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        direction, values = decode_cursor(cursor) or (NEXT, None)
+        if cursor and (values is None or len(values) != len(self.ordering)):
+            raise ValidationError({self.cursor_query_param: "Invalid cursor."})
+
+        ordering = list(self.ordering)
+        if direction == PREVIOUS:
+            ordering = [
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            ]
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(keyset_filter(self.ordering, values, direction))
+
+        page = list(queryset[: page_size + 1])
+        has_more = len(page) > page_size
+        page = page[:page_size]
+        if direction == PREVIOUS:
+            page.reverse()
+            has_next, has_previous = values is not None, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+        self.next = self.get_link(NEXT, page[-1]) if has_next and page else None
+        self.previous = (
+            self.get_link(PREVIOUS, page[0]) if has_previous and page else None
+        )
+        return page
+
+    def get_page_size(self, request: Request) -> int:
+        """
+        Возвращает размер страницы из параметров запроса.
+
+        Args:
+            request (Request): Запрос.
+
+        Returns:
+            int: Размер страницы.
+        """
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(size, self.max_page_size) if size > 0 else self.page_size
+
+    def get_link(self, direction: str, row) -> str:
+        """
+        Возвращает адрес соседней страницы от граничной записи row.
+
+        Args:
+            direction (str): Направление перехода (NEXT или PREVIOUS).
+            row: Объект или словарь values() граничной записи.
+
+        Returns:
+            str: Абсолютный адрес страницы.
+        """
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            if isinstance(row, dict):
+                values.append(row[name])
+                continue
+            value = row
+            for attribute in name.split("__"):
+                value = getattr(value, attribute)
+            values.append(value)
+        params = self.request.query_params.copy()
+        params[self.cursor_query_param] = encode_cursor(direction, values)
+        return self.request.build_absolute_uri(
+            f"{self.request.path}?{params.urlencode()}"
+        )
+
+    def get_paginated_response(self, data) -> Response:
+        """
+        Возвращает ответ со ссылками на соседние страницы.
+
+        Args:
+            data: Сериализованные записи страницы.
+
+        Returns:
+            Response: Ответ с ключами next, previous и results.
+        """
+        return Response({"next": self.next, "previous": self.previous, "results": data})
+
+
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор, отдающий только поля из контекста "fields".
+
+    Набор полей задает параметр запроса ?fields=; его разбирает
+    CrmModelViewSet и передает в контекст сериализатора.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Инициализирует сериализатор и удаляет незапрошенные поля.
+        """
+        super().__init__(*args, **kwargs)
+        requested = self.context.get("fields")
+        if requested:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
+
+def get_query_shape(
+    model: type[Model], serializer: serializers.Serializer
+) -> tuple[set[str], set[str], dict[str, Prefetch]]:
+    """
+    Определяет форму запроса по полям сериализатора.
+
+    Для каждого поля по его source находятся колонки для only(),
+    связи "многие к одному" для select_related и обратные связи
+    для prefetch_related. Поля, которых нет в модели (аннотации),
+    на форму запроса не влияют.
+
+    Args:
+        model (type[Model]): Модель сериализатора.
+        serializer (serializers.Serializer): Сериализатор с выбранными полями.
+
+    Returns:
+        tuple[set[str], set[str], dict[str, Prefetch]]: Поля для only(),
+        связи для select_related и предзагрузки по путям.
+    """
+    only, related, prefetch = {"pk"}, set(), {}
+    for field in serializer.fields.values():
+        if field.source == "*":
+            continue
+        current, path = model, []
+        for attr in field.source_attrs:
+            try:
+                model_field = current._meta.get_field(attr)
+            except FieldDoesNotExist:
+                break
+            path.append(attr)
+            lookup = "__".join(path)
+            if model_field.one_to_many or model_field.many_to_many:
+                remote = model_field.remote_field
+                prefetch[lookup] = Prefetch(
+                    lookup,
+                    queryset=model_field.related_model._default_manager.only(
+                        "pk", *([remote.name] if model_field.one_to_many else [])
+                    ),
+                )
+                break
+            only.add(lookup)
+            if not model_field.is_relation:
+                break
+            if attr != field.source_attrs[-1]:
+                related.add(lookup)
+            current = model_field.related_model
+    return only, related, prefetch
+
+
+class CrmModelViewSet(viewsets.ModelViewSet):
+    """
+    Базовый набор представлений API для моделей CRM.
+
+    На чтение поддерживаются разреженные наборы полей ?fields=a,b:
+    из базы выбираются только колонки и связи, нужные запрошенным
+    полям. Списки и объекты отдаются с заголовками ETag и Last-Modified,
+    которые считаются легким запросом по полям etag_fields; если клиент
+    прислал совпадающий If-None-Match или If-Modified-Since, отдается
+    ответ 304 без загрузки и сериализации объектов.
+
+    Attributes:
+        permission_classes (list): Разрешения на основе прав модели.
+        pagination_class (type): Класс пагинации.
+        fields_kwarg (str): Имя параметра запроса с набором полей.
+        etag_fields (tuple[str, ...]): Поля, от которых зависит
+        представление объекта.
+        last_modified_fields (tuple[str, ...]): Поля с временем изменения.
+    """
+
+    permission_classes: list = [ModelPermissions]
+    pagination_class = IdCursorPagination
+    fields_kwarg: str = "fields"
+    etag_fields: tuple[str, ...] = ("id", "updated_at")
+    last_modified_fields: tuple[str, ...] = ("updated_at",)
+
+    def get_requested_fields(self) -> list[str] | None:
+        """
+        Возвращает запрошенный набор полей.
+
+        Returns:
+            list[str] | None: Имена полей или None, если нужны все поля.
+
+        Raises:
+            ValidationError: Если запрошено неизвестное поле.
+        """
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return None
+        value = self.request.query_params.get(self.fields_kwarg, "")
+        requested = [name.strip() for name in value.split(",") if name.strip()]
+        if not requested:
+            return None
+        unknown = set(requested) - set(self.get_serializer_class()().fields)
+        if unknown:
+            raise ValidationError(
+                {self.fields_kwarg: f"Unknown fields: {', '.join(sorted(unknown))}"}
+            )
+        return requested
+
+    def get_serializer_context(self) -> dict:
+        """
+        Добавляет запрошенный набор полей в контекст сериализатора.
+
+        Returns:
+            dict: Контекст сериализатора.
+        """
+        context = super().get_serializer_context()
+        context["fields"] = self.get_requested_fields()
+        return context
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Возвращает QuerySet, загружающий только поля сериализатора.
+
+        Returns:
+            QuerySet: QuerySet набора представлений.
+        """
+        queryset = super().get_queryset()
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return queryset
+        only, related, prefetch = get_query_shape(queryset.model, self.get_serializer())
+        if related:
+            queryset = queryset.select_related(*related)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch.values())
+        return queryset.only(*only)
+
+    def get_validator_rows(self, queryset: QuerySet) -> QuerySet:
+        """
+        Возвращает QuerySet значений, по которым считаются ETag и Last-Modified.
+
+        Args:
+            queryset (QuerySet): QuerySet объектов.
+
+        Returns:
+            QuerySet: Словари со значениями etag_fields, last_modified_fields
+            и полей сортировки пагинации (по ним строится курсор).
+        """
+        ordering = getattr(self.paginator, "ordering", ())
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        names = dict.fromkeys(
+            (
+                *self.etag_fields,
+                *self.last_modified_fields,
+                *(field.lstrip("-") for field in ordering),
+            )
+        )
+        return queryset.prefetch_related(None).values(*names)
+
+    def get_validators(self, rows: list[dict]) -> tuple[str, int | None]:
+        """
+        Считает ETag и время изменения по легким строкам ответа.
+
+        Args:
+            rows (list[dict]): Значения etag_fields объектов ответа.
+
+        Returns:
+            tuple[str, int | None]: ETag и время изменения в секундах.
+        """
+        digest = hashlib.sha256()
+        digest.update(self.request.accepted_media_type.encode())
+        digest.update(repr(self.get_requested_fields()).encode())
+        for row in rows:
+            digest.update(repr([row[name] for name in self.etag_fields]).encode())
+        moments = [
+            row[name]
+            for row in rows
+            for name in self.last_modified_fields
+            if row[name] is not None
+        ]
+        last_modified = int(max(moments).timestamp()) if moments else None
+        return f'"{digest.hexdigest()}"', last_modified
+
+    def conditional_response(self, rows: list[dict], respond) -> Response:
+        """
+        Отдает 304, если клиент уже получил эти данные, иначе ответ respond().
+
+        Args:
+            rows (list[dict]): Значения etag_fields объектов ответа.
+            respond (Callable[[], Response]): Функция, строящая полный ответ.
+
+        Returns:
+            Response: Ответ с заголовками ETag и Last-Modified.
+        """
+        etag, last_modified = self.get_validators(rows)
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = respond()
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Возвращает страницу объектов с поддержкой условного GET.
+
+        Сначала страница выбирается по etag_fields; полные объекты
+        загружаются по ID только если данные изменились.
+
+        Args:
+            request (Request): Запрос.
+
+        Returns:
+            Response: Страница объектов или ответ 304.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.paginate_queryset(self.get_validator_rows(queryset))
+
+        def respond() -> Response:
+            ids = [row["id"] for row in rows]
+            objects = {obj.pk: obj for obj in queryset.filter(pk__in=ids)}
+            serializer = self.get_serializer(
+                [objects[pk] for pk in ids if pk in objects], many=True
+            )
+            return self.get_paginated_response(serializer.data)
+
+        return self.conditional_response(rows, respond)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """
+        Возвращает объект с поддержкой условного GET.
+
+        Args:
+            request (Request): Запрос.
+
+        Returns:
+            Response: Объект или ответ 304.
+
+        Raises:
+            Http404: Если объект не найден.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        )
+        row = self.get_validator_rows(queryset).first()
+        if row is None:
+            raise Http404
+        return self.conditional_response(
+            [row], lambda: super(CrmModelViewSet, self).retrieve(request)
+        )
+
+
+class BulkWriteMixin:
+    """
+    Миксин набора представлений с массовой записью по адресу bulk/.
+
+    POST создает объекты из списка, PATCH частично изменяет объекты
+    из списка с полем "id", DELETE удаляет объекты по списку ID.
+    Права проверяются как для одиночных операций (add, change, delete).
+    Элементы с ошибками не мешают записи остальных: ответ содержит
+    результат для каждого элемента и имеет статус 207, если были ошибки.
+
+    Attributes:
+        bulk_service_class (type[BulkWriteService]): Сервис массовой записи.
+    """
+
+    bulk_service_class: type[BulkWriteService]
+
+    @action(detail=False, methods=["post"], url_path="bulk", url_name="bulk")
+    def bulk_create(self, request: Request) -> Response:
+        """
+        Создает объекты из списка.
+
+        Args:
+            request (Request): Запрос со списком объектов.
+
+        Returns:
+            Response: Результаты по элементам.
+        """
+        return self.bulk_response(
+            self.bulk_service_class().create(self.get_bulk_items(request))
+        )
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request: Request) -> Response:
+        """
+        Частично изменяет объекты из списка.
+
+        Args:
+            request (Request): Запрос со списком изменений.
+
+        Returns:
+            Response: Результаты по элементам.
+        """
+        return self.bulk_response(
+            self.bulk_service_class().update(self.get_bulk_items(request))
+        )
+
+    @bulk_create.mapping.delete
+    def bulk_delete(self, request: Request) -> Response:
+        """
+        Удаляет объекты по списку ID.
+
+        Args:
+            request (Request): Запрос со списком ID.
+
+        Returns:
+            Response: Результаты по элементам.
+        """
+        return self.bulk_response(
+            self.bulk_service_class().delete(self.get_bulk_items(request))
+        )
+
+    def get_bulk_items(self, request: Request) -> list:
+        """
+        Возвращает элементы запроса.
+
+        Args:
+            request (Request): Запрос.
+
+        Returns:
+            list: Элементы.
+
+        Raises:
+            ValidationError: Если тело запроса не список или список
+            пуст или длиннее API_BULK_MAX_ITEMS.
+        """
+        items = request.data
+        limit = settings.API_BULK_MAX_ITEMS
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"non_field_errors": ["Ожидается непустой список."]})
+        if len(items) > limit:
+            raise ValidationError(
+                {"non_field_errors": [f"Не больше {limit} элементов за запрос."]}
+            )
+        return items
+
+    @staticmethod
+    def bulk_response(results: list[dict]) -> Response:
+        """
+        Формирует ответ с результатами по элементам.
+
+        Args:
+            results (list[dict]): Результаты по элементам.
+
+        Returns:
+            Response: Ответ 200 или 207, если часть элементов не записана.
+        """
+        failed = sum(1 for result in results if result["status"] == FAILED)
+        return Response(
+            {"succeeded": len(results) - failed, "failed": failed, "results": results},
+            status=status.HTTP_207_MULTI_STATUS if failed else status.HTTP_200_OK,
+        )
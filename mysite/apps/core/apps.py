@@ -0,0 +1,31 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class CoreConfig(AppConfig):
+    """
+    Конфигурация приложения с общими компонентами CRM.
+
+    Attributes:
+        default_auto_field (str): Тип автоматически
+        генерируемого первичного ключа.
+        name (str): Путь к приложению.
+    """
+
+    default_auto_field: str = "django.db.models.BigAutoField"
+    name: str = "apps.core"
+
+    def ready(self) -> None:
+        """
+        Подключает увеличение версий моделей в кеше к их сигналам.
+
+        Returns:
+            None
+        """
+        from . import signals
+        from .cache import VERSIONED_MODELS
+
+        for label in VERSIONED_MODELS:
+            model = self.apps.get_model(label)
+            post_save.connect(signals.model_changed, sender=model)
+            post_delete.connect(signals.model_changed, sender=model)
@@ -0,0 +1,326 @@
+from typing import Any, Iterable
+
+from django.db import transaction
+from django.db.models import CharField, Model, Value
+from django.utils import timezone
+from rest_framework import serializers
+
+from .cache import ModelVersionService
+
+CREATED: str = "created"
+UPDATED: str = "updated"
+DELETED: str = "deleted"
+FAILED: str = "error"
+
+
+class BulkWriteService:
+    """
+    Базовый сервис массового создания, изменения и удаления объектов.
+
+    Каждый элемент проверяется сериализатором без запросов к базе,
+    существование связанных объектов проверяется одним запросом на всю
+    пачку, ограничения уникальности проверяет check_constraints.
+    Корректные элементы записываются через bulk_create, bulk_update
+    или delete в одной транзакции, а для каждого элемента возвращается
+    результат: успешная запись или ошибки по полям. bulk_create
+    и bulk_update не отправляют сигналы, поэтому версия модели в кеше
+    увеличивается явно.
+
+    Attributes:
+        model (type[Model]): Модель объектов.
+        serializer_class (type[serializers.Serializer]): Сериализатор
+        элемента; связи в нем объявляются как ID (source="<поле>_id").
+        relations (dict[str, type[Model]]): Модели, на которые ссылаются
+        поля сериализатора.
+        update_extra_fields (tuple[str, ...]): Поля, которые prepare()
+        вычисляет сам и которые нужно записать при bulk_update.
+        batch_size (int): Размер пачки bulk_create и bulk_update.
+        results (list[dict | None]): Результаты по индексам элементов.
+    """
+
+    model: type[Model]
+    serializer_class: type[serializers.Serializer]
+    relations: dict[str, type[Model]] = {}
+    update_extra_fields: tuple[str, ...] = ()
+    batch_size: int = 500
+
+    def __init__(self) -> None:
+        """
+        Инициализирует сервис.
+        """
+        self.results: list[dict | None] = []
+
+    def create(self, items: list[dict]) -> list[dict]:
+        """
+        Создает объекты.
+
+        Args:
+            items (list[dict]): Данные объектов.
+
+        Returns:
+            list[dict]: Результаты по элементам.
+        """
+        self.results = [None] * len(items)
+        valid = self.validate(dict(enumerate(items)), partial=False)
+        self.check_relations(valid)
+        self.check_constraints(valid, {})
+        objects = {}
+        for index, data in valid.items():
+            if self.results[index] is None:
+                objects[index] = self.model(**data)
+                self.prepare(objects[index])
+        with transaction.atomic():
+            self.model._default_manager.bulk_create(
+                objects.values(), batch_size=self.batch_size
+            )
+            self.after_create(list(objects.values()))
+            ModelVersionService.schedule_bump(self.model)
+        for index, obj in objects.items():
+            self.results[index] = {"index": index, "status": CREATED, "id": obj.pk}
+        return self.results
+
+    def update(self, items: list[dict]) -> list[dict]:
+        """
+        Частично изменяет объекты, заданные полем "id" элементов.
+
+        Объекты читаются с блокировкой (select_for_update) в той же
+        транзакции, в которой записываются. bulk_update записывает
+        объединение изменяемых полей всей пачки, и без блокировки
+        параллельное изменение поля, не указанного в элементе,
+        перезаписалось бы значением, прочитанным до него.
+
+        Args:
+            items (list[dict]): ID и изменяемые поля объектов.
+
+        Returns:
+            list[dict]: Результаты по элементам.
+        """
+        self.results = [None] * len(items)
+        ids = self.collect_ids(
+            [item.get("id") if isinstance(item, dict) else None for item in items]
+        )
+        with transaction.atomic():
+            instances = (
+                self.model._default_manager.select_for_update()
+                .order_by("pk")
+                .in_bulk(ids.values())
+            )
+            for index, pk in ids.items():
+                if pk not in instances:
+                    self.fail(index, {"id": [f"Объект с ID {pk} не найден."]})
+            valid = self.validate(
+                {index: items[index] for index in ids if self.results[index] is None},
+                partial=True,
+            )
+            self.check_relations(valid)
+            targets = {index: instances[ids[index]] for index in valid}
+            self.check_constraints(valid, targets)
+
+            updated = {}
+            before = {}
+            fields = set(self.update_extra_fields)
+            for index, data in valid.items():
+                if self.results[index] is not None:
+                    continue
+                instance = updated[index] = targets[index]
+                before[instance.pk] = self.snapshot(instance)
+                for name, value in data.items():
+                    setattr(instance, name, value)
+                    fields.add(name)
+                self.prepare(instance)
+            if any(field.name == "updated_at" for field in self.model._meta.fields):
+                # bulk_update не заполняет поля auto_now.
+                now = timezone.now()
+                for instance in updated.values():
+                    instance.updated_at = now
+                fields.add("updated_at")
+            if updated and fields:
+                self.model._default_manager.bulk_update(
+                    updated.values(), sorted(fields), batch_size=self.batch_size
+                )
+            self.after_update(list(updated.values()), before)
+            ModelVersionService.schedule_bump(self.model)
+        for index, instance in updated.items():
+            self.results[index] = {"index": index, "status": UPDATED, "id": instance.pk}
+        return self.results
+
+    def delete(self, ids: list) -> list[dict]:
+        """
+        Удаляет объекты.
+
+        Args:
+            ids (list): ID объектов.
+
+        Returns:
+            list[dict]: Результаты по элементам.
+        """
+        self.results = [None] * len(ids)
+        found = self.collect_ids(ids)
+        existing = set(
+            self.model._default_manager.filter(pk__in=found.values()).values_list(
+                "pk", flat=True
+            )
+        )
+        for index, pk in found.items():
+            if pk not in existing:
+                self.fail(index, {"id": [f"Объект с ID {pk} не найден."]})
+        deleted = {
+            index: pk for index, pk in found.items() if self.results[index] is None
+        }
+        with transaction.atomic():
+            self.perform_delete(list(deleted.values()))
+            ModelVersionService.schedule_bump(self.model)
+        for index, pk in deleted.items():
+            self.results[index] = {"index": index, "status": DELETED, "id": pk}
+        return self.results
+
+    def collect_ids(self, ids: list) -> dict[int, int]:
+        """
+        Проверяет ID элементов: ID должен быть целым и не повторяться.
+
+        Args:
+            ids (list): ID по порядку элементов.
+
+        Returns:
+            dict[int, int]: Корректные ID по индексам элементов.
+        """
+        collected: dict[int, int] = {}
+        seen: set[int] = set()
+        for index, pk in enumerate(ids):
+            if not isinstance(pk, int) or isinstance(pk, bool):
+                self.fail(index, {"id": ["Укажите ID объекта."]})
+            elif pk in seen:
+                self.fail(index, {"id": ["ID повторяется в запросе."]})
+            else:
+                collected[index] = pk
+                seen.add(pk)
+        return collected
+
+    def validate(self, items: dict[int, Any], partial: bool) -> dict[int, dict]:
+        """
+        Проверяет элементы сериализатором.
+
+        Args:
+            items (dict[int, Any]): Данные по индексам элементов.
+            partial (bool): Разрешить ли отсутствие обязательных полей.
+
+        Returns:
+            dict[int, dict]: Проверенные данные по индексам элементов.
+        """
+        valid = {}
+        for index, item in items.items():
+            serializer = self.serializer_class(data=item, partial=partial)
+            if serializer.is_valid():
+                valid[index] = dict(serializer.validated_data)
+            else:
+                self.fail(index, serializer.errors)
+        return valid
+
+    def check_relations(self, valid: dict[int, dict]) -> None:
+        """
+        Проверяет одним запросом, что связанные объекты существуют.
+
+        Args:
+            valid (dict[int, dict]): Проверенные данные по индексам.
+        """
+        fields = self.serializer_class().fields
+        sources = {name: fields[name].source for name in self.relations}
+        queries = []
+        for name, model in self.relations.items():
+            ids = {
+                data[sources[name]]
+                for data in valid.values()
+                if data.get(sources[name]) is not None
+            }
+            if ids:
+                queries.append(
+                    model._default_manager.filter(pk__in=ids)
+                    .annotate(relation=Value(name, output_field=CharField()))
+                    .values_list("relation", "pk")
+                )
+        if not queries:
+            return
+        existing = set(queries[0].union(*queries[1:], all=True))
+        for index, data in valid.items():
+            errors = {
+                name: [f"Объект с ID {data[source]} не найден."]
+                for name, source in sources.items()
+                if data.get(source) is not None and (name, data[source]) not in existing
+            }
+            if errors:
+                self.fail(index, errors)
+
+    def check_constraints(
+        self, valid: dict[int, dict], instances: dict[int, Model]
+    ) -> None:
+        """
+        Проверяет ограничения, требующие запросов к базе.
+
+        Args:
+            valid (dict[int, dict]): Проверенные данные по индексам.
+            instances (dict[int, Model]): Изменяемые объекты по индексам
+            (пустой словарь при создании).
+        """
+
+    def prepare(self, obj: Model) -> None:
+        """
+        Заполняет вычисляемые поля объекта перед записью.
+
+        Args:
+            obj (Model): Создаваемый или изменяемый объект.
+        """
+
+    def snapshot(self, obj: Model) -> Any:
+        """
+        Запоминает значения объекта, нужные after_update.
+
+        Args:
+            obj (Model): Объект до изменения.
+
+        Returns:
+            Any: Сохраненные значения.
+        """
+        return None
+
+    def after_create(self, objects: list[Model]) -> None:
+        """
+        Вызывается в транзакции после bulk_create.
+
+        Args:
+            objects (list[Model]): Созданные объекты.
+        """
+
+    def after_update(self, objects: list[Model], before: dict[int, Any]) -> None:
+        """
+        Вызывается в транзакции после bulk_update.
+
+        Args:
+            objects (list[Model]): Измененные объекты.
+            before (dict[int, Any]): Результаты snapshot() по ID объектов.
+        """
+
+    def perform_delete(self, ids: list[int]) -> None:
+        """
+        Удаляет объекты в транзакции.
+
+        Args:
+            ids (list[int]): ID объектов.
+        """
+        self.model._default_manager.filter(pk__in=ids).delete()
+
+    def fail(self, index: int, errors: dict) -> None:
+        """
+        Регистрирует ошибки элемента.
+
+        Args:
+            index (int): Индекс элемента.
+            errors (dict): Ошибки по полям.
+        """
+        if self.results[index] is None:
+            self.results[index] = {"index": index, "status": FAILED, "errors": {}}
+        for field, messages in errors.items():
+            if not isinstance(messages, Iterable) or isinstance(messages, str):
+                messages = [messages]
+            self.results[index]["errors"].setdefault(field, []).extend(
+                str(message) for message in messages
+            )
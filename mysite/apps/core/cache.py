@@ -0,0 +1,244 @@
+import time
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.http import HttpRequest, HttpResponse
+from django.utils.http import urlencode
+
+from .routers import use_primary
+
+MODEL_VERSION_KEY_PREFIX: str = "model-version"
+
+# Модели, у которых есть версия в кеше. Версия увеличивается после
+# фиксации транзакции, в которой объект модели сохранен или удален.
+VERSIONED_MODELS: tuple[str, ...] = (
+    "products.Product",
+    "ads.Advertisement",
+    "ads.AdvertisementStats",
+    "leads.Lead",
+    "customers.Customer",
+    "contracts.Contract",
+)
+
+ModelRef = str | type[models.Model]
+
+
+def get_label(model: ModelRef) -> str:
+    """
+    Возвращает метку модели вида "app_label.Model".
+
+    Args:
+        model (ModelRef): Модель или ее метка.
+
+    Returns:
+        str: Метка модели.
+    """
+    if isinstance(model, str):
+        return model
+    return model._meta.label
+
+
+class ModelVersionService:
+    """
+    Сервис версий моделей для кеша без явной очистки.
+
+    В ключ закешированного значения входят версии всех моделей,
+    от которых оно зависит. Изменение любой из них увеличивает версию,
+    и прежний ключ больше не используется, а старое значение вытесняется
+    кешем по времени жизни. Начальная версия берется из текущего времени,
+    поэтому версия, вытесненная из кеша, не может вернуться к значению,
+    под которым уже хранились данные.
+    """
+
+    @classmethod
+    def get_key(cls, model: ModelRef) -> str:
+        """
+        Возвращает ключ кеша с версией модели.
+
+        Args:
+            model (ModelRef): Модель или ее метка.
+
+        Returns:
+            str: Ключ кеша.
+        """
+        return f"{MODEL_VERSION_KEY_PREFIX}:{get_label(model).lower()}"
+
+    @classmethod
+    def get_versions(cls, model_refs: Iterable[ModelRef]) -> dict[str, int]:
+        """
+        Возвращает текущие версии моделей одним обращением к кешу.
+
+        Args:
+            model_refs (Iterable[ModelRef]): Модели или их метки.
+
+        Returns:
+            dict[str, int]: Версии по меткам моделей.
+        """
+        keys = {cls.get_key(model): get_label(model) for model in model_refs}
+        found = cache.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            # add() не перезаписывает версию, созданную другим процессом.
+            for key in missing:
+                cache.add(key, time.time_ns(), None)
+            found.update(cache.get_many(missing))
+        return {label: found[key] for key, label in keys.items()}
+
+    @classmethod
+    def bump(cls, *model_refs: ModelRef) -> None:
+        """
+        Увеличивает версии моделей, делая недействительными все
+        закешированные значения, которые от них зависят.
+
+        Args:
+            *model_refs (ModelRef): Модели или их метки.
+        """
+        for model in model_refs:
+            key = cls.get_key(model)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), None)
+
+    @classmethod
+    def bump_all(cls) -> None:
+        """
+        Увеличивает версии всех моделей из VERSIONED_MODELS.
+
+        Нужно после операций, которые обходят сигналы моделей.
+        """
+        cls.bump(*VERSIONED_MODELS)
+
+    @classmethod
+    def schedule_bump(cls, *model_refs: ModelRef) -> None:
+        """
+        Увеличивает версии моделей после фиксации текущей транзакции.
+
+        Если увеличить версию раньше, параллельный запрос может
+        закешировать под новой версией еще не зафиксированные данные.
+
+        Args:
+            *model_refs (ModelRef): Модели или их метки.
+        """
+        transaction.on_commit(lambda: cls.bump(*model_refs))
+
+
+def versioned_key(name: str, model_refs: Iterable[ModelRef], *parts: Any) -> str:
+    """
+    Возвращает ключ кеша, зависящий от версий моделей.
+
+    Args:
+        name (str): Имя закешированного значения.
+        model_refs (Iterable[ModelRef]): Модели, от которых зависит значение.
+        *parts (Any): Параметры значения.
+
+    Returns:
+        str: Ключ кеша.
+    """
+    versions = ModelVersionService.get_versions(model_refs)
+    version = ".".join(str(versions[label]) for label in sorted(versions))
+    return ":".join([name, version, *map(str, parts)])
+
+
+def get_or_set_versioned(
+    name: str,
+    model_refs: Iterable[ModelRef],
+    compute: Callable[[], Any],
+    *parts: Any,
+    timeout: int | None = None,
+) -> Any:
+    """
+    Возвращает значение из кеша или вычисляет и кеширует его.
+
+    Значение вычисляется по основной базе: версия модели увеличивается
+    после фиксации изменений на ней, и значение, прочитанное с отстающей
+    реплики, закешировалось бы под новой версией.
+
+    Args:
+        name (str): Имя закешированного значения.
+        model_refs (Iterable[ModelRef]): Модели, от которых зависит значение.
+        compute (Callable[[], Any]): Функция, вычисляющая значение.
+        *parts (Any): Параметры значения.
+        timeout (int | None): Время жизни значения в секундах.
+        По умолчанию VERSIONED_CACHE_TIMEOUT.
+
+    Returns:
+        Any: Значение.
+    """
+    key = versioned_key(name, model_refs, *parts)
+    value = cache.get(key)
+    if value is None:
+        with use_primary():
+            value = compute()
+        cache.set(
+            key,
+            value,
+            settings.VERSIONED_CACHE_TIMEOUT if timeout is None else timeout,
+        )
+    return value
+
+
+class VersionedCacheMixin:
+    """
+    Миксин представления, кеширующий ответы на GET-запросы.
+
+    Ключ состоит из пути, параметров запроса и версий моделей
+    cache_models, поэтому после изменения этих моделей ответ строится
+    заново. Права проверяются до обращения к кешу, если миксин стоит
+    в списке базовых классов после PermissionRequiredMixin. Подходит
+    для ответов, которые не зависят от пользователя (например, JSON).
+    Ответ строится по основной базе, как в get_or_set_versioned().
+
+    Attributes:
+        cache_models (tuple[str, ...]): Модели, от которых зависит ответ.
+        cache_timeout (int | None): Время жизни ответа в секундах
+        (None - VERSIONED_CACHE_TIMEOUT).
+    """
+
+    cache_models: tuple[str, ...] = ()
+    cache_timeout: int | None = None
+
+    def dispatch(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """
+        Отдает ответ из кеша или строит и кеширует его.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            HttpResponse: Ответ представления.
+        """
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+        key = versioned_key("view", self.cache_models, *self.get_cache_parts())
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(content, content_type=content_type)
+        with use_primary():
+            response = super().dispatch(request, *args, **kwargs)
+            if hasattr(response, "render"):
+                response.render()
+        if response.status_code == 200 and not response.streaming:
+            cache.set(
+                key,
+                (response.content, response["Content-Type"]),
+                (
+                    settings.VERSIONED_CACHE_TIMEOUT
+                    if self.cache_timeout is None
+                    else self.cache_timeout
+                ),
+            )
+        return response
+
+    def get_cache_parts(self) -> list:
+        """
+        Возвращает параметры, от которых зависит ответ.
+
+        Returns:
+            list: Путь и упорядоченные параметры запроса.
+        """
+        query = urlencode(sorted(self.request.GET.lists()), doseq=True)
+        return [self.request.path, query]
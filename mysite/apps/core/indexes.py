@@ -0,0 +1,44 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models
+from django.db.models.functions import Upper
+
+
+class TrigramIndex(GinIndex):
+    """
+    Триграммный GIN-индекс по выражениям с классом операторов gin_trgm_ops.
+
+    GIN и pg_trgm есть только в PostgreSQL, поэтому на других СУБД
+    (например, SQLite в тестовом окружении) создается обычный индекс
+    по тем же выражениям без класса операторов.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor == "postgresql":
+            return super().create_sql(model, schema_editor, using, **kwargs)
+        expressions = [
+            (
+                expression.get_source_expressions()[0]
+                if isinstance(expression, OpClass)
+                else expression
+            )
+            for expression in self.expressions
+        ]
+        index = models.Index(*expressions, name=self.name)
+        return index.create_sql(model, schema_editor, **kwargs)
+
+
+def trigram_index(field: str, name: str) -> TrigramIndex:
+    """
+    Возвращает триграммный индекс для поиска по подстроке.
+
+    Выражение UPPER(поле) совпадает с тем, что Django строит для фильтра
+    icontains на PostgreSQL, поэтому SearchMixin использует индекс.
+
+    Args:
+        field (str): Поле модели.
+        name (str): Имя индекса.
+
+    Returns:
+        TrigramIndex: Индекс.
+    """
+    return TrigramIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
@@ -0,0 +1,218 @@
+import functools
+import json
+from typing import Iterator
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from apps.ads.models import Advertisement
+from apps.core.management.commands.benchmark_crm import DETAIL_VIEWS, LIST_VIEWS
+from apps.core.management.commands.benchmark_crm import Command as BenchmarkCommand
+from apps.core.metrics import fingerprint
+
+# Списки API и страницы, которых нет в benchmark_crm.
+EXTRA_VIEWS: list[str] = [
+    "contracts:contract_expiring",
+    "api-product-list",
+    "api-advertisement-list",
+    "api-lead-list",
+    "api-contract-list",
+    "api-contract-expiring",
+    "api-customer-list",
+]
+
+
+class Command(BaseCommand):
+    """
+    Команда для поиска запросов представлений, читающих таблицы целиком.
+
+    Открывает списки (в том числе с поиском) и детальные страницы CRM,
+    собирает выполненные SELECT-запросы и для каждого уникального запроса
+    выполняет EXPLAIN (ANALYZE, BUFFERS) на PostgreSQL или EXPLAIN QUERY
+    PLAN на SQLite. Последовательные сканирования, прочитавшие
+    не меньше --min-rows строк (на SQLite - сканирования таблиц
+    такого размера), выводятся как проблемы.
+    Данные для аудита создает команда seed_crm.
+
+    Attributes:
+        help (str): Краткое описание команды.
+    """
+
+    help = "EXPLAIN every CRM view query and report sequential scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=1000,
+            help="Ignore sequential scans reading fewer rows",
+        )
+        parser.add_argument(
+            "--search",
+            default="a",
+            help="Search string used for the ?q= variant of every list",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Print findings as JSON"
+        )
+
+    def handle(self, *args, **options):
+        if not Advertisement.objects.exists():
+            raise CommandError("The database is empty, run seed_crm first")
+
+        client = Client()
+        client.force_login(BenchmarkCommand.get_user())
+        findings = []
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            for name, url in self.get_urls(options["search"]):
+                for sql, params in self.capture(client, url):
+                    for table, detail in self.explain(sql, params, options["min_rows"]):
+                        findings.append(
+                            {
+                                "view": name,
+                                "table": table,
+                                "plan": detail,
+                                "query": fingerprint(sql),
+                            }
+                        )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(findings, indent=2, ensure_ascii=False))
+            return
+        for finding in findings:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{finding['view']}: sequential scan on {finding['table']} "
+                    f"({finding['plan']})"
+                )
+            )
+            self.stdout.write(f"    {finding['query']}")
+        style = self.style.WARNING if findings else self.style.SUCCESS
+        self.stdout.write(style(f"Found {len(findings)} sequential scans"))
+
+    @staticmethod
+    def get_urls(search: str) -> Iterator[tuple[str, str]]:
+        """
+        Возвращает проверяемые страницы.
+
+        Yields:
+            tuple[str, str]: Имя URL и адрес страницы.
+        """
+        for url_name in [*LIST_VIEWS, *EXTRA_VIEWS]:
+            url = reverse(url_name)
+            yield url_name, url
+            yield f"{url_name}?q", f"{url}?q={search}"
+        for url_name, model in DETAIL_VIEWS.items():
+            pk = model.objects.order_by("pk").values_list("pk", flat=True).first()
+            if pk is not None:
+                yield url_name, reverse(url_name, args=[pk])
+
+    @staticmethod
+    def capture(client: Client, url: str) -> list[tuple[str, tuple]]:
+        """
+        Открывает страницу и возвращает ее уникальные SELECT-запросы.
+
+        Args:
+            client (Client): Клиент с выполненным входом.
+            url (str): Адрес страницы.
+
+        Returns:
+            list[tuple[str, tuple]]: Текст и параметры запросов.
+
+        Raises:
+            CommandError: Если страница вернула ошибку.
+        """
+        queries = {}
+
+        def collect(execute, sql, params, many, context):
+            if not many and sql.lstrip().upper().startswith("SELECT"):
+                queries.setdefault(fingerprint(sql), (sql, tuple(params or ())))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(collect):
+            response = client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        if response.status_code >= 400:
+            raise CommandError(f"{url} returned {response.status_code}")
+        return list(queries.values())
+
+    def explain(
+        self, sql: str, params: tuple, min_rows: int
+    ) -> Iterator[tuple[str, str]]:
+        """
+        Выполняет EXPLAIN запроса и находит последовательные сканирования.
+
+        Args:
+            sql (str): Текст запроса.
+            params (tuple): Параметры запроса.
+            min_rows (int): Минимальное количество прочитанных строк
+            (для SQLite - строк в таблице).
+
+        Yields:
+            tuple[str, str]: Таблица и описание узла плана.
+        """
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                yield from self.find_seq_scans(plan[0]["Plan"], min_rows)
+            elif connection.vendor == "sqlite":
+                cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                for *_, detail in cursor.fetchall():
+                    words = detail.split()
+                    if words[0] != "SCAN" or "USING" in words:
+                        continue
+                    # План SQLite не содержит количества строк, поэтому
+                    # порог применяется к размеру таблицы.
+                    if self.count_rows(words[1]) >= min_rows:
+                        yield words[1], detail
+            else:
+                raise CommandError(f"EXPLAIN is not supported for {connection.vendor}")
+
+    @functools.lru_cache
+    def count_rows(self, table: str) -> int:
+        """
+        Возвращает количество строк таблицы (один раз за запуск команды).
+
+        Args:
+            table (str): Имя таблицы.
+
+        Returns:
+            int: Количество строк.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+            return cursor.fetchone()[0]
+
+    def find_seq_scans(self, node: dict, min_rows: int) -> Iterator[tuple[str, str]]:
+        """
+        Обходит план PostgreSQL и находит узлы Seq Scan.
+
+        Args:
+            node (dict): Узел плана в формате JSON.
+            min_rows (int): Минимальное количество прочитанных строк.
+
+        Yields:
+            tuple[str, str]: Таблица и описание узла плана.
+        """
+        if node["Node Type"] == "Seq Scan":
+            loops = node.get("Actual Loops", 1)
+            rows = (
+                node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)
+            ) * loops
+            if rows >= min_rows:
+                buffers = node.get("Shared Hit Blocks", 0) + node.get(
+                    "Shared Read Blocks", 0
+                )
+                yield node["Relation Name"], (
+                    f"{rows} rows read in {loops} loops, {buffers} buffers, "
+                    f"{node.get('Actual Total Time', 0):.3f} ms"
+                )
+        for child in node.get("Plans", []):
+            yield from self.find_seq_scans(child, min_rows)
@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.utils import load_backend
+
+from apps.core.management.commands.benchmark_crm import percentiles
+
+
+class Command(BaseCommand):
+    """
+    Команда для замера выигрыша от переиспользования соединений с базой.
+
+    Несколько потоков имитируют запросы к серверу: в начале и в конце
+    каждого запроса соединение проверяется так же, как это делает
+    Django по сигналам request_started и request_finished, а между ними
+    выполняется --queries простых запросов. Замер выполняется дважды:
+    с новым соединением на каждый запрос (CONN_MAX_AGE = 0 без пула)
+    и с настройками базы из DATABASES (постоянные соединения или пул).
+    Выводится JSON с перцентилями времени запроса в обоих режимах.
+
+    Attributes:
+        help (str): Краткое описание команды.
+    """
+
+    help = "Compare per-request latency of fresh and configured DB connections"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per thread"
+        )
+        parser.add_argument(
+            "--queries", type=int, default=3, help="Queries per request"
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        if min(options["threads"], options["requests"]) < 1:
+            raise CommandError("--threads and --requests must be positive")
+        alias = options["database"]
+        configured = connections[alias].settings_dict
+        fresh = {
+            **configured,
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {
+                name: value
+                for name, value in configured["OPTIONS"].items()
+                if name != "pool"
+            },
+        }
+        results = {}
+        for mode, settings_dict in (("fresh", fresh), ("configured", configured)):
+            self.stderr.write(f"Running {mode}")
+            results[mode] = self.run(
+                settings_dict,
+                f"{alias}_benchmark_{mode}",
+                options["threads"],
+                options["requests"],
+                options["queries"],
+            )
+
+        report = {
+            "vendor": connections[alias].vendor,
+            "database": alias,
+            "settings": {
+                "CONN_MAX_AGE": configured["CONN_MAX_AGE"],
+                "CONN_HEALTH_CHECKS": configured["CONN_HEALTH_CHECKS"],
+                "pool": configured["OPTIONS"].get("pool"),
+            },
+            "threads": options["threads"],
+            "requests": options["threads"] * options["requests"],
+            "results": results,
+            "saved_p50_ms": round(
+                results["fresh"]["p50_ms"] - results["configured"]["p50_ms"], 3
+            ),
+        }
+        output = json.dumps(report, indent=2, default=str)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output)
+        self.stdout.write(output)
+
+    @staticmethod
+    def run(
+        settings_dict: dict, alias: str, threads: int, requests: int, queries: int
+    ) -> dict:
+        """
+        Выполняет запросы в нескольких потоках и замеряет их время.
+
+        Args:
+            settings_dict (dict): Настройки соединения.
+            alias (str): Псевдоним соединения (и пула) для замера.
+            threads (int): Количество потоков.
+            requests (int): Количество запросов в каждом потоке.
+            queries (int): Количество SQL-запросов в одном запросе.
+
+        Returns:
+            dict: Перцентили времени запроса в миллисекундах.
+        """
+        backend = load_backend(settings_dict["ENGINE"])
+        start = threading.Barrier(threads)
+
+        def worker() -> list[float]:
+            connection = backend.DatabaseWrapper(settings_dict, alias)
+            timings = []
+            start.wait()
+            try:
+                for _ in range(requests):
+                    started = time.perf_counter()
+                    connection.close_if_unusable_or_obsolete()
+                    with connection.cursor() as cursor:
+                        for _ in range(queries):
+                            cursor.execute("SELECT 1")
+                            cursor.fetchone()
+                    connection.close_if_unusable_or_obsolete()
+                    timings.append((time.perf_counter() - started) * 1000)
+            finally:
+                connection.close()
+            return timings
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [executor.submit(worker) for _ in range(threads)]
+            timings = [timing for future in futures for timing in future.result()]
+        close_pool = getattr(
+            backend.DatabaseWrapper(settings_dict, alias), "close_pool", None
+        )
+        if close_pool is not None:
+            close_pool()
+        return percentiles(timings)
@@ -0,0 +1,248 @@
+import json
+import statistics
+import subprocess
+import time
+from typing import Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from apps.ads.models import Advertisement
+from apps.ads.services import AdvertisementStatsService
+from apps.contracts.models import Contract
+from apps.customers.models import Customer
+from apps.leads.models import Lead
+from apps.myauth.models import User
+from apps.myauth.services import DashboardCountersService
+from apps.products.models import Product
+
+BENCHMARK_USERNAME: str = "benchmark"
+
+# Списки и детальные страницы: имя URL и модель для выбора объекта.
+LIST_VIEWS: list[str] = [
+    "products:product_list",
+    "ads:advertisement_list",
+    "ads:advertisement_statistic",
+    "leads:lead_list",
+    "contracts:contract_list",
+    "customers:customer_list",
+]
+DETAIL_VIEWS: dict[str, type] = {
+    "products:product_detail": Product,
+    "ads:advertisement_detail": Advertisement,
+    "leads:lead_detail": Lead,
+    "contracts:contract_detail": Contract,
+    "customers:customer_detail": Customer,
+}
+
+
+def percentiles(timings: list[float]) -> dict[str, float]:
+    """
+    Возвращает перцентили замеров.
+
+    Args:
+        timings (list[float]): Замеры в миллисекундах.
+
+    Returns:
+        dict[str, float]: p50, p90, p99 и максимум в миллисекундах.
+    """
+    if len(timings) > 1:
+        cuts = statistics.quantiles(timings, n=100, method="inclusive")
+        p50, p90, p99 = cuts[49], cuts[89], cuts[98]
+    else:
+        p50 = p90 = p99 = timings[0]
+    return {
+        "p50_ms": round(p50, 3),
+        "p90_ms": round(p90, 3),
+        "p99_ms": round(p99, 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+class Command(BaseCommand):
+    """
+    Команда для замера производительности представлений и сервисов CRM.
+
+    Каждая цель выполняется --repeat раз после --warmup прогревочных
+    запусков. Для каждой цели выводятся перцентили времени выполнения
+    в миллисекундах и количество SQL-запросов за один запуск. Отчет
+    в формате JSON удобно сохранять и сравнивать между коммитами.
+    Данные для замера создает команда seed_crm.
+
+    Attributes:
+        help (str): Краткое описание команды.
+    """
+
+    help = "Measure latency percentiles and query counts of CRM views and services"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=2)
+        parser.add_argument(
+            "--only",
+            nargs="*",
+            default=None,
+            help="Run only targets whose name contains one of these substrings",
+        )
+        parser.add_argument("--output", help="Write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be positive")
+        if not Advertisement.objects.exists():
+            raise CommandError("The database is empty, run seed_crm first")
+
+        targets = self.get_targets()
+        if options["only"]:
+            targets = {
+                name: target
+                for name, target in targets.items()
+                if any(part in name for part in options["only"])
+            }
+
+        results = {}
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            for name, target in targets.items():
+                self.stderr.write(f"Running {name}")
+                results[name] = self.measure(
+                    target, options["repeat"], options["warmup"]
+                )
+
+        report = {
+            "commit": self.get_commit(),
+            "vendor": connection.vendor,
+            "rows": {
+                "products": Product.objects.count(),
+                "campaigns": Advertisement.objects.count(),
+                "leads": Lead.objects.count(),
+                "customers": Customer.objects.count(),
+                "contracts": Contract.objects.count(),
+            },
+            "repeat": options["repeat"],
+            "results": results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output)
+        self.stdout.write(output)
+
+    def get_targets(self) -> dict[str, Callable[[], object]]:
+        """
+        Возвращает замеряемые цели.
+
+        Returns:
+            dict[str, Callable[[], object]]: Функции по именам целей.
+        """
+        client = Client()
+        client.force_login(self.get_user())
+        campaign_id = (
+            Advertisement.objects.order_by("pk").values_list("pk", flat=True).first()
+        )
+
+        def get(url: str) -> Callable[[], object]:
+            def request() -> object:
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise CommandError(f"{url} returned {response.status_code}")
+                return response.content
+
+            return request
+
+        def cold_counters() -> dict[str, int]:
+            DashboardCountersService.invalidate()
+            return DashboardCountersService.get_counters()
+
+        targets = {
+            "service:campaign_stats": lambda: (
+                AdvertisementStatsService.get_campaign_stats(campaign_id)
+            ),
+            "service:campaign_stats_live": lambda: list(
+                Advertisement.objects.with_stats(live=True)
+                .filter(pk=campaign_id)
+                .values()
+            ),
+            "service:campaign_series": lambda: (
+                AdvertisementStatsService.get_campaign_series(
+                    [campaign_id], period="week"
+                )
+            ),
+            "service:dashboard_counters_cold": cold_counters,
+            "view:index": get(reverse("index")),
+            "view:advertisement_series": get(
+                f"{reverse('ads:advertisement_series')}"
+                f"?period=month&campaign={campaign_id}"
+            ),
+        }
+        for url_name in LIST_VIEWS:
+            targets[f"view:{url_name.split(':')[1]}"] = get(reverse(url_name))
+        for url_name, model in DETAIL_VIEWS.items():
+            pk = model.objects.order_by("pk").values_list("pk", flat=True).first()
+            if pk is not None:
+                targets[f"view:{url_name.split(':')[1]}"] = get(
+                    reverse(url_name, args=[pk])
+                )
+        return targets
+
+    @staticmethod
+    def measure(target: Callable[[], object], repeat: int, warmup: int) -> dict:
+        """
+        Замеряет время выполнения и количество запросов цели.
+
+        Args:
+            target (Callable[[], object]): Замеряемая функция.
+            repeat (int): Количество замеров.
+            warmup (int): Количество прогревочных запусков.
+
+        Returns:
+            dict: Перцентили в миллисекундах и количество запросов.
+        """
+        for _ in range(warmup):
+            target()
+        timings = []
+        queries = []
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                target()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured))
+        return {**percentiles(timings), "queries": max(queries)}
+
+    @staticmethod
+    def get_user() -> User:
+        """
+        Возвращает суперпользователя, от имени которого открываются страницы.
+
+        Returns:
+            User: Пользователь для замеров.
+        """
+        user, created = User.objects.get_or_create(
+            username=BENCHMARK_USERNAME,
+            defaults={"is_staff": True, "is_superuser": True},
+        )
+        if created:
+            user.set_unusable_password()
+            user.save(update_fields=["password"])
+        return user
+
+    @staticmethod
+    def get_commit() -> str | None:
+        """
+        Возвращает хеш текущего коммита git, если он доступен.
+
+        Returns:
+            str | None: Хеш коммита.
+        """
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
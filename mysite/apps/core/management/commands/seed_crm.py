@@ -0,0 +1,62 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.core.seeding import SCALES, CrmSeeder
+
+
+class Command(BaseCommand):
+    """
+    Команда для заполнения базы синтетическими данными CRM.
+
+    Объем задается готовым масштабом (--scale) или отдельными
+    параметрами, которые имеют приоритет над масштабом. При одинаковом
+    --seed и одинаковом начальном состоянии базы данные совпадают.
+
+    Attributes:
+        help (str): Краткое описание команды.
+    """
+
+    help = "Generate deterministic synthetic products, campaigns, leads and customers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="1k")
+        parser.add_argument("--products", type=int)
+        parser.add_argument("--campaigns", type=int)
+        parser.add_argument("--leads", type=int)
+        parser.add_argument(
+            "--customer-ratio",
+            type=float,
+            default=0.2,
+            help="Share of leads converted to customers",
+        )
+        parser.add_argument(
+            "--customers-per-contract",
+            type=int,
+            default=3,
+            help="Maximum number of customers sharing one contract",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=365,
+            help="Spread creation dates over this many past days",
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        volumes = {
+            name: options[name] if options[name] is not None else default
+            for name, default in SCALES[options["scale"]].items()
+        }
+        seeder = CrmSeeder(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            customer_ratio=options["customer_ratio"],
+            customers_per_contract=options["customers_per_contract"],
+            days=options["days"],
+            log=self.stderr.write,
+        )
+        created = seeder.seed(**volumes)
+        self.stdout.write(json.dumps(created, indent=2))
@@ -0,0 +1,286 @@
+import hashlib
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+DURATION_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+QUERY_COUNT_BUCKETS: tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Метрики, которые собираются по каждому сэмплированному запросу:
+# имя, описание и границы корзин гистограммы.
+HISTOGRAMS: dict[str, tuple[str, tuple[float, ...]]] = {
+    "crm_request_duration_seconds": ("Total request time", DURATION_BUCKETS),
+    "crm_request_python_seconds": (
+        "Request time outside SQL and template rendering",
+        DURATION_BUCKETS,
+    ),
+    "crm_request_sql_seconds": ("Time spent in SQL queries", DURATION_BUCKETS),
+    "crm_request_template_seconds": (
+        "Time spent rendering templates",
+        DURATION_BUCKETS,
+    ),
+    "crm_request_sql_queries": ("SQL queries per request", QUERY_COUNT_BUCKETS),
+    "crm_request_duplicate_queries": (
+        "Repeated SQL queries with the same fingerprint per request",
+        QUERY_COUNT_BUCKETS,
+    ),
+}
+
+# Сколько повторяющихся запросов хранить на представление. Счетчики
+# Prometheus не должны уменьшаться, поэтому запрос, попавший в число
+# отслеживаемых, из него уже не выходит, а новые запросы сверх лимита
+# не учитываются.
+TOP_DUPLICATES: int = 10
+
+IN_LIST_RE = re.compile(r"\bIN \((?:%s|\?)(?:, (?:%s|\?))*\)", re.IGNORECASE)
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Возвращает отпечаток SQL-запроса без конкретных значений.
+
+    Литералы заменяются на ?, а списки IN любой длины сворачиваются,
+    поэтому запросы, отличающиеся только параметрами, совпадают.
+
+    Args:
+        sql (str): Текст запроса.
+
+    Returns:
+        str: Отпечаток запроса.
+    """
+    sql = LITERAL_RE.sub("?", sql)
+    sql = IN_LIST_RE.sub("IN (...)", sql)
+    return SPACE_RE.sub(" ", sql).strip()
+
+
+@dataclass
+class RequestStats:
+    """
+    Статистика одного сэмплированного запроса.
+
+    Attributes:
+        sql_count (int): Количество SQL-запросов.
+        sql_time (float): Время SQL-запросов, в секундах.
+        template_time (float): Время рендеринга шаблонов, в секундах.
+        template_sql_time (float): Время SQL-запросов, выполненных
+        во время рендеринга шаблонов, в секундах. Входит и в sql_time,
+        и в template_time.
+        template_depth (int): Глубина вложенных рендерингов шаблонов.
+        fingerprints (Counter): Количество запросов по отпечаткам.
+    """
+
+    sql_count: int = 0
+    sql_time: float = 0.0
+    template_time: float = 0.0
+    template_sql_time: float = 0.0
+    template_depth: int = 0
+    fingerprints: Counter = field(default_factory=Counter)
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """
+        Возвращает отпечатки запросов, выполненных больше одного раза.
+
+        Returns:
+            dict[str, int]: Количество выполнений по отпечаткам.
+        """
+        return {sql: count for sql, count in self.fingerprints.items() if count > 1}
+
+
+current_request_stats: ContextVar[RequestStats | None] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+class Histogram:
+    """
+    Гистограмма в формате Prometheus.
+
+    Attributes:
+        buckets (tuple[float, ...]): Верхние границы корзин.
+        counts (list[int]): Количество наблюдений по корзинам.
+        total (float): Сумма наблюдений.
+        count (int): Количество наблюдений.
+    """
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        """
+        Инициализирует пустую гистограмму.
+
+        Args:
+            buckets (tuple[float, ...]): Верхние границы корзин.
+        """
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Добавляет наблюдение.
+
+        Args:
+            value (float): Наблюдаемое значение.
+        """
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> list[int]:
+        """
+        Возвращает накопленное количество наблюдений по корзинам.
+
+        Returns:
+            list[int]: Количество наблюдений не больше каждой границы.
+        """
+        result, running = [], 0
+        for count in self.counts:
+            running += count
+            result.append(running)
+        return result
+
+
+class MetricsRegistry:
+    """
+    Хранилище метрик запросов текущего процесса.
+
+    Attributes:
+        lock (threading.Lock): Блокировка для потоков сервера.
+        histograms (dict): Гистограммы по имени метрики и представлению.
+        duplicates (dict): Количество повторов по представлению
+        и отпечатку запроса.
+    """
+
+    def __init__(self) -> None:
+        """
+        Инициализирует пустое хранилище.
+        """
+        self.lock = threading.Lock()
+        self.histograms: dict[tuple[str, str], Histogram] = {}
+        self.duplicates: dict[str, Counter] = {}
+
+    def record(self, view: str, duration: float, stats: RequestStats) -> None:
+        """
+        Сохраняет статистику запроса.
+
+        Args:
+            view (str): Имя представления.
+            duration (float): Время обработки запроса, в секундах.
+            stats (RequestStats): Статистика запроса.
+        """
+        duplicates = stats.duplicates
+        # SQL из шаблонов входит и в sql_time, и в template_time,
+        # поэтому вычитается один раз.
+        outside_python = stats.sql_time + stats.template_time - stats.template_sql_time
+        values = {
+            "crm_request_duration_seconds": duration,
+            "crm_request_python_seconds": max(duration - outside_python, 0.0),
+            "crm_request_sql_seconds": stats.sql_time,
+            "crm_request_template_seconds": stats.template_time,
+            "crm_request_sql_queries": stats.sql_count,
+            "crm_request_duplicate_queries": sum(duplicates.values()) - len(duplicates),
+        }
+        with self.lock:
+            for name, value in values.items():
+                key = (name, view)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(HISTOGRAMS[name][1])
+                self.histograms[key].observe(value)
+            if duplicates:
+                counter = self.duplicates.setdefault(view, Counter())
+                for sql, count in duplicates.items():
+                    if sql in counter or len(counter) < TOP_DUPLICATES:
+                        counter[sql] += count
+
+    def reset(self) -> None:
+        """
+        Удаляет все собранные метрики.
+        """
+        with self.lock:
+            self.histograms.clear()
+            self.duplicates.clear()
+
+    def render(self) -> str:
+        """
+        Возвращает метрики в текстовом формате Prometheus.
+
+        Returns:
+            str: Текст метрик.
+        """
+        lines = []
+        with self.lock:
+            for name, (description, buckets) in HISTOGRAMS.items():
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for (metric, view), histogram in sorted(self.histograms.items()):
+                    if metric != name:
+                        continue
+                    label = f'view="{escape_label(view)}"'
+                    for bound, count in zip(buckets, histogram.cumulative()):
+                        lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+                    lines.append(
+                        f'{name}_bucket{{{label},le="+Inf"}} {histogram.count}'
+                    )
+                    lines.append(f"{name}_sum{{{label}}} {histogram.total}")
+                    lines.append(f"{name}_count{{{label}}} {histogram.count}")
+            name = "crm_duplicate_query_executions_total"
+            lines.append(f"# HELP {name} Executions of SQL repeated within one request")
+            lines.append(f"# TYPE {name} counter")
+            for view, counter in sorted(self.duplicates.items()):
+                for sql, count in counter.most_common():
+                    # Начало запроса у запросов к одной таблице часто
+                    # совпадает, поэтому метку различает хеш отпечатка.
+                    lines.append(
+                        f'{name}{{view="{escape_label(view)}",'
+                        f'fingerprint="{fingerprint_hash(sql)}",'
+                        f'query="{escape_label(sql[:200])}"}} {count}'
+                    )
+        return "\n".join(lines) + "\n"
+
+
+def fingerprint_hash(sql: str) -> str:
+    """
+    Возвращает короткий стабильный хеш отпечатка запроса для метки.
+
+    Args:
+        sql (str): Отпечаток запроса.
+
+    Returns:
+        str: Первые 16 символов SHA-1 в шестнадцатеричном виде.
+    """
+    return hashlib.sha1(sql.encode()).hexdigest()[:16]
+
+
+def escape_label(value: str) -> str:
+    """
+    Экранирует значение метки Prometheus.
+
+    Args:
+        value (str): Значение метки.
+
+    Returns:
+        str: Экранированное значение.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,117 @@
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from .metrics import RequestStats, current_request_stats, fingerprint, registry
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Middleware, собирающий метрики запросов.
+
+    Для доли запросов METRICS_SAMPLE_RATE записывает время обработки,
+    количество и время SQL-запросов, время рендеринга шаблонов
+    и повторяющиеся запросы с одинаковым отпечатком (признак N+1).
+    Метрики группируются по имени представления и отдаются
+    представлением MetricsView. Запросы, в которых один отпечаток
+    повторился не меньше METRICS_DUPLICATE_QUERY_THRESHOLD раз,
+    дополнительно пишутся в лог.
+    """
+
+    def __init__(self, get_response) -> None:
+        """
+        Инициализирует middleware.
+
+        Args:
+            get_response (Callable): Следующий обработчик запроса.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Обрабатывает запрос, собирая метрики для сэмплированных запросов.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            HttpResponse: Ответ.
+        """
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self.track_sql))
+                response = self.get_response(request)
+        finally:
+            duration = time.perf_counter() - started
+            current_request_stats.reset(token)
+        view = self.get_view_name(request)
+        registry.record(view, duration, stats)
+        self.log_duplicates(view, stats)
+        return response
+
+    @staticmethod
+    def track_sql(execute, sql, params, many, context):
+        """
+        Замеряет время SQL-запроса и запоминает его отпечаток.
+        """
+        stats = current_request_stats.get()
+        if stats is None:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.sql_time += elapsed
+            if stats.template_depth:
+                stats.template_sql_time += elapsed
+            stats.sql_count += 1
+            stats.fingerprints[fingerprint(sql)] += 1
+
+    @staticmethod
+    def get_view_name(request: HttpRequest) -> str:
+        """
+        Возвращает имя представления, обработавшего запрос.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            str: Имя URL с пространством имен или путь к представлению.
+        """
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "<unresolved>"
+        return match.view_name or match._func_path
+
+    @staticmethod
+    def log_duplicates(view: str, stats: RequestStats) -> None:
+        """
+        Пишет в лог запросы, повторившиеся слишком много раз.
+
+        Args:
+            view (str): Имя представления.
+            stats (RequestStats): Статистика запроса.
+        """
+        threshold = settings.METRICS_DUPLICATE_QUERY_THRESHOLD
+        if not threshold:
+            return
+        for sql, count in stats.duplicates.items():
+            if count >= threshold:
+                logger.warning(
+                    "Possible N+1 in %s: query executed %d times: %s", view, count, sql
+                )
@@ -0,0 +1,43 @@
+from django.contrib.postgres import operations as postgres_operations
+from django.db import migrations
+
+
+class TrigramExtension(postgres_operations.TrigramExtension):
+    """
+    Операция, подключающая расширение pg_trgm на PostgreSQL.
+
+    В отличие от операции из django.contrib.postgres, при откате
+    миграции расширение не удаляется: его используют триграммные
+    индексы нескольких приложений. На других СУБД ничего не делает.
+    """
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        pass
+
+
+class AddIndexConcurrently(postgres_operations.AddIndexConcurrently):
+    """
+    Операция AddIndexConcurrently из django.contrib.postgres, которая
+    работает и на других СУБД.
+
+    На PostgreSQL индекс строится через CREATE INDEX CONCURRENTLY, поэтому
+    миграция с этой операцией должна иметь atomic = False. На других СУБД
+    (например, SQLite в тестовом окружении) индекс создается обычным
+    AddIndex.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            migrations.AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state
+            )
@@ -0,0 +1,219 @@
+import base64
+import binascii
+import json
+from typing import Any, Sequence
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+
+NEXT: str = "n"
+PREVIOUS: str = "p"
+
+
+def encode_cursor(direction: str, values: Sequence[Any]) -> str:
+    """
+    Кодирует позицию страницы в непрозрачный курсор.
+
+    Args:
+        direction (str): Направление перехода (NEXT или PREVIOUS).
+        values (Sequence[Any]): Значения ключа сортировки граничной записи.
+
+    Returns:
+        str: Курсор в кодировке base64 без выравнивания.
+    """
+    payload = json.dumps([direction, list(values)], cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> tuple[str, list[Any]] | None:
+    """
+    Декодирует курсор, созданный encode_cursor.
+
+    Args:
+        cursor (str | None): Курсор из параметров запроса.
+
+    Returns:
+        tuple[str, list[Any]] | None: Направление и значения ключа
+        или None, если курсор отсутствует или поврежден.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, values = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        return None
+    if direction not in (NEXT, PREVIOUS) or not isinstance(values, list):
+        return None
+    return direction, values
+
+
+def keyset_filter(ordering: Sequence[str], values: Sequence[Any], direction: str) -> Q:
+    """
+    Строит условие для выборки записей после (или до) граничной записи.
+
+    Для сортировки (a, b) и значений (x, y) условие имеет вид
+    a > x OR (a = x AND b > y), что позволяет использовать составной индекс.
+
+    Args:
+        ordering (Sequence[str]): Поля сортировки, "-" означает убывание.
+        values (Sequence[Any]): Значения полей граничной записи.
+        direction (str): Направление перехода (NEXT или PREVIOUS).
+
+    Returns:
+        Q: Условие фильтрации.
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, values):
+        descending = field.startswith("-")
+        name = field.lstrip("-")
+        lookup = "gt" if descending == (direction == PREVIOUS) else "lt"
+        condition |= equal & Q(**{f"{name}__{lookup}": value})
+        equal &= Q(**{name: value})
+    return condition
+
+
+class KeysetPage:
+    """
+    Страница keyset-пагинации.
+
+    В отличие от django.core.paginator.Page не знает общего количества
+    записей и номера страницы: переход возможен только к соседним страницам.
+
+    Attributes:
+        object_list (list): Записи страницы.
+        next_query (str | None): Строка запроса для следующей страницы.
+        previous_query (str | None): Строка запроса для предыдущей страницы.
+    """
+
+    def __init__(
+        self,
+        object_list: list,
+        next_query: str | None,
+        previous_query: str | None,
+    ) -> None:
+        self.object_list = object_list
+        self.next_query = next_query
+        self.previous_query = previous_query
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        """
+        Возвращает True, если есть следующая страница.
+        """
+        return self.next_query is not None
+
+    def has_previous(self) -> bool:
+        """
+        Возвращает True, если есть предыдущая страница.
+        """
+        return self.previous_query is not None
+
+    def has_other_pages(self) -> bool:
+        """
+        Возвращает True, если есть соседние страницы.
+        """
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginationMixin:
+    """
+    Миксин keyset-пагинации для ListView.
+
+    Страница выбирается условием по ключу сортировки граничной записи,
+    а не через OFFSET, поэтому ее стоимость не зависит от глубины.
+    Последним полем ключа должно быть уникальное поле (обычно id).
+
+    Attributes:
+        paginate_by (int): Количество записей на странице.
+        keyset_ordering (tuple[str, ...]): Поля ключа сортировки.
+        cursor_kwarg (str): Имя параметра запроса с курсором.
+    """
+
+    paginate_by: int = 50
+    keyset_ordering: tuple[str, ...] = ("id",)
+    cursor_kwarg: str = "cursor"
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        """
+        Возвращает записи текущей страницы.
+
+        Args:
+            queryset (QuerySet): Исходный QuerySet.
+            page_size (int): Количество записей на странице.
+
+        Returns:
+            tuple: (None, KeysetPage, записи страницы, есть ли другие страницы),
+            в формате MultipleObjectMixin.paginate_queryset.
+        """
+        direction, values = decode_cursor(self.request.GET.get(self.cursor_kwarg)) or (
+            NEXT,
+            None,
+        )
+        if values is not None and len(values) != len(self.keyset_ordering):
+            direction, values = NEXT, None
+
+        ordering = list(self.keyset_ordering)
+        if direction == PREVIOUS:
+            ordering = [
+                field[1:] if field.startswith("-") else f"-{field}"
+                for field in ordering
+            ]
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(
+                keyset_filter(self.keyset_ordering, values, direction)
+            )
+
+        object_list = list(queryset[: page_size + 1])
+        has_more = len(object_list) > page_size
+        object_list = object_list[:page_size]
+        if direction == PREVIOUS:
+            object_list.reverse()
+            has_next, has_previous = values is not None, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        page = KeysetPage(
+            object_list,
+            next_query=(
+                self.get_page_query(NEXT, object_list[-1])
+                if has_next and object_list
+                else None
+            ),
+            previous_query=(
+                self.get_page_query(PREVIOUS, object_list[0])
+                if has_previous and object_list
+                else None
+            ),
+        )
+        return None, page, object_list, page.has_other_pages()
+
+    def get_page_query(self, direction: str, obj) -> str:
+        """
+        Возвращает строку запроса для перехода от записи obj.
+
+        Остальные параметры запроса (например, фильтры) сохраняются.
+
+        Args:
+            direction (str): Направление перехода (NEXT или PREVIOUS).
+            obj: Граничная запись страницы.
+
+        Returns:
+            str: Закодированная строка запроса без "?".
+        """
+        values = []
+        for field in self.keyset_ordering:
+            value = obj
+            for attribute in field.lstrip("-").split("__"):
+                value = getattr(value, attribute)
+            values.append(value)
+        params = self.request.GET.copy()
+        params[self.cursor_kwarg] = encode_cursor(direction, values)
+        return params.urlencode()
@@ -0,0 +1,202 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Model
+from django.http import HttpRequest, HttpResponse
+
+replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+SAFE_METHODS: tuple[str, ...] = ("GET", "HEAD", "OPTIONS")
+
+
+@contextmanager
+def use_replica() -> Iterator[None]:
+    """
+    Направляет чтения внутри блока на реплику.
+
+    Если реплики не настроены или текущий запрос закреплен
+    за основной базой, чтения остаются на основной базе.
+    """
+    token = replica_reads.set(True)
+    try:
+        yield
+    finally:
+        replica_reads.reset(token)
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """
+    Направляет все чтения внутри блока на основную базу, в том числе
+    внутри use_replica() и представлений с replica_reads.
+
+    Нужен для значений, которые кешируются под новой версией модели:
+    реплика может еще не содержать изменений, после которых версия
+    увеличилась, и устаревшее значение осталось бы в кеше до истечения
+    его времени жизни.
+    """
+    token = primary_pinned.set(True)
+    try:
+        yield
+    finally:
+        primary_pinned.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Роутер, направляющий чтения отчетных представлений на реплики.
+
+    Все записи и миграции выполняются на основной базе. Чтение моделей
+    CRM уходит на случайную реплику из DATABASE_REPLICAS только внутри
+    use_replica() или представления, помеченного replica_reads, если
+    запрос не закреплен за основной базой и основная база не находится
+    в транзакции. Сессии, пользователи и права всегда читаются
+    с основной базы.
+
+    Attributes:
+        replica_app_labels (frozenset[str]): Приложения, модели
+        которых можно читать с реплики.
+    """
+
+    replica_app_labels: frozenset[str] = frozenset(
+        {"ads", "contracts", "customers", "leads", "products"}
+    )
+
+    def db_for_read(self, model: type[Model], **hints) -> str:
+        """
+        Возвращает базу для чтения модели.
+
+        Args:
+            model (type[Model]): Модель.
+
+        Returns:
+            str: Псевдоним реплики или основной базы.
+        """
+        replicas = settings.DATABASE_REPLICAS
+        if (
+            replicas
+            and replica_reads.get()
+            and not primary_pinned.get()
+            and model._meta.app_label in self.replica_app_labels
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return random.choice(replicas)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model: type[Model], **hints) -> str:
+        """
+        Возвращает базу для записи модели.
+
+        Returns:
+            str: Псевдоним основной базы.
+        """
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints) -> bool:
+        """
+        Разрешает связи между объектами: реплики содержат те же данные.
+
+        Returns:
+            bool: True.
+        """
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints) -> bool:
+        """
+        Разрешает миграции только на основной базе.
+
+        Args:
+            db (str): Псевдоним базы.
+            app_label (str): Приложение.
+
+        Returns:
+            bool: True для основной базы.
+        """
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware, включающий чтение с реплики для отчетных представлений.
+
+    Безопасные запросы к представлениям с атрибутом replica_reads
+    читают данные CRM с реплики. После любого изменяющего запроса
+    клиент получает cookie REPLICA_PIN_COOKIE, и в течение
+    REPLICA_PIN_SECONDS все его запросы читают с основной базы, чтобы
+    видеть свои изменения, пока реплика их догоняет.
+    """
+
+    def __init__(self, get_response) -> None:
+        """
+        Инициализирует middleware.
+
+        Args:
+            get_response (Callable): Следующий обработчик запроса.
+        """
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """
+        Обрабатывает запрос и закрепляет клиента за основной базой
+        после изменяющего запроса.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            HttpResponse: Ответ.
+        """
+        writes = request.method not in SAFE_METHODS
+        reads_token = replica_reads.set(False)
+        pinned_token = primary_pinned.set(writes or self.is_pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_reads.reset(reads_token)
+            primary_pinned.reset(pinned_token)
+        if writes and settings.DATABASE_REPLICAS:
+            pin_seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                str(int(time.time() + pin_seconds)),
+                max_age=pin_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request: HttpRequest, view_func, view_args, view_kwargs):
+        """
+        Включает чтение с реплики, если представление это разрешает.
+        """
+        view_class = getattr(view_func, "view_class", None) or getattr(
+            view_func, "cls", None
+        )
+        if getattr(view_func, "replica_reads", False) or getattr(
+            view_class, "replica_reads", False
+        ):
+            replica_reads.set(True)
+        return None
+
+    @staticmethod
+    def is_pinned(request: HttpRequest) -> bool:
+        """
+        Проверяет, закреплен ли клиент за основной базой.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            bool: True, если окно после записи еще не истекло.
+        """
+        try:
+            until = int(request.COOKIES.get(settings.REPLICA_PIN_COOKIE, 0))
+        except ValueError:
+            return False
+        return until > time.time()
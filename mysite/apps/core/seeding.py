@@ -0,0 +1,248 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+from typing import Callable
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.ads.models import Advertisement
+from apps.ads.services import AdvertisementStatsService
+from apps.contracts.models import Contract
+from apps.core.cache import ModelVersionService
+from apps.customers.models import Customer
+from apps.leads.models import Lead
+from apps.products.models import Product
+
+CHANNELS: list[str] = ["search", "social", "email", "tv"]
+
+# Объемы данных для seed_crm --scale: услуги, кампании и лиды.
+SCALES: dict[str, dict[str, int]] = {
+    "1k": {"products": 10, "campaigns": 10, "leads": 1_000},
+    "100k": {"products": 50, "campaigns": 1_000, "leads": 100_000},
+    "10m": {"products": 200, "campaigns": 100_000, "leads": 10_000_000},
+}
+
+
+class CrmSeeder:
+    """
+    Генератор детерминированных синтетических данных CRM.
+
+    При одинаковом seed и одинаковом начальном состоянии базы создаются
+    одни и те же услуги, кампании, лиды, клиенты и контракты. Данные
+    вставляются через bulk_create пачками, поэтому сигналы моделей
+    не срабатывают: нормализованные контакты заполняются при создании
+    лидов, статистика кампаний пересчитывается в конце, а версии моделей
+    в кеше увеличиваются.
+
+    Attributes:
+        rng (random.Random): Генератор случайных чисел.
+        batch_size (int): Количество лидов в одной транзакции.
+        customer_ratio (float): Доля лидов, ставших клиентами.
+        customers_per_contract (int): Максимальное количество клиентов
+        одной кампании с общим контрактом.
+        days (int): За сколько последних дней распределяются даты создания.
+        log (Callable[[str], None]): Функция для вывода прогресса.
+    """
+
+    def __init__(
+        self,
+        seed: int = 42,
+        batch_size: int = 10_000,
+        customer_ratio: float = 0.2,
+        customers_per_contract: int = 3,
+        days: int = 365,
+        log: Callable[[str], None] | None = None,
+    ) -> None:
+        """
+        Инициализирует генератор.
+
+        Args:
+            seed (int): Начальное значение генератора случайных чисел.
+            batch_size (int): Количество лидов в одной транзакции.
+            customer_ratio (float): Доля лидов, ставших клиентами.
+            customers_per_contract (int): Максимальное количество
+            клиентов одной кампании с общим контрактом.
+            days (int): За сколько последних дней распределяются
+            даты создания.
+            log (Callable[[str], None] | None): Функция для вывода прогресса.
+        """
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.customer_ratio = customer_ratio
+        self.customers_per_contract = customers_per_contract
+        self.days = days
+        self.log = log or (lambda message: None)
+        self.period_end = timezone.now().replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+    def seed(self, products: int, campaigns: int, leads: int) -> dict[str, int]:
+        """
+        Создает услуги, кампании, лиды, клиентов и контракты.
+
+        Args:
+            products (int): Количество услуг.
+            campaigns (int): Количество рекламных кампаний.
+            leads (int): Количество лидов.
+
+        Returns:
+            dict[str, int]: Количество созданных объектов по моделям.
+        """
+        product_ids = self.seed_products(products)
+        campaign_ids = self.seed_campaigns(campaigns, product_ids)
+        created = {"products": len(product_ids), "campaigns": len(campaign_ids)}
+        created.update(self.seed_leads(leads, campaign_ids, product_ids))
+
+        for start in range(0, len(campaign_ids), 1000):
+            AdvertisementStatsService.refresh_stats(campaign_ids[start : start + 1000])
+        ModelVersionService.bump_all()
+        return created
+
+    def seed_products(self, count: int) -> list[int]:
+        """
+        Создает услуги.
+
+        Args:
+            count (int): Количество услуг.
+
+        Returns:
+            list[int]: ID созданных услуг.
+        """
+        offset = Product.objects.count()
+        products = Product.objects.bulk_create(
+            Product(
+                name=f"Product {offset + number}",
+                description=f"Synthetic product {offset + number}",
+                cost=Decimal(self.rng.randint(1_000, 100_000)),
+            )
+            for number in range(count)
+        )
+        return [product.pk for product in products]
+
+    def seed_campaigns(self, count: int, product_ids: list[int]) -> list[int]:
+        """
+        Создает рекламные кампании.
+
+        Args:
+            count (int): Количество кампаний.
+            product_ids (list[int]): ID услуг, которые продвигают кампании.
+
+        Returns:
+            list[int]: ID созданных кампаний.
+        """
+        offset = Advertisement.objects.count()
+        campaign_ids = []
+        for start in range(0, count, self.batch_size):
+            with transaction.atomic():
+                campaigns = Advertisement.objects.bulk_create(
+                    Advertisement(
+                        name=f"Campaign {offset + number}",
+                        product_id=self.rng.choice(product_ids),
+                        channel=self.rng.choice(CHANNELS),
+                        budget=Decimal(self.rng.randint(0, 100_000)),
+                    )
+                    for number in range(start, min(start + self.batch_size, count))
+                )
+            campaign_ids.extend(campaign.pk for campaign in campaigns)
+        return campaign_ids
+
+    def seed_leads(
+        self, total: int, campaign_ids: list[int], product_ids: list[int]
+    ) -> dict[str, int]:
+        """
+        Создает лиды пачками и превращает часть из них в клиентов.
+
+        Args:
+            total (int): Количество лидов.
+            campaign_ids (list[int]): ID кампаний, к которым относятся лиды.
+            product_ids (list[int]): ID услуг для контрактов.
+
+        Returns:
+            dict[str, int]: Количество созданных лидов, клиентов и контрактов.
+        """
+        offset = Lead.objects.count()
+        created = {"leads": 0, "customers": 0, "contracts": 0}
+        while created["leads"] < total:
+            size = min(self.batch_size, total - created["leads"])
+            first = offset + created["leads"]
+            with transaction.atomic():
+                leads = [
+                    Lead(
+                        first_name=f"Name {first + number}",
+                        last_name=f"Surname {first + number}",
+                        phone=f"+7{first + number:010d}",
+                        email=f"lead{first + number}@example.com",
+                        advertisement_id=self.rng.choice(campaign_ids),
+                        created_at=self.random_moment(),
+                    )
+                    for number in range(size)
+                ]
+                for lead in leads:
+                    lead.normalize_contacts()
+                Lead.objects.bulk_create(leads)
+                customers, contracts = self.seed_customers(leads, product_ids)
+            created["leads"] += size
+            created["customers"] += customers
+            created["contracts"] += contracts
+            self.log(f"Seeded {created['leads']} leads")
+        return created
+
+    def seed_customers(
+        self, leads: list[Lead], product_ids: list[int]
+    ) -> tuple[int, int]:
+        """
+        Превращает часть лидов пачки в клиентов с общими контрактами.
+
+        Клиенты одной кампании объединяются в группы до
+        customers_per_contract человек с одним контрактом на группу.
+
+        Args:
+            leads (list[Lead]): Созданные лиды.
+            product_ids (list[int]): ID услуг для контрактов.
+
+        Returns:
+            tuple[int, int]: Количество созданных клиентов и контрактов.
+        """
+        converted = [lead for lead in leads if self.rng.random() < self.customer_ratio]
+        converted.sort(key=lambda lead: (lead.advertisement_id, lead.pk))
+        groups = []
+        for lead in converted:
+            if (
+                not groups
+                or len(groups[-1]) >= self.customers_per_contract
+                or groups[-1][0].advertisement_id != lead.advertisement_id
+            ):
+                groups.append([])
+            groups[-1].append(lead)
+
+        contracts = Contract.objects.bulk_create(
+            Contract(
+                name=f"Contract {group[0].pk}",
+                product_id=self.rng.choice(product_ids),
+                price=Decimal(self.rng.randint(1_000, 500_000)),
+                created_at=min(
+                    max(lead.created_at for lead in group)
+                    + timedelta(days=self.rng.randint(0, 14)),
+                    self.period_end,
+                ),
+            )
+            for group in groups
+        )
+        customers = Customer.objects.bulk_create(
+            Customer(lead=lead, contract=contract, created_at=contract.created_at)
+            for contract, group in zip(contracts, groups)
+            for lead in group
+        )
+        return len(customers), len(contracts)
+
+    def random_moment(self):
+        """
+        Возвращает случайный момент времени за последние days дней.
+
+        Returns:
+            datetime: Момент времени.
+        """
+        return self.period_end - timedelta(
+            seconds=self.rng.randrange(max(self.days, 1) * 24 * 60 * 60)
+        )
@@ -0,0 +1,8 @@
+from .cache import ModelVersionService
+
+
+def model_changed(sender, instance, **kwargs) -> None:
+    """
+    Увеличивает версию модели в кеше после сохранения или удаления объекта.
+    """
+    ModelVersionService.schedule_bump(sender)
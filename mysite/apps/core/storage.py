@@ -0,0 +1,194 @@
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+from django.db import connection
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible(path="apps.core.storage.ContentAddressedStorage")
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище, в котором имя файла определяется его содержимым.
+
+    При сохранении файл потоково записывается во временный файл внутри
+    хранилища с одновременным подсчетом SHA-256, после чего жестко
+    связывается с путем вида <каталог>/ab/cd/<sha256><расширение>.
+    Создание ссылки атомарно, поэтому одновременные загрузки одного
+    и того же содержимого оставляют один файл, а подбор свободного имени
+    не нужен. Файл может использоваться несколькими объектами, поэтому
+    сохранение и удаление неиспользуемого файла сериализуются
+    блокировкой lock_name до конца транзакции.
+
+    Attributes:
+        temp_dir (str): Каталог временных файлов относительно корня.
+        shard_depth (int): Количество уровней вложенных каталогов.
+        max_extension_length (int): Максимальная длина расширения.
+    """
+
+    temp_dir: str = "tmp"
+    shard_depth: int = 2
+    max_extension_length: int = 16
+
+    def get_available_name(self, name: str, max_length: int | None = None) -> str:
+        """
+        Возвращает имя без изменений: окончательное имя вычисляется
+        по содержимому при сохранении.
+
+        Args:
+            name (str): Предлагаемое имя файла.
+            max_length (int | None): Максимальная длина имени.
+
+        Returns:
+            str: Переданное имя.
+        """
+        return name
+
+    def hashed_name(self, name: str, digest: str) -> str:
+        """
+        Возвращает путь файла в хранилище по его хешу.
+
+        Args:
+            name (str): Исходное имя файла с каталогом из upload_to.
+            digest (str): SHA-256 содержимого в шестнадцатеричном виде.
+
+        Returns:
+            str: Путь файла относительно корня хранилища.
+        """
+        directory, basename = os.path.split(name)
+        extension = os.path.splitext(basename)[1].lower()
+        if len(extension) > self.max_extension_length:
+            extension = ""
+        shards = [
+            digest[2 * level : 2 * level + 2] for level in range(self.shard_depth)
+        ]
+        return os.path.join(directory, *shards, digest + extension).replace("\\", "/")
+
+    def temporary_path(self) -> str:
+        """
+        Создает пустой временный файл внутри хранилища.
+
+        Временный файл лежит в той же файловой системе, что и итоговый,
+        поэтому его можно связать с итоговым путем без копирования.
+
+        Returns:
+            str: Абсолютный путь к временному файлу.
+        """
+        directory = self.path(self.temp_dir)
+        os.makedirs(directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=directory)
+        os.close(fd)
+        return path
+
+    def write_temporary(self, content) -> tuple[str, str]:
+        """
+        Потоково записывает содержимое во временный файл и считает хеш.
+
+        Args:
+            content (File): Сохраняемый файл.
+
+        Returns:
+            tuple[str, str]: Путь к временному файлу и SHA-256 содержимого.
+        """
+        path = self.temporary_path()
+        digest = hashlib.sha256()
+        try:
+            with open(path, "wb") as temporary:
+                for chunk in content.chunks():
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    digest.update(chunk)
+                    temporary.write(chunk)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return path, digest.hexdigest()
+
+    def commit_temporary(self, path: str, name: str, digest: str) -> str:
+        """
+        Переносит временный файл по адресу, вычисленному из хеша.
+
+        Если файл с таким содержимым уже есть, временный файл удаляется.
+
+        Args:
+            path (str): Абсолютный путь к временному файлу.
+            name (str): Исходное имя файла с каталогом из upload_to.
+            digest (str): SHA-256 содержимого.
+
+        Returns:
+            str: Имя сохраненного файла относительно корня хранилища.
+        """
+        name = self.hashed_name(name, digest)
+        self.lock_name(name)
+        full_path = self.path(name)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        try:
+            os.link(path, full_path)
+        except FileExistsError:
+            pass
+        except OSError:
+            # Файловая система без жестких ссылок: переименование тоже
+            # атомарно, а одинаковое содержимое можно перезаписать.
+            os.replace(path, full_path)
+        else:
+            if self.file_permissions_mode is not None:
+                os.chmod(full_path, self.file_permissions_mode)
+        if os.path.exists(path):
+            os.unlink(path)
+        return name
+
+    def lock_name(self, name: str) -> None:
+        """
+        Блокирует имя файла до конца текущей транзакции.
+
+        Загрузка берет блокировку перед тем, как переиспользовать
+        существующий файл, а удаление - перед проверкой, что на файл никто
+        не ссылается. Пока загрузка не зафиксировала ссылку на файл,
+        удаление ждет и затем видит эту ссылку; удаление, начавшееся
+        раньше, заканчивается до того, как загрузка создаст файл заново.
+        На PostgreSQL используется pg_advisory_xact_lock; вне транзакции
+        и на других СУБД блокировка не берется.
+
+        Args:
+            name (str): Имя файла относительно корня хранилища.
+        """
+        if connection.vendor != "postgresql" or not connection.in_atomic_block:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [name])
+
+    def _save(self, name: str, content) -> str:
+        """
+        Сохраняет файл под именем, вычисленным из его содержимого.
+
+        Файл, который обработчик загрузки уже записал во временный
+        каталог хранилища и для которого посчитал хеш, не копируется.
+
+        Args:
+            name (str): Исходное имя файла с каталогом из upload_to.
+            content (File): Сохраняемый файл.
+
+        Returns:
+            str: Имя сохраненного файла относительно корня хранилища.
+        """
+        digest = getattr(content, "sha256", None)
+        if digest and self.is_temporary(content):
+            return self.commit_temporary(content.temporary_file_path(), name, digest)
+        path, digest = self.write_temporary(content)
+        return self.commit_temporary(path, name, digest)
+
+    def is_temporary(self, content) -> bool:
+        """
+        Проверяет, что файл уже лежит во временном каталоге хранилища.
+
+        Args:
+            content (File): Сохраняемый файл.
+
+        Returns:
+            bool: True, если файл можно связать без копирования.
+        """
+        if not hasattr(content, "temporary_file_path"):
+            return False
+        directory = os.path.dirname(os.path.abspath(content.temporary_file_path()))
+        return directory == os.path.abspath(self.path(self.temp_dir))
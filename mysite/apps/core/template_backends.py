@@ -0,0 +1,49 @@
+import time
+
+from django.template.backends.django import DjangoTemplates, Template
+
+from .metrics import current_request_stats
+
+
+class TimedTemplate(Template):
+    """
+    Шаблон, время рендеринга которого учитывается в метриках запроса.
+    """
+
+    def render(self, context=None, request=None) -> str:
+        """
+        Рендерит шаблон и добавляет время рендеринга к метрикам запроса.
+
+        Вложенные рендеринги (например, render_to_string внутри тега)
+        не учитываются повторно.
+
+        Args:
+            context (dict | None): Контекст шаблона.
+            request (HttpRequest | None): Объект запроса.
+
+        Returns:
+            str: Результат рендеринга.
+        """
+        stats = current_request_stats.get()
+        if stats is None:
+            return super().render(context, request)
+        stats.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_depth -= 1
+            if not stats.template_depth:
+                stats.template_time += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """
+    Бэкенд шаблонов Django, замеряющий время рендеринга для MetricsMiddleware.
+    """
+
+    def from_string(self, template_code: str) -> TimedTemplate:
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name: str) -> TimedTemplate:
+        return TimedTemplate(super().get_template(template_name).template, self)
@@ -0,0 +1,374 @@
+import base64
+import json
+from collections import Counter
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.ads.models import Advertisement, AdvertisementDailyStats, AdvertisementStats
+from apps.ads.views import AdvertisementStatisticView
+from apps.customers.models import Customer
+from apps.leads.models import Lead
+from apps.leads.views import LeadListView
+from apps.myauth.models import User
+from apps.myauth.services import DashboardCountersService
+from apps.myauth.views import index
+from apps.products.models import Product
+
+from .cache import ModelVersionService, get_or_set_versioned, versioned_key
+from .metrics import TOP_DUPLICATES, RequestStats, fingerprint, registry
+from .pagination import NEXT, PREVIOUS, decode_cursor, encode_cursor
+from .routers import ReplicaRouter, ReplicaRoutingMiddleware, use_replica
+
+
+class SeedAndBenchmarkCommandsTest(TestCase):
+    """
+    Проверяет генерацию синтетических данных и запуск замеров.
+    """
+
+    def seed(self, **options) -> dict[str, int]:
+        """
+        Запускает seed_crm и возвращает количество созданных объектов.
+
+        Returns:
+            dict[str, int]: Количество созданных объектов по моделям.
+        """
+        stdout = StringIO()
+        call_command(
+            "seed_crm",
+            products=2,
+            campaigns=3,
+            leads=200,
+            batch_size=64,
+            stdout=stdout,
+            stderr=StringIO(),
+            **options,
+        )
+        return json.loads(stdout.getvalue())
+
+    def snapshot(self) -> list[tuple]:
+        """
+        Возвращает созданные лиды вместе с кампаниями и контрактами.
+
+        Returns:
+            list[tuple]: Строки лидов в порядке создания.
+        """
+        return list(
+            Lead.objects.order_by("pk").values_list(
+                "email",
+                "advertisement__name",
+                "created_at",
+                "customer_leads__contract__price",
+            )
+        )
+
+    def test_seed_is_deterministic(self) -> None:
+        created = self.seed()
+        self.assertEqual(created["leads"], Lead.objects.count())
+        self.assertEqual(created["customers"], Customer.objects.count())
+        self.assertEqual(AdvertisementStats.objects.count(), 3)
+        snapshot = self.snapshot()
+
+        Product.objects.all().delete()
+        self.assertEqual(self.seed(), created)
+        self.assertEqual(self.snapshot(), snapshot)
+
+    def test_benchmark_reports_every_target(self) -> None:
+        self.seed()
+        stdout = StringIO()
+        call_command(
+            "benchmark_crm", repeat=2, warmup=0, stdout=stdout, stderr=StringIO()
+        )
+        results = json.loads(stdout.getvalue())["results"]
+        self.assertIn("view:lead_list", results)
+        self.assertIn("view:customer_detail", results)
+        self.assertIn("service:campaign_stats", results)
+        for result in results.values():
+            self.assertGreaterEqual(result["p99_ms"], result["p50_ms"])
+            self.assertGreater(result["queries"], 0)
+
+    def test_connection_benchmark_reports_both_modes(self) -> None:
+        stdout = StringIO()
+        call_command(
+            "benchmark_connections",
+            threads=2,
+            requests=3,
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(report["requests"], 6)
+        self.assertEqual(set(report["results"]), {"fresh", "configured"})
+
+    def test_audit_reports_sequential_scans_of_large_tables(self) -> None:
+        self.seed()
+        reports = []
+        for min_rows in (0, 10**6):
+            stdout = StringIO()
+            call_command("audit_indexes", "--json", min_rows=min_rows, stdout=stdout)
+            reports.append(json.loads(stdout.getvalue()))
+        self.assertTrue(reports[0])
+        self.assertEqual(reports[1], [])
+        for finding in reports[0]:
+            self.assertEqual(set(finding), {"view", "table", "plan", "query"})
+
+
+@override_settings(METRICS_SAMPLE_RATE=1, METRICS_TOKEN="secret")
+class MetricsMiddlewareTest(TestCase):
+    """
+    Проверяет сбор метрик запросов и доступ к ним.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+        cls.user = User.objects.create_user(username="user", password="user")
+
+    def setUp(self) -> None:
+        registry.reset()
+
+    def test_fingerprint_ignores_parameters(self) -> None:
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s) AND name = 'a'"),
+            fingerprint("SELECT  * FROM t WHERE id IN (%s)\nAND name = 'b'"),
+        )
+
+    def test_template_sql_is_subtracted_from_python_time_once(self) -> None:
+        stats = RequestStats(sql_time=0.3, template_time=0.5, template_sql_time=0.2)
+        registry.record("view", 1.0, stats)
+        python = registry.histograms["crm_request_python_seconds", "view"]
+        self.assertAlmostEqual(python.total, 0.4)
+
+    def test_duplicate_series_are_unique_and_never_dropped(self) -> None:
+        prefix = "SELECT " + ", ".join(f"t.c{number}" for number in range(40))
+        first, second = f"{prefix} WHERE a = ?", f"{prefix} WHERE b = ?"
+        other = [f"SELECT {number}" for number in range(TOP_DUPLICATES)]
+        registry.record("view", 0.1, RequestStats(fingerprints=Counter({first: 2})))
+        registry.record(
+            "view",
+            0.1,
+            RequestStats(fingerprints=Counter({second: 3, **dict.fromkeys(other, 5)})),
+        )
+        registry.record("view", 0.1, RequestStats(fingerprints=Counter({first: 2})))
+        samples = [
+            line.rsplit(" ", 1)
+            for line in registry.render().splitlines()
+            if line.startswith("crm_duplicate_query_executions_total{")
+        ]
+        self.assertEqual(len(dict(samples)), len(samples))
+        self.assertEqual(len(samples), TOP_DUPLICATES)
+        counts = [count for labels, count in samples if first[:200] in labels]
+        self.assertEqual(sorted(counts), ["3", "4"])
+
+    def test_request_is_recorded_per_view(self) -> None:
+        self.client.force_login(self.admin)
+        self.client.get(reverse("products:product_list"))
+        metrics = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn(
+            'crm_request_sql_queries_count{view="products:product_list"} 1', metrics
+        )
+        self.assertIn(
+            'crm_request_template_seconds_count{view="products:product_list"} 1',
+            metrics,
+        )
+
+    def test_metrics_require_admin_or_token(self) -> None:
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.logout()
+        response = self.client.get(url, headers={"Authorization": "Bearer secret"})
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTest(SimpleTestCase):
+    """
+    Проверяет выбор базы для чтения роутером и закрепление клиента
+    за основной базой после записи.
+    """
+
+    def route(self, request, view) -> tuple[str, HttpResponse]:
+        """
+        Пропускает запрос через middleware и возвращает базу,
+        выбранную роутером для чтения лидов внутри представления.
+
+        Returns:
+            tuple[str, HttpResponse]: Псевдоним базы и ответ.
+        """
+        routes = []
+        middleware = None
+
+        def get_response(request) -> HttpResponse:
+            middleware.process_view(request, view, (), {})
+            routes.append(ReplicaRouter().db_for_read(Lead))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        response = middleware(request)
+        return routes[0], response
+
+    def test_reporting_views_read_from_replica(self) -> None:
+        factory = RequestFactory()
+        statistic = AdvertisementStatisticView.as_view()
+        self.assertEqual(self.route(factory.get("/"), statistic)[0], "replica")
+        self.assertEqual(self.route(factory.get("/"), index)[0], "default")
+        list_view = LeadListView.as_view()
+        self.assertEqual(self.route(factory.get("/"), list_view)[0], "default")
+        with use_replica():
+            self.assertEqual(ReplicaRouter().db_for_read(Lead), "replica")
+            self.assertEqual(ReplicaRouter().db_for_read(User), "default")
+        self.assertEqual(ReplicaRouter().db_for_read(Lead), "default")
+
+    def test_cached_values_are_computed_on_primary(self) -> None:
+        cache.clear()
+        with use_replica():
+            route = get_or_set_versioned(
+                "test", [Lead], lambda: ReplicaRouter().db_for_read(Lead)
+            )
+            self.assertEqual(route, "default")
+            self.assertEqual(ReplicaRouter().db_for_read(Lead), "replica")
+
+    def test_writes_pin_client_to_primary(self) -> None:
+        factory = RequestFactory()
+        statistic = AdvertisementStatisticView.as_view()
+        route, response = self.route(factory.post("/"), statistic)
+        self.assertEqual(route, "default")
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        request = factory.get("/")
+        request.COOKIES[cookie.key] = cookie.value
+        self.assertEqual(self.route(request, statistic)[0], "default")
+
+
+class VersionedCacheTest(TestCase):
+    """
+    Проверяет кеширование с версиями моделей.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_saving_object_invalidates_dependent_values(self) -> None:
+        self.assertEqual(DashboardCountersService.get_counters()["products_count"], 0)
+        key = versioned_key("test", [Product, Lead])
+        with self.assertNumQueries(0):
+            DashboardCountersService.get_counters()
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(name="Услуга", description="", cost=1)
+        self.assertNotEqual(versioned_key("test", [Product, Lead]), key)
+        self.assertEqual(DashboardCountersService.get_counters()["products_count"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            product.delete()
+        self.assertEqual(DashboardCountersService.get_counters()["products_count"], 0)
+
+    def test_view_response_is_cached_until_stats_change(self) -> None:
+        product = Product.objects.create(name="Услуга", description="", cost=1)
+        campaign = Advertisement.objects.create(
+            name="Кампания", product=product, channel="search", budget=1
+        )
+        url = f"{reverse('ads:advertisement_series')}?campaign={campaign.pk}"
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(url).json()["campaigns"], {})
+        AdvertisementDailyStats.objects.bulk_create(
+            [
+                AdvertisementDailyStats(
+                    advertisement=campaign,
+                    day=timezone.localdate(),
+                    leads_count=1,
+                    customers_count=0,
+                    revenue=0,
+                )
+            ]
+        )
+        self.assertEqual(self.client.get(url).json()["campaigns"], {})
+        ModelVersionService.bump(AdvertisementStats)
+        self.assertEqual(
+            list(self.client.get(url).json()["campaigns"]), [str(campaign.pk)]
+        )
+
+
+class KeysetPaginationTest(TestCase):
+    """
+    Проверяет переходы по страницам keyset-пагинации и разбор курсоров.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+        cls.leads = [
+            Lead.objects.create(
+                first_name="Иван",
+                last_name=last_name,
+                phone=f"8912000000{number}",
+                email=f"lead{number}@example.com",
+            )
+            for number, last_name in enumerate(("Б", "А", "Б", "В", "Б"))
+        ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.admin)
+        patcher = mock.patch.object(LeadListView, "paginate_by", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_page(self, query: str = ""):
+        response = self.client.get(f"{reverse('leads:lead_list')}?{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.context["page_obj"]
+
+    def test_pages_follow_last_name_and_id_in_both_directions(self) -> None:
+        expected = sorted(self.leads, key=lambda lead: (lead.last_name, lead.pk))
+        pages = [self.get_page()]
+        while pages[-1].has_next():
+            pages.append(self.get_page(pages[-1].next_query))
+        self.assertEqual(
+            [[lead.pk for lead in page] for page in pages],
+            [[lead.pk for lead in expected[i : i + 2]] for i in (0, 2, 4)],
+        )
+        self.assertFalse(pages[0].has_previous())
+
+        page = pages[-1]
+        for previous in reversed(pages[:-1]):
+            page = self.get_page(page.previous_query)
+            self.assertEqual(list(page), list(previous))
+            self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+
+    def test_malformed_cursor_opens_first_page(self) -> None:
+        first = list(self.get_page())
+        for cursor in (
+            "x",
+            "!!!",
+            base64.urlsafe_b64encode(b"[1]").decode(),
+            base64.urlsafe_b64encode(b"\xff").decode(),
+            encode_cursor("x", ["Б", 1]),
+            encode_cursor(NEXT, ["Б"]),
+        ):
+            self.assertEqual(list(self.get_page(f"cursor={cursor}")), first)
+
+    def test_cursor_round_trip(self) -> None:
+        cursor = encode_cursor(PREVIOUS, ["Б", 3])
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor), (PREVIOUS, ["Б", 3]))
+        self.assertIsNone(decode_cursor(""))
+        self.assertIsNone(decode_cursor(None))
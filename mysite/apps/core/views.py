@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.contrib.auth.mixins import PermissionRequiredMixin
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views import View
+
+from apps.myauth import roles
+
+from .metrics import registry
+
+
+class AutocompleteView(PermissionRequiredMixin, View):
+    """
+    Базовое представление JSON-эндпоинта автодополнения.
+
+    Ищет объекты по началу значения любого из полей search_fields
+    и отдает их постранично в виде {"results": [...], "more": bool}.
+    Для доступа достаточно любого из прав permission_required: кроме
+    права на просмотр модели, в нем указываются права форм, в которых
+    объект выбирается через этот эндпоинт.
+
+    Attributes:
+        model (Type[Model]): Модель, по которой идет поиск.
+        search_fields (tuple[str, ...]): Поля для поиска по префиксу.
+        only_fields (tuple[str, ...]): Поля, нужные для __str__ объекта.
+        select_related_fields (tuple[str, ...]): Связи для select_related.
+        paginate_by (int): Количество объектов на странице.
+        search_kwarg (str): Имя параметра запроса со строкой поиска.
+        page_kwarg (str): Имя параметра запроса с номером страницы.
+    """
+
+    model = None
+    search_fields: tuple[str, ...] = ()
+    only_fields: tuple[str, ...] = ()
+    select_related_fields: tuple[str, ...] = ()
+    paginate_by: int = 20
+    search_kwarg: str = "q"
+    page_kwarg: str = "page"
+
+    def has_permission(self) -> bool:
+        """
+        Проверяет, что у пользователя есть любое из прав permission_required.
+
+        Returns:
+            bool: True, если доступ разрешен.
+        """
+        user = self.request.user
+        return any(user.has_perm(perm) for perm in self.get_permission_required())
+
+    def get_queryset(self, query: str) -> QuerySet:
+        """
+        Возвращает объекты, подходящие под строку поиска.
+
+        Args:
+            query (str): Строка поиска.
+
+        Returns:
+            QuerySet: Найденные объекты в порядке ID.
+        """
+        queryset = self.model._default_manager.all()
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.only_fields:
+            queryset = queryset.only(*self.only_fields)
+        if query:
+            condition = Q()
+            for field in self.search_fields:
+                condition |= Q(**{f"{field}__istartswith": query})
+            queryset = queryset.filter(condition)
+        return queryset.order_by("pk")
+
+    def get_page_number(self) -> int:
+        """
+        Возвращает номер запрошенной страницы.
+
+        Returns:
+            int: Номер страницы, начиная с 1.
+        """
+        try:
+            return max(int(self.request.GET.get(self.page_kwarg, 1)), 1)
+        except ValueError:
+            return 1
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> JsonResponse:
+        """
+        Возвращает страницу результатов поиска.
+
+        Запрашивается на один объект больше размера страницы,
+        чтобы без COUNT определить, есть ли следующая страница.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            JsonResponse: Найденные объекты и признак следующей страницы.
+        """
+        query = request.GET.get(self.search_kwarg, "").strip()
+        offset = (self.get_page_number() - 1) * self.paginate_by
+        objects = list(self.get_queryset(query)[offset : offset + self.paginate_by + 1])
+        return JsonResponse(
+            {
+                "results": [
+                    {"id": obj.pk, "text": str(obj)}
+                    for obj in objects[: self.paginate_by]
+                ],
+                "more": len(objects) > self.paginate_by,
+            }
+        )
+
+
+class MetricsView(View):
+    """
+    Представление метрик запросов в текстовом формате Prometheus.
+
+    Доступно администраторам CRM, а также по заголовку
+    Authorization: Bearer <METRICS_TOKEN>, если токен задан в настройках.
+    Метрики собираются в памяти процесса, поэтому при нескольких
+    процессах сервера каждый отдает свою часть.
+    """
+
+    content_type: str = "text/plain; version=0.0.4; charset=utf-8"
+
+    def has_access(self, request: HttpRequest) -> bool:
+        """
+        Проверяет доступ к метрикам.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            bool: True, если метрики можно отдать.
+        """
+        token = settings.METRICS_TOKEN
+        header = request.headers.get("Authorization", "")
+        if token and constant_time_compare(header, f"Bearer {token}"):
+            return True
+        return request.user.is_authenticated and request.user.has_role(roles.ADMIN)
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        """
+        Возвращает собранные метрики.
+
+        Args:
+            request (HttpRequest): Объект запроса.
+
+        Returns:
+            HttpResponse: Метрики или ответ 403.
+        """
+        if not self.has_access(request):
+            return HttpResponse(status=403)
+        return HttpResponse(registry.render(), content_type=self.content_type)
@@ -0,0 +1,63 @@
+from django import forms
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    Виджет выбора связанного объекта с поиском на стороне сервера.
+
+    В отличие от обычного Select выводит в разметку только выбранное
+    значение, а варианты подгружает по мере ввода из JSON-эндпоинта
+    автодополнения.
+
+    Attributes:
+        template_name (str): Шаблон виджета.
+    """
+
+    template_name: str = "widgets/autocomplete.html"
+
+    def __init__(self, url: str, attrs: dict | None = None) -> None:
+        """
+        Инициализирует виджет.
+
+        Args:
+            url (str): Адрес эндпоинта автодополнения.
+            attrs (dict | None): HTML-атрибуты элемента select.
+        """
+        super().__init__(attrs)
+        self.url = url
+
+    def get_context(self, name: str, value, attrs: dict | None) -> dict:
+        """
+        Добавляет адрес эндпоинта в контекст шаблона.
+
+        Returns:
+            dict: Контекст шаблона виджета.
+        """
+        context = super().get_context(name, value, attrs)
+        context["widget"]["url"] = str(self.url)
+        return context
+
+    def optgroups(self, name: str, value: list, attrs: dict | None = None) -> list:
+        """
+        Возвращает варианты выбора, ограниченные выбранным значением.
+
+        Выбранный объект загружается одним запросом по первичному ключу.
+
+        Returns:
+            list: Группы вариантов выбора.
+        """
+        selected = [str(item) for item in value if item not in (None, "")]
+        options = [self.create_option(name, "", "---------", not selected, 0)]
+        queryset = getattr(self.choices, "queryset", None)
+        if selected and queryset is not None:
+            try:
+                objects = list(queryset.filter(pk__in=selected))
+            except (TypeError, ValueError):
+                objects = []
+            for index, obj in enumerate(objects, start=1):
+                options.append(
+                    self.create_option(
+                        name, self.choices.field.prepare_value(obj), obj, True, index
+                    )
+                )
+        return [(None, options, 0)]
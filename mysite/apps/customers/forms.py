@@ -1,8 +1,10 @@
 from typing import Type
 
 from django import forms
+from django.urls import reverse_lazy
 
 from apps.contracts.models import Contract
+from apps.core.widgets import AutocompleteSelect
 
 from .models import Customer
 
@@ -16,7 +18,10 @@ class CustomerForm(forms.ModelForm):
     """
 
     contract = forms.ModelChoiceField(
-        queryset=Contract.objects.all(), required=True, label="Контракт"
+        queryset=Contract.objects.all(),
+        required=True,
+        label="Контракт",
+        widget=AutocompleteSelect(url=reverse_lazy("contracts:contract_autocomplete")),
     )
 
     class Meta:
@@ -26,7 +31,11 @@ class CustomerForm(forms.ModelForm):
         Attributes:
             model (Type[Customer]): Связанная модель.
             fields (list[str]): Поля, доступные для редактирования.
+            widgets (dict[str, Widget]): Виджеты полей формы.
         """
 
         model: Type[Customer] = Customer
         fields: list[str] = ["lead", "contract"]
+        widgets: dict[str, forms.Widget] = {
+            "lead": AutocompleteSelect(url=reverse_lazy("leads:lead_autocomplete")),
+        }
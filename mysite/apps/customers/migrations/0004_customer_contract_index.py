@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    """
+    Индекс клиентов по контракту и времени изменения.
+
+    Индекс строится без блокировки записи, поэтому миграция
+    выполняется вне транзакции.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("customers", "0003_customer_updated_at"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="customer",
+            index=models.Index(
+                fields=["contract", "updated_at"], name="customers_contract_updated"
+            ),
+        ),
+    ]
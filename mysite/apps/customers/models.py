@@ -1,4 +1,7 @@
+from datetime import datetime
+
 from django.db import models
+from django.utils.timezone import now
 
 from apps.contracts.models import Contract
 from apps.leads.models import Lead
@@ -12,6 +15,8 @@ class Customer(models.Model):
         lead (Lead): Лид, связанный с
         активным клиентом (OneToOneField).
         contract (Contract): Контракт, связанный с клиентом.
+        created_at (datetime): Время перевода лида в клиенты.
+        updated_at (datetime): Время последнего изменения клиента.
     """
 
     lead: Lead = models.OneToOneField(
@@ -28,6 +33,10 @@ class Customer(models.Model):
         null=True,
         blank=True,
     )
+    created_at: datetime = models.DateTimeField(
+        default=now, editable=False, db_index=True, verbose_name="Создан"
+    )
+    updated_at: datetime = models.DateTimeField(auto_now=True, verbose_name="Изменен")
 
     class Meta:
         """
@@ -36,10 +45,18 @@ class Customer(models.Model):
         Attributes:
             verbose_name (str): Название модели в единственном числе.
             verbose_name_plural (str): Название модели во множественном числе.
+            indexes (list[Index]): Индекс, из которого количество клиентов
+            контракта и время их последнего изменения (ETag API контрактов)
+            читаются без обращения к таблице.
         """
 
         verbose_name: str = "Активный клиент"
         verbose_name_plural: str = "Активные клиенты"
+        indexes: list[models.Index] = [
+            models.Index(
+                fields=["contract", "updated_at"], name="customers_contract_updated"
+            )
+        ]
 
     def __str__(self) -> str:
         """
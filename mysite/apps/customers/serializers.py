@@ -0,0 +1,49 @@
+from rest_framework import serializers
+
+from apps.core.api import SparseFieldsetSerializer
+
+from .models import Customer
+
+
+class CustomerSerializer(SparseFieldsetSerializer):
+    """
+    Сериализатор клиента для API.
+    """
+
+    first_name = serializers.CharField(source="lead.first_name", read_only=True)
+    last_name = serializers.CharField(source="lead.last_name", read_only=True)
+    contract_name = serializers.CharField(
+        source="contract.name", read_only=True, default=None
+    )
+
+    class Meta:
+        model = Customer
+        fields = [
+            "id",
+            "lead",
+            "first_name",
+            "last_name",
+            "contract",
+            "contract_name",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class CustomerBulkSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор клиента для массовой записи.
+
+    Лид и контракт принимаются как ID без запросов к базе: их
+    существование и уникальность лида CustomerBulkService проверяет
+    сразу для всей пачки.
+    """
+
+    lead = serializers.IntegerField(source="lead_id")
+    contract = serializers.IntegerField(
+        source="contract_id", allow_null=True, required=False
+    )
+
+    class Meta:
+        model = Customer
+        fields = ["lead", "contract"]
@@ -0,0 +1,98 @@
+from apps.ads.signals import collect_stats_refresh, schedule_lead_stats_refresh
+from apps.contracts.models import Contract
+from apps.core.bulk import BulkWriteService
+from apps.leads.models import Lead
+
+from .models import Customer
+from .serializers import CustomerBulkSerializer
+
+
+class CustomerBulkService(BulkWriteService):
+    """
+    Сервис массового создания, изменения и удаления клиентов через API.
+
+    Позволяет перевести пачку лидов в клиенты одним запросом:
+    существование лидов и контрактов проверяется одним запросом,
+    а то, что у лида еще нет клиента, - еще одним.
+
+    Attributes:
+        model (type[Customer]): Модель клиента.
+        serializer_class (type): Сериализатор элемента.
+        relations (dict[str, type]): Модели связанных объектов.
+    """
+
+    model = Customer
+    serializer_class = CustomerBulkSerializer
+    relations = {"lead": Lead, "contract": Contract}
+
+    def check_constraints(
+        self, valid: dict[int, dict], instances: dict[int, Customer]
+    ) -> None:
+        """
+        Отклоняет клиентов для лидов, у которых клиент уже есть.
+
+        Args:
+            valid (dict[int, dict]): Проверенные данные по индексам.
+            instances (dict[int, Customer]): Изменяемые клиенты по индексам.
+        """
+        lead_ids = {
+            index: data["lead_id"] for index, data in valid.items() if "lead_id" in data
+        }
+        owners = dict(
+            Customer.objects.filter(lead_id__in=lead_ids.values()).values_list(
+                "lead_id", "pk"
+            )
+        )
+        claimed = set()
+        for index, lead_id in lead_ids.items():
+            if self.results[index] is not None:
+                continue
+            own = instances[index].pk if index in instances else None
+            owner = owners.get(lead_id)
+            if (owner is not None and owner != own) or lead_id in claimed:
+                self.fail(index, {"lead": ["Клиент для этого лида уже существует."]})
+                continue
+            claimed.add(lead_id)
+
+    def snapshot(self, obj: Customer) -> int:
+        """
+        Запоминает прежнего лида клиента.
+
+        Args:
+            obj (Customer): Клиент до изменения.
+
+        Returns:
+            int: ID лида.
+        """
+        return obj.lead_id
+
+    def after_create(self, objects: list[Customer]) -> None:
+        """
+        Планирует пересчет статистики кампаний.
+
+        Args:
+            objects (list[Customer]): Созданные клиенты.
+        """
+        schedule_lead_stats_refresh(customer.lead_id for customer in objects)
+
+    def after_update(self, objects: list[Customer], before: dict[int, int]) -> None:
+        """
+        Планирует пересчет статистики кампаний прежних и новых лидов.
+
+        Args:
+            objects (list[Customer]): Измененные клиенты.
+            before (dict[int, int]): Прежние лиды по ID клиентов.
+        """
+        schedule_lead_stats_refresh(
+            {*before.values(), *(customer.lead_id for customer in objects)}
+        )
+
+    def perform_delete(self, ids: list[int]) -> None:
+        """
+        Удаляет клиентов с одним пересчетом статистики на все кампании.
+
+        Args:
+            ids (list[int]): ID клиентов.
+        """
+        with collect_stats_refresh():
+            super().perform_delete(ids)
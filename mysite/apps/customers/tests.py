@@ -1,3 +1,282 @@
+from unittest.mock import patch
+
+from django.db import connection
+from django.http import HttpResponse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.contracts.models import Contract
+from apps.contracts.views import ContractAutocompleteView
+from apps.leads.models import Lead
+from apps.myauth.models import User
+from apps.products.models import Product
+
+from .models import Customer
+
+
+class CustomerViewsQueryCountTest(TestCase):
+    """
+    Проверяет, что количество запросов страниц клиентов
+    не зависит от количества клиентов.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+        product = Product.objects.create(name="Услуга", description="", cost=100)
+        cls.contract = Contract.objects.create(
+            name="Контракт", product=product, price=100
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def create_customers(self, count: int) -> list[Customer]:
+        """
+        Создает клиентов вместе с их лидами.
+
+        Args:
+            count (int): Количество клиентов.
+
+        Returns:
+            list[Customer]: Созданные клиенты.
+        """
+        start = Customer.objects.count()
+        return [
+            Customer.objects.create(
+                lead=Lead.objects.create(
+                    first_name=f"Имя {number}",
+                    last_name=f"Фамилия {number}",
+                    phone="+70000000000",
+                    email=f"lead{number}@example.com",
+                ),
+                contract=self.contract,
+            )
+            for number in range(start, start + count)
+        ]
+
+    def count_queries(self, url: str) -> int:
+        """
+        Возвращает количество запросов к базе при загрузке страницы.
+
+        Args:
+            url (str): Адрес страницы.
+
+        Returns:
+            int: Количество выполненных запросов.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_list_query_count_is_constant(self) -> None:
+        url = reverse("customers:customer_list")
+        self.create_customers(1)
+        single = self.count_queries(url)
+        self.create_customers(20)
+        self.assertEqual(self.count_queries(url), single)
+
+    def test_detail_loads_lead_with_customer(self) -> None:
+        customer = self.create_customers(1)[0]
+        url = reverse("customers:customer_detail", args=[customer.pk])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertContains(response, customer.lead.email)
+        self.assertFalse(
+            [query for query in queries if 'FROM "leads_lead"' in query["sql"]]
+        )
+
+    def test_export_streams_searched_customers(self) -> None:
+        customers = self.create_customers(3)
+        customers[0].lead.last_name = "=HYPERLINK(1)"
+        customers[0].lead.save()
+        url = reverse("customers:customer_export")
+        response = self.client.get(url, {"q": customers[1].lead.last_name})
+        content = b"".join(response.streaming_content).decode("utf-8-sig")
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(len(content.splitlines()), 2)
+        self.assertIn(customers[1].lead.email, content)
+        response = self.client.get(url)
+        content = b"".join(response.streaming_content).decode("utf-8-sig")
+        self.assertEqual(len(content.splitlines()), 4)
+        self.assertIn("'=HYPERLINK(1)", content)
+
+
+class CustomerFormAutocompleteTest(TestCase):
+    """
+    Проверяет, что форма клиента выводит только выбранные значения,
+    а варианты выбора отдают эндпоинты автодополнения.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+        product = Product.objects.create(name="Услуга", description="", cost=100)
+        cls.contracts = [
+            Contract.objects.create(name=f"Контракт {number}", product=product, price=1)
+            for number in range(3)
+        ]
+        cls.leads = [
+            Lead.objects.create(
+                first_name=f"Имя {number}",
+                last_name=f"Lastname {number}",
+                phone=f"+7000000000{number}",
+                email=f"lead{number}@example.com",
+            )
+            for number in range(3)
+        ]
+        cls.customer = Customer.objects.create(
+            lead=cls.leads[0], contract=cls.contracts[0]
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+
+    def test_edit_form_renders_only_selected_options(self) -> None:
+        url = reverse("customers:customer_update", args=[self.customer.pk])
+        content = self.client.get(url).content.decode()
+        self.assertIn(str(self.leads[0]), content)
+        self.assertIn(str(self.contracts[0]), content)
+        self.assertNotIn(str(self.leads[1]), content)
+        self.assertNotIn(str(self.contracts[1]), content)
+
+    def test_autocomplete_searches_by_prefix(self) -> None:
+        response = self.client.get(
+            reverse("leads:lead_autocomplete"), {"q": "lastname 1"}
+        )
+        self.assertEqual(
+            response.json(),
+            {
+                "results": [{"id": self.leads[1].pk, "text": str(self.leads[1])}],
+                "more": False,
+            },
+        )
+
+    def test_autocomplete_reports_next_page(self) -> None:
+        url = reverse("contracts:contract_autocomplete")
+        with patch.object(ContractAutocompleteView, "paginate_by", 2):
+            first = self.client.get(url, {"q": "Контракт"}).json()
+            second = self.client.get(url, {"q": "Контракт", "page": 2}).json()
+        self.assertEqual(len(first["results"]), 2)
+        self.assertTrue(first["more"])
+        self.assertEqual(second["results"][0]["id"], self.contracts[2].pk)
+        self.assertFalse(second["more"])
+
+
+class CustomerApiTest(TestCase):
+    """
+    Проверяет разреженные наборы полей и условный GET в API клиентов.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+        cls.lead = Lead.objects.create(
+            first_name="Имя", last_name="Фамилия", phone="", email="lead@example.com"
+        )
+        cls.customer = Customer.objects.create(lead=cls.lead)
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+        self.url = reverse("api-customer-list")
+
+    def test_fields_narrow_query(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"fields": "id,last_name"})
+        self.assertEqual(
+            response.json()["results"],
+            [{"id": self.customer.pk, "last_name": "Фамилия"}],
+        )
+        sql = queries[-1]["sql"]
+        self.assertIn('"leads_lead"."last_name"', sql)
+        self.assertNotIn('"leads_lead"."email"', sql)
+        self.assertNotIn('"customers_customer"."created_at"', sql)
+
+    def test_unknown_field_is_rejected(self) -> None:
+        response = self.client.get(self.url, {"fields": "id,password"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_conditional_get(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.lead.last_name = "Новая"
+        self.lead.save()
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class CustomerBulkApiTest(TestCase):
+    """
+    Проверяет массовый перевод лидов в клиенты через API.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+        product = Product.objects.create(name="Услуга", description="", cost=100)
+        cls.contract = Contract.objects.create(
+            name="Контракт", product=product, price=100
+        )
+        cls.leads = [
+            Lead.objects.create(
+                first_name=f"Имя {number}",
+                last_name="Фамилия",
+                phone="",
+                email=f"lead{number}@example.com",
+            )
+            for number in range(20)
+        ]
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+        self.url = reverse("api-customer-bulk")
+
+    def post(self, items: list) -> HttpResponse:
+        """
+        Отправляет пачку клиентов.
+
+        Args:
+            items (list): Данные клиентов.
+
+        Returns:
+            HttpResponse: Ответ.
+        """
+        return self.client.post(self.url, items, content_type="application/json")
+
+    def test_query_count_does_not_depend_on_batch_size(self) -> None:
+        def count(leads: list[Lead]) -> int:
+            items = [{"lead": lead.pk, "contract": self.contract.pk} for lead in leads]
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.post(items).status_code, 200)
+            return len(queries)
+
+        self.assertEqual(count(self.leads[:2]), count(self.leads[2:20]))
+        self.assertEqual(Customer.objects.count(), 20)
 
-# Create your tests here.
+    def test_partial_failure_is_reported_per_item(self) -> None:
+        Customer.objects.create(lead=self.leads[0])
+        response = self.post(
+            [
+                {"lead": self.leads[0].pk},
+                {"lead": self.leads[1].pk, "contract": 0},
+                {"lead": self.leads[2].pk},
+            ]
+        )
+        self.assertEqual(response.status_code, 207)
+        results = response.json()["results"]
+        self.assertEqual(list(results[0]["errors"]), ["lead"])
+        self.assertEqual(list(results[1]["errors"]), ["contract"])
+        self.assertEqual(results[2]["status"], "created")
+        self.assertTrue(Customer.objects.filter(lead=self.leads[2]).exists())
@@ -4,6 +4,7 @@ from .views import (
     CustomerCreateView,
     CustomerDeleteView,
     CustomerDetailView,
+    CustomerExportView,
     CustomerListView,
     CustomerUpdateView,
 )
@@ -13,6 +14,7 @@ app_name = "customers"
 
 urlpatterns = [
     path("", CustomerListView.as_view(), name="customer_list"),
+    path("export/", CustomerExportView.as_view(), name="customer_export"),
     path("new/", CustomerCreateView.as_view(), name="customer_create"),
     path("<int:pk>/", CustomerDetailView.as_view(), name="customer_detail"),
     path("<int:pk>/edit/", CustomerUpdateView.as_view(), name="customer_update"),
@@ -10,11 +10,23 @@ from django.views.generic import (
     UpdateView,
 )
 
+from apps.core.api import BulkWriteMixin, CrmModelViewSet
+from apps.core.mixins import CsvExportMixin, QueryShapeMixin, SearchMixin
+from apps.core.pagination import KeysetPaginationMixin
+
 from .forms import CustomerForm
 from .models import Customer
+from .serializers import CustomerSerializer
+from .services import CustomerBulkService
 
 
-class CustomerListView(PermissionRequiredMixin, ListView):
+class CustomerListView(
+    PermissionRequiredMixin,
+    QueryShapeMixin,
+    SearchMixin,
+    KeysetPaginationMixin,
+    ListView,
+):
     """
     Представление для отображения списка клиентов.
 
@@ -25,12 +37,24 @@ class CustomerListView(PermissionRequiredMixin, ListView):
         для списка клиентов.
         permission_required (str): Необходимое разрешение
         для доступа к представлению.
+        select_related_fields (tuple[str, ...]): Связанные объекты,
+        загружаемые вместе с записью.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
+        search_fields (tuple[str, ...]): Поля для поиска.
     """
 
     model: Customer = Customer
     template_name: str = "customers-list.html"
     context_object_name: str = "customers"
     permission_required: str = "customers.view_customer"
+    select_related_fields: tuple[str, ...] = ("lead",)
+    only_fields: tuple[str, ...] = ("id", "lead__first_name", "lead__last_name")
+    search_fields: tuple[str, ...] = (
+        "lead__first_name",
+        "lead__last_name",
+        "lead__email",
+        "lead__phone",
+    )
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
@@ -40,7 +64,28 @@ class CustomerListView(PermissionRequiredMixin, ListView):
         return redirect(reverse_lazy("index"))
 
 
-class CustomerDetailView(PermissionRequiredMixin, DetailView):
+class CustomerExportView(CsvExportMixin, CustomerListView):
+    """
+    Выгрузка списка клиентов в CSV с учетом поиска.
+
+    Attributes:
+        export_columns (dict[str, str]): Заголовки колонок и поля клиента.
+        export_filename (str): Имя выгружаемого файла.
+    """
+
+    export_columns: dict[str, str] = {
+        "ID": "id",
+        "Фамилия": "lead__last_name",
+        "Имя": "lead__first_name",
+        "Телефон": "lead__phone",
+        "Email": "lead__email",
+        "Контракт": "contract__name",
+        "Создан": "created_at",
+    }
+    export_filename: str = "customers.csv"
+
+
+class CustomerDetailView(PermissionRequiredMixin, QueryShapeMixin, DetailView):
     """
     Представление для отображения детальной информации о клиенте.
 
@@ -51,12 +96,23 @@ class CustomerDetailView(PermissionRequiredMixin, DetailView):
         для объекта клиента.
         permission_required (str): Необходимое разрешение
         для доступа к представлению.
+        select_related_fields (tuple[str, ...]): Связанные объекты,
+        загружаемые вместе с записью.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
     """
 
     model: Customer = Customer
     template_name: str = "customers-detail.html"
     context_object_name: str = "object"
     permission_required: str = "customers.view_customer"
+    select_related_fields: tuple[str, ...] = ("lead",)
+    only_fields: tuple[str, ...] = (
+        "id",
+        "lead__first_name",
+        "lead__last_name",
+        "lead__phone",
+        "lead__email",
+    )
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
@@ -152,3 +208,34 @@ class CustomerDeleteView(PermissionRequiredMixin, DeleteView):
         Перенаправляет пользователя на список клиентов.
         """
         return redirect(reverse_lazy("customers:customer_list"))
+
+
+class CustomerViewSet(BulkWriteMixin, SearchMixin, CrmModelViewSet):
+    """
+    API активных клиентов.
+
+    Attributes:
+        queryset (QuerySet): Клиенты.
+        serializer_class (type): Сериализатор клиента.
+        search_fields (tuple[str, ...]): Поля для поиска ?q=.
+        bulk_service_class (type): Сервис массовой записи.
+        etag_fields (tuple[str, ...]): Поля, от которых зависит
+        представление клиента.
+        last_modified_fields (tuple[str, ...]): Поля с временем изменения.
+    """
+
+    queryset = Customer.objects.all()
+    serializer_class = CustomerSerializer
+    search_fields: tuple[str, ...] = CustomerListView.search_fields
+    bulk_service_class = CustomerBulkService
+    etag_fields: tuple[str, ...] = (
+        "id",
+        "updated_at",
+        "lead__updated_at",
+        "contract__updated_at",
+    )
+    last_modified_fields: tuple[str, ...] = (
+        "updated_at",
+        "lead__updated_at",
+        "contract__updated_at",
+    )
@@ -1,15 +1,24 @@
 from typing import Type
 
 from django import forms
+from django.urls import reverse_lazy
 
-from .models import Lead
+from apps.core.widgets import AutocompleteSelect
+
+from .models import Lead, normalize_email, normalize_phone
 
 
 class LeadForm(forms.ModelForm):
     """
     Форма для создания или редактирования лидов.
+
+    Attributes:
+        check_duplicates (bool): Проверять ли, что лида с таким же
+        телефоном или email еще нет.
     """
 
+    check_duplicates: bool = True
+
     class Meta:
         """
         Метаданные формы.
@@ -17,6 +26,7 @@ class LeadForm(forms.ModelForm):
         Attributes:
             model (Type[Lead]): Связанная модель.
             fields (list[str]): Поля, доступные для редактирования.
+            widgets (dict[str, Widget]): Виджеты полей формы.
         """
 
         model: Type[Lead] = Lead
@@ -27,3 +37,72 @@ class LeadForm(forms.ModelForm):
             "email",
             "advertisement",
         ]
+        widgets: dict[str, forms.Widget] = {
+            "advertisement": AutocompleteSelect(
+                url=reverse_lazy("ads:advertisement_autocomplete")
+            ),
+        }
+
+    def clean(self) -> dict:
+        """
+        Проверяет, что лида с таким же телефоном или email еще нет.
+
+        Returns:
+            dict: Очищенные данные формы.
+
+        Raises:
+            ValidationError: Если найден лид с теми же контактами.
+        """
+        cleaned_data = super().clean()
+        if not self.check_duplicates:
+            return cleaned_data
+        duplicates = (
+            Lead.objects.with_contacts(
+                [normalize_phone(cleaned_data.get("phone", ""))],
+                [normalize_email(cleaned_data.get("email", ""))],
+            )
+            .exclude(pk=self.instance.pk)
+            .only("first_name", "last_name")[:1]
+        )
+        if duplicates:
+            raise forms.ValidationError(
+                f"Лид с таким телефоном или email уже существует: {duplicates[0]}."
+            )
+        return cleaned_data
+
+
+class LeadImportForm(LeadForm):
+    """
+    Форма для проверки строки импортируемого файла.
+
+    Рекламная кампания и дубликаты проверяются для всей пачки строк
+    сразу, чтобы не выполнять запросы на каждую строку.
+    """
+
+    check_duplicates: bool = False
+
+    class Meta(LeadForm.Meta):
+        """
+        Метаданные формы.
+
+        Attributes:
+            fields (list[str]): Поля, проверяемые формой.
+        """
+
+        fields: list[str] = ["first_name", "last_name", "phone", "email"]
+
+
+class LeadImportUploadForm(forms.Form):
+    """
+    Форма загрузки файла с лидами.
+
+    Attributes:
+        file (FileField): Файл в формате CSV или JSONL.
+        file_format (ChoiceField): Формат файла.
+    """
+
+    file = forms.FileField(label="Файл")
+    file_format = forms.ChoiceField(
+        label="Формат",
+        choices=[("csv", "CSV"), ("jsonl", "JSONL")],
+    )
@@ -0,0 +1,99 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+
+from apps.leads.models import Lead
+
+
+class Command(BaseCommand):
+    """
+    Команда для поиска групп дублирующихся лидов.
+
+    Повторяющиеся нормализованные телефоны и email находятся в базе
+    группировкой по индексам phone_normalized и email_normalized,
+    поэтому в память читаются только лиды с такими контактами. Группы
+    строятся системой непересекающихся множеств: лиды с общим телефоном
+    или email попадают в одну группу, в том числе транзитивно.
+
+    Attributes:
+        help (str): Краткое описание команды.
+    """
+
+    help = "Find clusters of leads sharing a normalized phone or email"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print clusters as JSON lists of lead ids",
+        )
+
+    def handle(self, *args, **options):
+        parent: dict[int, int] = {}
+
+        def find(lead_id: int) -> int:
+            root = lead_id
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while lead_id != root:
+                parent[lead_id], lead_id = root, parent[lead_id]
+            return root
+
+        owners: dict[tuple[str, str], int] = {}
+        leads = (
+            Lead.objects.filter(
+                Q(phone_normalized__in=self.repeated("phone_normalized"))
+                | Q(email_normalized__in=self.repeated("email_normalized"))
+            )
+            .order_by("pk")
+            .values_list("pk", "phone_normalized", "email_normalized")
+            .iterator(chunk_size=options["chunk_size"])
+        )
+        for lead_id, phone, email in leads:
+            for key in (("phone", phone), ("email", email)):
+                if not key[1]:
+                    continue
+                owner = owners.setdefault(key, lead_id)
+                if owner != lead_id:
+                    first, second = find(owner), find(lead_id)
+                    if first != second:
+                        parent[max(first, second)] = min(first, second)
+
+        clusters: dict[int, list[int]] = {}
+        for lead_id in parent:
+            clusters.setdefault(find(lead_id), []).append(lead_id)
+        result = sorted(sorted([root, *members]) for root, members in clusters.items())
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result))
+            return
+        for cluster in result:
+            self.stdout.write(", ".join(map(str, cluster)))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Found {len(result)} clusters covering "
+                f"{sum(map(len, result))} leads"
+            )
+        )
+
+    @staticmethod
+    def repeated(field: str):
+        """
+        Возвращает подзапрос значений контакта, которые есть у нескольких лидов.
+
+        Args:
+            field (str): Поле нормализованного контакта.
+
+        Returns:
+            QuerySet: Повторяющиеся непустые значения поля.
+        """
+        return (
+            Lead.objects.exclude(**{field: ""})
+            .order_by()
+            .values(field)
+            .annotate(leads=Count("pk"))
+            .filter(leads__gt=1)
+            .values(field)
+        )
@@ -0,0 +1,93 @@
+import csv
+import os
+from contextlib import ExitStack
+from typing import Callable, TextIO
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.leads.services import FILE_FORMATS, LeadImportService
+
+
+class Command(BaseCommand):
+    """
+    Команда для массового импорта лидов из файла CSV или JSONL.
+
+    Файл читается построчно, лиды сохраняются пачками, а ошибки строк
+    по мере обнаружения записываются в CSV-отчет.
+
+    Attributes:
+        help (str): Краткое описание команды.
+    """
+
+    help = "Import leads from a CSV or JSONL file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the CSV or JSONL file")
+        parser.add_argument(
+            "--format",
+            choices=FILE_FORMATS,
+            help="File format (detected from the extension by default)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--allow-duplicates",
+            action="store_true",
+            help="Import leads whose phone or email already exists",
+        )
+        parser.add_argument(
+            "--report",
+            help="Path of the CSV error report (line, field, message)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["format"] or os.path.splitext(path)[1][1:].lower()
+        if file_format not in FILE_FORMATS:
+            raise CommandError(f"Cannot detect the format of {path}, use --format")
+
+        with ExitStack() as stack:
+            stream = stack.enter_context(open(path, "rb"))
+            on_error = None
+            if options["report"]:
+                report = stack.enter_context(
+                    open(options["report"], "w", newline="", encoding="utf-8")
+                )
+                on_error = self.report_writer(report)
+            service = LeadImportService(
+                batch_size=options["batch_size"],
+                on_error=on_error,
+                check_duplicates=not options["allow_duplicates"],
+            )
+            try:
+                service.import_file(stream, file_format)
+            except ValueError as error:
+                raise CommandError(
+                    f"{error} Imported {service.created} leads before the error"
+                ) from error
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {service.created} leads, rejected {service.failed} rows"
+            )
+        )
+
+    @staticmethod
+    def report_writer(report: TextIO) -> Callable[[int, dict[str, list[str]]], None]:
+        """
+        Возвращает функцию, записывающую ошибки строк в CSV-отчет.
+
+        Args:
+            report (TextIO): Открытый файл отчета.
+
+        Returns:
+            Callable[[int, dict[str, list[str]]], None]: Обработчик ошибок.
+        """
+        writer = csv.writer(report)
+        writer.writerow(["line", "field", "message"])
+
+        def write(line: int, errors: dict[str, list[str]]) -> None:
+            for field, messages in errors.items():
+                for message in messages:
+                    writer.writerow([line, field, message])
+
+        return write
@@ -0,0 +1,74 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:03
+
+import re
+
+from django.db import migrations, models
+
+
+# Копии apps.leads.models.normalize_phone и normalize_email на момент
+# миграции: история миграций не должна зависеть от текущего кода.
+def normalize_phone(phone):
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) == 11 and digits.startswith("8"):
+        digits = "7" + digits[1:]
+    elif len(digits) == 10:
+        digits = "7" + digits
+    return f"+{digits}" if digits else ""
+
+
+def normalize_email(email):
+    return (email or "").strip().lower()
+
+
+def backfill_normalized_contacts(apps, schema_editor):
+    """
+    Заполняет нормализованные контакты существующих лидов пачками.
+    """
+    Lead = apps.get_model("leads", "Lead")
+    last_id = 0
+    while True:
+        batch = list(
+            Lead.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .only("pk", "phone", "email")[:2000]
+        )
+        if not batch:
+            return
+        for lead in batch:
+            lead.phone_normalized = normalize_phone(lead.phone)
+            lead.email_normalized = normalize_email(lead.email)
+        Lead.objects.bulk_update(batch, ["phone_normalized", "email_normalized"])
+        last_id = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lead",
+            name="email_normalized",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=254,
+                verbose_name="Нормализованный email",
+            ),
+        ),
+        migrations.AddField(
+            model_name="lead",
+            name="phone_normalized",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=21,
+                verbose_name="Нормализованный телефон",
+            ),
+        ),
+        migrations.RunPython(backfill_normalized_contacts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations
+from django.db.models.functions import Upper
+
+from apps.core.indexes import TrigramIndex
+from apps.core.operations import AddIndexConcurrently, TrigramExtension
+
+
+class Migration(migrations.Migration):
+    """
+    Триграммные индексы для поиска лидов по имени, фамилии, email
+    и телефону.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("leads", "0002_lead_normalized_contacts"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name="lead",
+            index=TrigramIndex(
+                OpClass(Upper("first_name"), name="gin_trgm_ops"),
+                name="leads_lead_first_name_trgm",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="lead",
+            index=TrigramIndex(
+                OpClass(Upper("last_name"), name="gin_trgm_ops"),
+                name="leads_lead_last_name_trgm",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="lead",
+            index=TrigramIndex(
+                OpClass(Upper("email"), name="gin_trgm_ops"),
+                name="leads_lead_email_trgm",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="lead",
+            index=TrigramIndex(
+                OpClass(Upper("phone"), name="gin_trgm_ops"),
+                name="leads_lead_phone_trgm",
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0003_lead_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lead",
+            name="created_at",
+            field=models.DateTimeField(
+                db_index=True,
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="Создан",
+            ),
+        ),
+    ]
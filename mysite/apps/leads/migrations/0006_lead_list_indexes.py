@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    """
+    Индексы списка лидов и статистики кампаний по дням.
+
+    Индексы строятся без блокировки записи, поэтому миграция
+    выполняется вне транзакции.
+    """
+
+    atomic = False
+
+    dependencies = [
+        ("leads", "0005_lead_updated_at"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="lead",
+            index=models.Index(
+                fields=["last_name", "id"],
+                include=["first_name"],
+                name="leads_last_name_id",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="lead",
+            index=models.Index(
+                fields=["advertisement", "created_at"], name="leads_campaign_created"
+            ),
+        ),
+    ]
@@ -1,6 +1,103 @@
+import re
+from datetime import datetime
+from typing import Iterable
+
 from django.db import models
+from django.db.models import Q
+from django.utils.timezone import now
 
 from apps.ads.models import Advertisement
+from apps.core.indexes import trigram_index
+
+
+def normalize_phone(phone: str) -> str:
+    """
+    Приводит номер телефона к виду, близкому к E.164.
+
+    Из номера удаляются все символы, кроме цифр. Российские номера
+    вида 8XXXXXXXXXX и XXXXXXXXXX приводятся к +7XXXXXXXXXX. Результат
+    на один символ ("+") длиннее цифр номера, то есть не длиннее 21 символа.
+
+    Args:
+        phone (str): Номер телефона в произвольном формате.
+
+    Returns:
+        str: Нормализованный номер или пустая строка.
+    """
+    digits = re.sub(r"\D", "", phone or "")
+    if len(digits) == 11 and digits.startswith("8"):
+        digits = "7" + digits[1:]
+    elif len(digits) == 10:
+        digits = "7" + digits
+    return f"+{digits}" if digits else ""
+
+
+def normalize_email(email: str) -> str:
+    """
+    Приводит email к нижнему регистру без пробелов по краям.
+
+    Args:
+        email (str): Email в произвольном регистре.
+
+    Returns:
+        str: Нормализованный email.
+    """
+    return (email or "").strip().lower()
+
+
+class LeadQuerySet(models.QuerySet):
+    """
+    Кастомный QuerySet для модели Lead.
+    """
+
+    def with_contacts(self, phones: Iterable[str], emails: Iterable[str]):
+        """
+        Возвращает лиды, у которых совпадает нормализованный телефон или email.
+
+        Поиск идет по индексам phone_normalized и email_normalized.
+
+        Args:
+            phones (Iterable[str]): Нормализованные телефоны.
+            emails (Iterable[str]): Нормализованные email.
+
+        Returns:
+            LeadQuerySet: Найденные лиды.
+        """
+        phones = [phone for phone in phones if phone]
+        emails = [email for email in emails if email]
+        if not phones and not emails:
+            return self.none()
+        return self.filter(
+            Q(phone_normalized__in=phones) | Q(email_normalized__in=emails)
+        )
+
+
+class LeadManager(models.Manager):
+    """
+    Кастомный менеджер для модели Lead.
+    """
+
+    def get_queryset(self):
+        """
+        Возвращает QuerySet для модели Lead.
+
+        Returns:
+            LeadQuerySet: QuerySet для модели Lead.
+        """
+        return LeadQuerySet(self.model, using=self._db)
+
+    def with_contacts(self, phones: Iterable[str], emails: Iterable[str]):
+        """
+        Возвращает лиды с совпадающим нормализованным телефоном или email.
+
+        Args:
+            phones (Iterable[str]): Нормализованные телефоны.
+            emails (Iterable[str]): Нормализованные email.
+
+        Returns:
+            LeadQuerySet: Найденные лиды.
+        """
+        return self.get_queryset().with_contacts(phones, emails)
 
 
 class Lead(models.Model):
@@ -14,6 +111,10 @@ class Lead(models.Model):
         email (str): Email лида.
         advertisement (Advertisement | None): Рекламная
         кампания, связанная с лидом.
+        phone_normalized (str): Нормализованный телефон для поиска дублей.
+        email_normalized (str): Нормализованный email для поиска дублей.
+        created_at (datetime): Время создания лида.
+        updated_at (datetime): Время последнего изменения лида.
     """
 
     first_name: str = models.CharField(max_length=100, verbose_name="Имя")
@@ -28,6 +129,26 @@ class Lead(models.Model):
         null=True,
         blank=True,
     )
+    phone_normalized: str = models.CharField(
+        max_length=21,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name="Нормализованный телефон",
+    )
+    email_normalized: str = models.CharField(
+        max_length=254,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name="Нормализованный email",
+    )
+    created_at: datetime = models.DateTimeField(
+        default=now, editable=False, db_index=True, verbose_name="Создан"
+    )
+    updated_at: datetime = models.DateTimeField(auto_now=True, verbose_name="Изменен")
+
+    objects = LeadManager()
 
     class Meta:
         """
@@ -36,10 +157,28 @@ class Lead(models.Model):
         Attributes:
             verbose_name (str): Название модели в единственном числе.
             verbose_name_plural (str): Название модели во множественном числе.
+            indexes (list[Index]): Индекс списка лидов по ключу пагинации
+            (last_name, id), из которого страница читается без обращения
+            к таблице, индекс для статистики кампаний по дням создания
+            и триграммные индексы поиска по имени, фамилии и контактам.
         """
 
         verbose_name: str = "Лид"
         verbose_name_plural: str = "Лиды"
+        indexes: list[models.Index] = [
+            models.Index(
+                fields=["last_name", "id"],
+                include=["first_name"],
+                name="leads_last_name_id",
+            ),
+            models.Index(
+                fields=["advertisement", "created_at"], name="leads_campaign_created"
+            ),
+            trigram_index("first_name", "leads_lead_first_name_trgm"),
+            trigram_index("last_name", "leads_lead_last_name_trgm"),
+            trigram_index("email", "leads_lead_email_trgm"),
+            trigram_index("phone", "leads_lead_phone_trgm"),
+        ]
 
     def __str__(self) -> str:
         """
@@ -49,3 +188,42 @@ class Lead(models.Model):
             str: Фамилия и имя лида.
         """
         return f"{self.last_name} {self.first_name}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values) -> "Lead":
+        """
+        Создает лид из строки базы и запоминает его кампанию.
+
+        По прежней кампании обработчики сохранения определяют, нужно ли
+        пересчитывать статистику, без отдельного запроса к базе.
+
+        Returns:
+            Lead: Лид.
+        """
+        instance = super().from_db(db, field_names, values)
+        if "advertisement_id" in instance.__dict__:
+            instance._loaded_advertisement_id = instance.advertisement_id
+        return instance
+
+    def save(self, *args, **kwargs) -> None:
+        """
+        Обновляет нормализованные контакты и сохраняет лид.
+        """
+        self.normalize_contacts()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {
+                *update_fields,
+                "phone_normalized",
+                "email_normalized",
+            }
+        super().save(*args, **kwargs)
+
+    def normalize_contacts(self) -> None:
+        """
+        Заполняет нормализованные телефон и email.
+
+        Вызывается явно перед bulk_create, который не вызывает save().
+        """
+        self.phone_normalized = normalize_phone(self.phone)
+        self.email_normalized = normalize_email(self.email)
@@ -0,0 +1,46 @@
+from rest_framework import serializers
+
+from apps.core.api import SparseFieldsetSerializer
+
+from .models import Lead
+
+
+class LeadSerializer(SparseFieldsetSerializer):
+    """
+    Сериализатор лида для API.
+    """
+
+    advertisement_name = serializers.CharField(
+        source="advertisement.name", read_only=True, default=None
+    )
+
+    class Meta:
+        model = Lead
+        fields = [
+            "id",
+            "first_name",
+            "last_name",
+            "phone",
+            "email",
+            "advertisement",
+            "advertisement_name",
+            "created_at",
+            "updated_at",
+        ]
+
+
+class LeadBulkSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор лида для массовой записи.
+
+    Кампания принимается как ID без запроса к базе: ее существование
+    LeadBulkService проверяет сразу для всей пачки.
+    """
+
+    advertisement = serializers.IntegerField(
+        source="advertisement_id", allow_null=True, required=False
+    )
+
+    class Meta:
+        model = Lead
+        fields = ["first_name", "last_name", "phone", "email", "advertisement"]
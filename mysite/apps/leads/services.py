@@ -0,0 +1,396 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from typing import BinaryIO, Callable, Iterable, Iterator
+
+from django.db import transaction
+
+from apps.ads.models import Advertisement
+from apps.ads.services import AdvertisementStatsService
+from apps.ads.signals import collect_stats_refresh, schedule_stats_refresh
+from apps.core.bulk import BulkWriteService
+from apps.core.cache import ModelVersionService
+
+from .forms import LeadImportForm
+from .models import Lead, normalize_email, normalize_phone
+from .serializers import LeadBulkSerializer
+
+FILE_FORMATS: tuple[str, ...] = ("csv", "jsonl")
+
+
+def read_rows(stream: BinaryIO, file_format: str) -> Iterator[tuple[int, dict | None]]:
+    """
+    Построчно читает лиды из файла.
+
+    Файл не загружается в память целиком: строки читаются по одной.
+
+    Args:
+        stream (BinaryIO): Файл, открытый в двоичном режиме.
+        file_format (str): Формат файла: "csv" или "jsonl".
+
+    Yields:
+        tuple[int, dict | None]: Номер строки файла и данные лида
+        или None, если строку не удалось разобрать.
+
+    Raises:
+        ValueError: Если формат файла не поддерживается, файл не в кодировке
+        UTF-8 или CSV-файл не удалось разобрать.
+    """
+    if file_format not in FILE_FORMATS:
+        raise ValueError(f"Unsupported file format: {file_format}")
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    line = 0
+    try:
+        if file_format == "csv":
+            for line, row in enumerate(csv.DictReader(text), start=2):
+                yield line, row
+            return
+        for line, raw in enumerate(text, start=1):
+            if not raw.strip():
+                continue
+            try:
+                row = json.loads(raw)
+            except ValueError:
+                row = None
+            yield line, row if isinstance(row, dict) else None
+    except UnicodeDecodeError as error:
+        raise ValueError(
+            f"Файл должен быть в кодировке UTF-8 (ошибка после строки {line})."
+        ) from error
+    except csv.Error as error:
+        raise ValueError(
+            f"Не удалось разобрать CSV после строки {line}: {error}."
+        ) from error
+
+
+class LeadImportService:
+    """
+    Сервис потокового импорта лидов.
+
+    Строки проверяются правилами LeadForm, рекламная кампания
+    определяется по ID или названию через справочник, загруженный одним
+    запросом, а лиды сохраняются через bulk_create пачками, каждая
+    в своей транзакции. Дубликаты проверяются одним запросом на пачку.
+
+    Attributes:
+        batch_size (int): Количество лидов в одной пачке.
+        max_errors (int): Сколько ошибок хранить в errors.
+        on_error (Callable | None): Функция, получающая каждую ошибку.
+        check_duplicates (bool): Отклонять ли лиды, телефон или email
+        которых уже есть в базе или встречался в файле раньше.
+        created (int): Количество созданных лидов.
+        failed (int): Количество отклоненных строк.
+        errors (list[tuple[int, dict[str, list[str]]]]): Первые ошибки
+        в виде пар (номер строки, ошибки по полям).
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 1000,
+        max_errors: int = 100,
+        on_error: Callable[[int, dict[str, list[str]]], None] | None = None,
+        check_duplicates: bool = True,
+    ) -> None:
+        self.batch_size = batch_size
+        self.check_duplicates = check_duplicates
+        self.max_errors = max_errors
+        self.on_error = on_error
+        self.created = 0
+        self.failed = 0
+        self.errors: list[tuple[int, dict[str, list[str]]]] = []
+        self._campaigns: dict[str, int | None] | None = None
+
+    def import_file(self, stream: BinaryIO, file_format: str) -> "LeadImportService":
+        """
+        Импортирует лиды из файла.
+
+        Args:
+            stream (BinaryIO): Файл, открытый в двоичном режиме.
+            file_format (str): Формат файла: "csv" или "jsonl".
+
+        Returns:
+            LeadImportService: Сервис с результатами импорта.
+
+        Raises:
+            ValueError: Если файл не удалось прочитать. Пачки, сохраненные
+            до ошибки, остаются в базе и учтены в created.
+        """
+        return self.import_rows(read_rows(stream, file_format))
+
+    def import_rows(
+        self, rows: Iterable[tuple[int, dict | None]]
+    ) -> "LeadImportService":
+        """
+        Проверяет и сохраняет лиды.
+
+        Args:
+            rows (Iterable[tuple[int, dict | None]]): Номера строк и данные.
+
+        Returns:
+            LeadImportService: Сервис с результатами импорта.
+        """
+        batch: list[tuple[int, Lead]] = []
+        campaign_ids: set[int] = set()
+        try:
+            for line, row in rows:
+                lead = self.build_lead(line, row)
+                if lead is None:
+                    continue
+                batch.append((line, lead))
+                if len(batch) >= self.batch_size:
+                    campaign_ids |= self.save_batch(batch)
+                    batch = []
+            if batch:
+                campaign_ids |= self.save_batch(batch)
+        finally:
+            # Уже сохраненные пачки остаются в базе и при ошибке чтения файла.
+            if self.created:
+                AdvertisementStatsService.refresh_stats(campaign_ids)
+                ModelVersionService.bump(Lead)
+        return self
+
+    def build_lead(self, line: int, row: dict | None) -> Lead | None:
+        """
+        Создает несохраненный лид из строки файла.
+
+        Args:
+            line (int): Номер строки файла.
+            row (dict | None): Данные строки.
+
+        Returns:
+            Lead | None: Лид или None, если строка содержит ошибки.
+        """
+        if row is None:
+            self.add_error(line, {"__all__": ["Не удалось разобрать строку."]})
+            return None
+        form = LeadImportForm(data=row)
+        errors = {} if form.is_valid() else dict(form.errors)
+        campaign = str(row.get("advertisement") or "").strip()
+        campaign_id = self.campaigns.get(campaign) if campaign else None
+        if campaign and campaign_id is None:
+            errors["advertisement"] = [
+                f"Рекламная кампания «{campaign}» не найдена или не однозначна."
+            ]
+        if errors:
+            self.add_error(line, errors)
+            return None
+        lead = form.save(commit=False)
+        lead.advertisement_id = campaign_id
+        lead.normalize_contacts()
+        return lead
+
+    def save_batch(self, batch: list[tuple[int, Lead]]) -> set[int]:
+        """
+        Сохраняет пачку лидов в отдельной транзакции.
+
+        Args:
+            batch (list[tuple[int, Lead]]): Номера строк и лиды.
+
+        Returns:
+            set[int]: ID рекламных кампаний сохраненных лидов.
+        """
+        if self.check_duplicates:
+            leads = self.drop_duplicates(batch)
+        else:
+            leads = [lead for _, lead in batch]
+        with transaction.atomic():
+            Lead.objects.bulk_create(leads)
+        self.created += len(leads)
+        return {lead.advertisement_id for lead in leads if lead.advertisement_id}
+
+    def drop_duplicates(self, batch: list[tuple[int, Lead]]) -> list[Lead]:
+        """
+        Отклоняет лиды, контакты которых уже есть в базе или в пачке.
+
+        Совпадения с базой ищутся одним запросом по индексам
+        нормализованных контактов.
+
+        Args:
+            batch (list[tuple[int, Lead]]): Номера строк и лиды.
+
+        Returns:
+            list[Lead]: Лиды без дубликатов.
+        """
+        existing = Lead.objects.with_contacts(
+            [lead.phone_normalized for _, lead in batch],
+            [lead.email_normalized for _, lead in batch],
+        ).values_list("phone_normalized", "email_normalized")
+        phones: set[str] = set()
+        emails: set[str] = set()
+        for phone, email in existing:
+            phones.add(phone)
+            emails.add(email)
+
+        leads = []
+        for line, lead in batch:
+            phone, email = lead.phone_normalized, lead.email_normalized
+            if (phone and phone in phones) or (email and email in emails):
+                self.add_error(
+                    line,
+                    {"__all__": ["Лид с таким телефоном или email уже существует."]},
+                )
+                continue
+            phones.add(phone)
+            emails.add(email)
+            leads.append(lead)
+        return leads
+
+    def add_error(self, line: int, errors: dict[str, list[str]]) -> None:
+        """
+        Регистрирует ошибку строки.
+
+        Args:
+            line (int): Номер строки файла.
+            errors (dict[str, list[str]]): Ошибки по полям.
+        """
+        errors = {
+            field: [str(message) for message in messages]
+            for field, messages in errors.items()
+        }
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, errors))
+        if self.on_error is not None:
+            self.on_error(line, errors)
+
+    @property
+    def campaigns(self) -> dict[str, int | None]:
+        """
+        Справочник рекламных кампаний по ID и названию.
+
+        Названия, которые носят несколько кампаний, отображаются в None.
+
+        Returns:
+            dict[str, int | None]: ID кампании по строковому ID или названию.
+        """
+        if self._campaigns is None:
+            by_id: dict[str, int | None] = {}
+            by_name: dict[str, int | None] = {}
+            for pk, name in Advertisement.objects.values_list("pk", "name").iterator():
+                by_id[str(pk)] = pk
+                by_name[name] = None if name in by_name else pk
+            self._campaigns = {**by_name, **by_id}
+        return self._campaigns
+
+
+class LeadBulkService(BulkWriteService):
+    """
+    Сервис массового создания, изменения и удаления лидов через API.
+
+    Как и LeadForm, отклоняет лиды, телефон или email которых уже
+    есть у другого лида; дубликаты ищутся одним запросом на пачку.
+
+    Attributes:
+        model (type[Lead]): Модель лида.
+        serializer_class (type): Сериализатор элемента.
+        relations (dict[str, type]): Модели связанных объектов.
+        update_extra_fields (tuple[str, ...]): Нормализованные контакты,
+        которые пересчитываются при изменении лида.
+    """
+
+    model = Lead
+    serializer_class = LeadBulkSerializer
+    relations = {"advertisement": Advertisement}
+    update_extra_fields: tuple[str, ...] = ("phone_normalized", "email_normalized")
+
+    def check_constraints(
+        self, valid: dict[int, dict], instances: dict[int, Lead]
+    ) -> None:
+        """
+        Отклоняет лиды с контактами, которые уже есть у других лидов.
+
+        Args:
+            valid (dict[int, dict]): Проверенные данные по индексам.
+            instances (dict[int, Lead]): Изменяемые лиды по индексам.
+        """
+        contacts = {}
+        for index, data in valid.items():
+            instance = instances.get(index)
+            if instance is not None and not {"phone", "email"} & data.keys():
+                continue
+            contacts[index] = (
+                normalize_phone(data.get("phone", getattr(instance, "phone", ""))),
+                normalize_email(data.get("email", getattr(instance, "email", ""))),
+            )
+        if not contacts:
+            return
+        phones: dict[str, set] = defaultdict(set)
+        emails: dict[str, set] = defaultdict(set)
+        existing = Lead.objects.with_contacts(
+            [phone for phone, _ in contacts.values()],
+            [email for _, email in contacts.values()],
+        ).values_list("pk", "phone_normalized", "email_normalized")
+        for pk, phone, email in existing:
+            phones[phone].add(pk)
+            emails[email].add(pk)
+        for index, (phone, email) in contacts.items():
+            if self.results[index] is not None:
+                continue
+            own = instances[index].pk if index in instances else f"new:{index}"
+            if (phone and phones[phone] - {own}) or (email and emails[email] - {own}):
+                self.fail(
+                    index,
+                    {
+                        "non_field_errors": [
+                            "Лид с таким телефоном или email уже существует."
+                        ]
+                    },
+                )
+                continue
+            if phone:
+                phones[phone].add(own)
+            if email:
+                emails[email].add(own)
+
+    def prepare(self, obj: Lead) -> None:
+        """
+        Заполняет нормализованные контакты лида.
+
+        Args:
+            obj (Lead): Лид.
+        """
+        obj.normalize_contacts()
+
+    def snapshot(self, obj: Lead) -> int | None:
+        """
+        Запоминает прежнюю кампанию лида.
+
+        Args:
+            obj (Lead): Лид до изменения.
+
+        Returns:
+            int | None: ID кампании.
+        """
+        return obj.advertisement_id
+
+    def after_create(self, objects: list[Lead]) -> None:
+        """
+        Планирует пересчет статистики кампаний.
+
+        Args:
+            objects (list[Lead]): Созданные лиды.
+        """
+        schedule_stats_refresh(lead.advertisement_id for lead in objects)
+
+    def after_update(self, objects: list[Lead], before: dict[int, int | None]) -> None:
+        """
+        Планирует пересчет статистики прежних и новых кампаний лидов.
+
+        Args:
+            objects (list[Lead]): Измененные лиды.
+            before (dict[int, int | None]): Прежние кампании по ID лидов.
+        """
+        schedule_stats_refresh(
+            {*before.values(), *(lead.advertisement_id for lead in objects)}
+        )
+
+    def perform_delete(self, ids: list[int]) -> None:
+        """
+        Удаляет лиды с одним пересчетом статистики на все кампании.
+
+        Args:
+            ids (list[int]): ID лидов.
+        """
+        with collect_stats_refresh():
+            super().perform_delete(ids)
@@ -1,3 +1,279 @@
+import csv
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+from django.urls import reverse
+
+from apps.ads.models import Advertisement
+from apps.myauth.models import User
+from apps.products.models import Product
+
+from .forms import LeadForm
+from .models import Lead, normalize_email, normalize_phone
+
+
+class LeadContactsTest(TestCase):
+    """
+    Проверяет нормализацию контактов и поиск дублей лидов.
+    """
+
+    def create(self, phone: str, email: str) -> Lead:
+        return Lead.objects.create(
+            first_name="Иван", last_name="Иванов", phone=phone, email=email
+        )
+
+    def test_contacts_are_normalized_on_save(self) -> None:
+        self.assertEqual(normalize_phone("8 (912) 345-67-89"), "+79123456789")
+        self.assertEqual(normalize_phone("912 345 67 89"), "+79123456789")
+        self.assertEqual(normalize_phone("-"), "")
+        self.assertEqual(normalize_email(" Ivan@Example.COM "), "ivan@example.com")
+        lead = self.create("1" * 20, "Ivan@Example.com")
+        lead.refresh_from_db()
+        self.assertEqual(lead.phone_normalized, "+" + "1" * 20)
+        self.assertEqual(lead.email_normalized, "ivan@example.com")
+
+    def test_form_rejects_lead_with_same_contacts(self) -> None:
+        lead = self.create("+7 912 345-67-89", "ivan@example.com")
+        data = {
+            "first_name": "Петр",
+            "last_name": "Петров",
+            "phone": "89123456789",
+            "email": "petr@example.com",
+        }
+        form = LeadForm(data)
+        self.assertFalse(form.is_valid())
+        self.assertIn(str(lead), form.non_field_errors()[0])
+        self.assertTrue(LeadForm({**data, "phone": "1"}).is_valid())
+        self.assertTrue(LeadForm(data, instance=lead).is_valid())
+
+    def test_command_groups_leads_sharing_contacts_transitively(self) -> None:
+        first = self.create("111", "a@example.com")
+        second = self.create("222", "A@example.com")
+        third = self.create("222", "c@example.com")
+        self.create("333", "d@example.com")
+        fifth = self.create("444", "e@example.com")
+        sixth = self.create("444", "f@example.com")
+        output = StringIO()
+        call_command("find_duplicate_leads", "--json", stdout=output)
+        self.assertEqual(
+            json.loads(output.getvalue()),
+            [[first.pk, second.pk, third.pk], [fifth.pk, sixth.pk]],
+        )
+
+
+class LeadSearchTest(TestCase):
+    """
+    Проверяет поиск по подстроке в списке лидов и выгрузку списка.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+        cls.leads = [
+            Lead.objects.create(
+                first_name=first_name, last_name=last_name, phone=phone, email=email
+            )
+            for first_name, last_name, phone, email in (
+                ("Anna", "Smith", "89120000001", "anna@example.com"),
+                ("Oleg", "Annenkov", "89120000002", "oleg@example.com"),
+                ("Ivan", "Petrov", "89120000003", "ivan@mail.example"),
+            )
+        ]
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def search(self, query: str) -> list[int]:
+        response = self.client.get(reverse("leads:lead_list"), {"q": query})
+        self.assertEqual(response.context["search_query"], query.strip())
+        return sorted(lead.pk for lead in response.context["leads"])
+
+    def test_query_matches_any_field_ignoring_case(self) -> None:
+        first, second, third = (lead.pk for lead in self.leads)
+        self.assertEqual(self.search(" ANN "), [first, second])
+        self.assertEqual(self.search("mail.EXAMPLE"), [third])
+        self.assertEqual(self.search("0000002"), [second])
+        self.assertEqual(self.search(""), [first, second, third])
+        self.assertEqual(self.search("nothing"), [])
+
+    def test_export_escapes_formulas(self) -> None:
+        Lead.objects.create(
+            first_name="+cmd|' /C calc'!A0",
+            last_name="-2+3",
+            phone="89120000004",
+            email="formula@example.com",
+        )
+        response = self.client.get(reverse("leads:lead_export") + "?q=formula")
+        content = b"".join(response.streaming_content).decode("utf-8-sig")
+        rows = list(csv.reader(StringIO(content)))
+        self.assertEqual(rows[1][1:3], ["'-2+3", "'+cmd|' /C calc'!A0"])
+
+
+class LeadImportTest(TestCase):
+    """
+    Проверяет импорт лидов из файла.
+    """
+
+    rows: str = (
+        "first_name,last_name,phone,email,advertisement\n"
+        "Иван,Иванов,89120000001,ivan@example.com,Весна\n"
+        "Петр,Петров,89120000002,not-an-email,\n"
+        "Анна,Смирнова,+7 912 000-00-01,anna@example.com,\n"
+        "Олег,Орлов,89120000003,oleg@example.com,Осень\n"
+    )
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        product = Product.objects.create(name="Услуга", description="", cost=1)
+        cls.campaign = Advertisement.objects.create(
+            name="Весна", product=product, channel="search", budget=1
+        )
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+
+    def import_file(self, content: bytes, *args: str) -> str:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "leads.csv")
+            report = os.path.join(directory, "report.csv")
+            with open(path, "wb") as file:
+                file.write(content)
+            call_command(
+                "import_leads", path, "--report", report, *args, stdout=StringIO()
+            )
+            with open(report, encoding="utf-8") as file:
+                return file.read()
+
+    def test_valid_rows_are_saved_and_errors_reported(self) -> None:
+        report = self.import_file(self.rows.encode())
+        self.assertEqual(
+            list(Lead.objects.values_list("last_name", "advertisement")),
+            [("Иванов", self.campaign.pk)],
+        )
+        lines = list(csv.reader(StringIO(report)))
+        self.assertEqual(lines[0], ["line", "field", "message"])
+        self.assertEqual(
+            sorted(row[:2] for row in lines[1:]),
+            [["3", "email"], ["4", "__all__"], ["5", "advertisement"]],
+        )
+
+    def test_unreadable_file_is_reported_after_committed_batches(self) -> None:
+        # Файл декодируется блоками, поэтому ошибка должна быть дальше
+        # первого блока, чтобы до нее успели сохраниться пачки.
+        rows = "".join(
+            f"Иван,Иванов,8912{number:07d},lead{number}@example.com,\n"
+            for number in range(500)
+        )
+        content = (self.rows.splitlines()[0] + "\n" + rows).encode()
+        with self.assertRaisesMessage(CommandError, "UTF-8"):
+            self.import_file(content + "Ёлкина".encode("cp1251"), "--batch-size", "100")
+        self.assertEqual(Lead.objects.count() % 100, 0)
+        self.assertGreater(Lead.objects.count(), 0)
+
+        self.client.force_login(self.admin)
+        upload = SimpleUploadedFile("leads.csv", "Ёлкина".encode("cp1251"))
+        response = self.client.post(
+            reverse("leads:lead_import"), {"file": upload, "file_format": "csv"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("UTF-8", response.context["form"].non_field_errors()[0])
+
+
+class LeadBulkApiTest(TestCase):
+    """
+    Проверяет массовую запись лидов через API.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+        product = Product.objects.create(name="Услуга", description="", cost=1)
+        cls.campaign = Advertisement.objects.create(
+            name="Весна", product=product, channel="search", budget=1
+        )
+        cls.leads = [
+            Lead.objects.create(
+                first_name=f"Имя {number}",
+                last_name="Фамилия",
+                phone=f"8912000000{number}",
+                email=f"lead{number}@example.com",
+            )
+            for number in range(3)
+        ]
+
+    def setUp(self) -> None:
+        self.client.force_login(self.admin)
+        self.url = reverse("api-lead-bulk")
+
+    def send(self, method: str, items: list):
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)(
+                self.url, items, content_type="application/json"
+            )
+
+    def test_update_writes_only_given_fields(self) -> None:
+        first, second, third = self.leads
+        response = self.send(
+            "patch",
+            [
+                {"id": first.pk, "phone": "+7 999 000-00-00"},
+                {"id": second.pk, "advertisement": self.campaign.pk},
+                {"id": 0, "first_name": "Нет"},
+                {"id": third.pk, "email": "LEAD0@example.com"},
+            ],
+        )
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(
+            [result["status"] for result in response.json()["results"]],
+            ["updated", "updated", "error", "error"],
+        )
+        first.refresh_from_db()
+        self.assertEqual(
+            (first.phone_normalized, first.email), ("+79990000000", "lead0@example.com")
+        )
+        second.refresh_from_db()
+        self.assertEqual(
+            (second.advertisement_id, second.phone),
+            (self.campaign.pk, "89120000001"),
+        )
+        self.assertEqual(self.campaign.stats.leads_count, 1)
+        third.refresh_from_db()
+        self.assertEqual(third.email, "lead2@example.com")
+
+    def test_create_and_delete(self) -> None:
+        response = self.send(
+            "post",
+            [
+                {
+                    "first_name": "Анна",
+                    "last_name": "Смирнова",
+                    "phone": "1",
+                    "email": "a@example.com",
+                },
+                {
+                    "first_name": "Олег",
+                    "last_name": "Орлов",
+                    "phone": "2",
+                    "email": "A@example.com",
+                },
+            ],
+        )
+        self.assertEqual(response.status_code, 207)
+        results = response.json()["results"]
+        self.assertEqual(results[0]["status"], "created")
+        self.assertEqual(list(results[1]["errors"]), ["non_field_errors"])
 
-# Create your tests here.
+        response = self.send("delete", [results[0]["id"], self.leads[0].pk])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Lead.objects.count(), 2)
@@ -1,9 +1,12 @@
 from django.urls import path
 
 from .views import (
+    LeadAutocompleteView,
     LeadCreateView,
     LeadDeleteView,
     LeadDetailView,
+    LeadExportView,
+    LeadImportView,
     LeadListView,
     LeadUpdateView,
 )
@@ -13,7 +16,10 @@ app_name = "leads"
 
 urlpatterns = [
     path("", LeadListView.as_view(), name="lead_list"),
+    path("export/", LeadExportView.as_view(), name="lead_export"),
+    path("autocomplete/", LeadAutocompleteView.as_view(), name="lead_autocomplete"),
     path("new/", LeadCreateView.as_view(), name="lead_create"),
+    path("import/", LeadImportView.as_view(), name="lead_import"),
     path("<int:pk>/", LeadDetailView.as_view(), name="lead_detail"),
     path("<int:pk>/edit/", LeadUpdateView.as_view(), name="lead_update"),
     path("<int:pk>/delete/", LeadDeleteView.as_view(), name="lead_delete"),
@@ -1,20 +1,34 @@
 from django.contrib.auth.mixins import PermissionRequiredMixin
-from django.http import HttpResponseRedirect
+from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import redirect
 from django.urls import reverse_lazy
 from django.views.generic import (
     CreateView,
     DeleteView,
     DetailView,
+    FormView,
     ListView,
     UpdateView,
 )
 
-from .forms import LeadForm
+from apps.core.api import BulkWriteMixin, CrmModelViewSet
+from apps.core.mixins import CsvExportMixin, QueryShapeMixin, SearchMixin
+from apps.core.pagination import KeysetPaginationMixin
+from apps.core.views import AutocompleteView
+
+from .forms import LeadForm, LeadImportUploadForm
 from .models import Lead
+from .serializers import LeadSerializer
+from .services import LeadBulkService, LeadImportService
 
 
-class LeadListView(PermissionRequiredMixin, ListView):
+class LeadListView(
+    PermissionRequiredMixin,
+    QueryShapeMixin,
+    SearchMixin,
+    KeysetPaginationMixin,
+    ListView,
+):
     """
     Представление для отображения списка лидов.
 
@@ -25,12 +39,18 @@ class LeadListView(PermissionRequiredMixin, ListView):
         для списка лидов.
         permission_required (str): Необходимое разрешение
         для доступа к представлению.
+        keyset_ordering (tuple[str, ...]): Ключ сортировки для пагинации.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
+        search_fields (tuple[str, ...]): Поля для поиска.
     """
 
     model: Lead = Lead
     template_name: str = "leads-list.html"
     context_object_name: str = "leads"
     permission_required: str = "leads.view_lead"
+    only_fields: tuple[str, ...] = ("id", "first_name", "last_name")
+    search_fields: tuple[str, ...] = ("first_name", "last_name", "email", "phone")
+    keyset_ordering: tuple[str, ...] = ("last_name", "id")
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
@@ -40,7 +60,28 @@ class LeadListView(PermissionRequiredMixin, ListView):
         return redirect(reverse_lazy("index"))
 
 
-class LeadDetailView(PermissionRequiredMixin, DetailView):
+class LeadExportView(CsvExportMixin, LeadListView):
+    """
+    Выгрузка списка лидов в CSV с учетом поиска.
+
+    Attributes:
+        export_columns (dict[str, str]): Заголовки колонок и поля лида.
+        export_filename (str): Имя выгружаемого файла.
+    """
+
+    export_columns: dict[str, str] = {
+        "ID": "id",
+        "Фамилия": "last_name",
+        "Имя": "first_name",
+        "Телефон": "phone",
+        "Email": "email",
+        "Рекламная кампания": "advertisement__name",
+        "Создан": "created_at",
+    }
+    export_filename: str = "leads.csv"
+
+
+class LeadDetailView(PermissionRequiredMixin, QueryShapeMixin, DetailView):
     """
     Представление для отображения детальной информации о лиде.
 
@@ -51,12 +92,14 @@ class LeadDetailView(PermissionRequiredMixin, DetailView):
         для лида.
         permission_required (str): Необходимое разрешение
         для доступа к представлению.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
     """
 
     model: Lead = Lead
     template_name: str = "leads-detail.html"
     context_object_name: str = "object"
     permission_required: str = "leads.view_lead"
+    only_fields: tuple[str, ...] = ("id", "first_name", "last_name", "phone", "email")
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
@@ -147,3 +190,90 @@ class LeadDeleteView(PermissionRequiredMixin, DeleteView):
         Перенаправляет пользователя на список лидов.
         """
         return redirect(reverse_lazy("leads:lead_list"))
+
+
+class LeadImportView(PermissionRequiredMixin, FormView):
+    """
+    Представление для массовой загрузки лидов из файла.
+
+    Attributes:
+        form_class (LeadImportUploadForm): Форма загрузки файла.
+        template_name (str): Шаблон страницы загрузки и ее результатов.
+        permission_required (str): Необходимое разрешение
+        для доступа к представлению.
+    """
+
+    form_class: LeadImportUploadForm = LeadImportUploadForm
+    template_name: str = "leads-import.html"
+    permission_required: str = "leads.add_lead"
+
+    def form_valid(self, form: LeadImportUploadForm) -> HttpResponse:
+        """
+        Импортирует лиды из загруженного файла и показывает отчет.
+
+        Если файл не удалось дочитать, ошибка показывается в форме
+        вместе с отчетом об уже сохраненных лидах.
+
+        Args:
+            form (LeadImportUploadForm): Заполненная форма.
+
+        Returns:
+            HttpResponse: Страница с результатами импорта.
+        """
+        uploaded_file = form.cleaned_data["file"]
+        service = LeadImportService()
+        try:
+            service.import_file(uploaded_file.file, form.cleaned_data["file_format"])
+        except ValueError as error:
+            form.add_error(None, str(error))
+        return self.render_to_response(self.get_context_data(form=form, result=service))
+
+    def handle_no_permission(self) -> HttpResponseRedirect:
+        """
+        Переопределяет поведение при отсутствии разрешения.
+        Перенаправляет пользователя на список лидов.
+        """
+        return redirect(reverse_lazy("leads:lead_list"))
+
+
+class LeadAutocompleteView(AutocompleteView):
+    """
+    Эндпоинт автодополнения для выбора лидов в формах.
+
+    Attributes:
+        model (Lead): Модель, по которой идет поиск.
+        permission_required (str): Необходимое разрешение
+        для доступа к представлению.
+        search_fields (tuple[str, ...]): Поля для поиска по префиксу.
+        only_fields (tuple[str, ...]): Поля, нужные для названия объекта.
+    """
+
+    model: Lead = Lead
+    permission_required: str = "leads.view_lead"
+    search_fields: tuple[str, ...] = ("last_name", "first_name")
+    only_fields: tuple[str, ...] = ("id", "first_name", "last_name")
+
+
+class LeadViewSet(BulkWriteMixin, SearchMixin, CrmModelViewSet):
+    """
+    API лидов.
+
+    Attributes:
+        queryset (QuerySet): Лиды.
+        serializer_class (type): Сериализатор лида.
+        search_fields (tuple[str, ...]): Поля для поиска ?q=.
+        bulk_service_class (type): Сервис массовой записи.
+        etag_fields (tuple[str, ...]): Поля, от которых зависит
+        представление лида.
+        last_modified_fields (tuple[str, ...]): Поля с временем изменения.
+    """
+
+    queryset = Lead.objects.all()
+    serializer_class = LeadSerializer
+    search_fields: tuple[str, ...] = ("first_name", "last_name", "email", "phone")
+    bulk_service_class = LeadBulkService
+    etag_fields: tuple[str, ...] = ("id", "updated_at", "advertisement__updated_at")
+    last_modified_fields: tuple[str, ...] = (
+        "updated_at",
+        "advertisement__updated_at",
+    )
@@ -1,5 +1,5 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_migrate
+from django.db.models.signals import m2m_changed, post_delete, post_migrate
 
 
 class MyauthConfig(AppConfig):
@@ -15,40 +15,33 @@ class MyauthConfig(AppConfig):
     default_auto_field: str = "django.db.models.BigAutoField"
     name: str = "apps.myauth"
 
-    def ready(self):
+    def ready(self) -> None:
+        """
+        Подключает создание групп ролей и обработчики сигналов приложения.
+
+        Группы создаются один раз за migrate: после миграций этого
+        приложения, когда права остальных приложений CRM уже созданы.
+
+        Returns:
+            None
+        """
         from django.contrib.auth.models import Group, Permission
 
-        def create_groups(sender, **kwargs):
-            """
-            Создание групп пользователей и назначение им разрешений.
-
-            Attributes:
-                group_permissions (dict): Словарь с группами и их разрешениями.
-            """
-            group_permissions = {
-                'Operator': [
-                    "view_lead", "add_lead", "change_lead",
-                    "view_advertisement"
-                ],
-                'Marketer': [
-                    "view_product", "add_product", "change_product",
-                    "view_advertisement", "add_advertisement", "change_advertisement"
-                ],
-                'Manager': [
-                    "view_contract", "add_contract", "change_contract",
-                    "view_lead", "view_customer", "add_customer",
-                    "change_customer", "view_advertisement"
-                ]
-            }
-
-            for group_name, permissions in group_permissions.items():
-                group, created = Group.objects.get_or_create(name=group_name)
-
-                for codename in permissions:
-                    try:
-                        perm = Permission.objects.get(codename=codename)
-                        group.permissions.add(perm)
-                    except Permission.DoesNotExist:
-                        print(f"Permission {codename} does not exist yet.")
-
-        post_migrate.connect(create_groups, sender=self)
+        from . import signals
+
+        post_migrate.connect(
+            signals.create_role_groups,
+            sender=self,
+            dispatch_uid="myauth_create_role_groups",
+        )
+
+        from .models import User
+
+        for through in (
+            User.groups.through,
+            User.user_permissions.through,
+            Group.permissions.through,
+        ):
+            m2m_changed.connect(signals.permissions_changed, sender=through)
+        post_delete.connect(signals.permission_owner_deleted, sender=Group)
+        post_delete.connect(signals.permission_owner_deleted, sender=Permission)
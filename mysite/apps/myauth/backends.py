@@ -0,0 +1,39 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .services import PermissionCacheService
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    Бэкенд аутентификации, кеширующий права пользователей между запросами.
+
+    ModelBackend кеширует права только на объекте пользователя, то есть
+    в пределах одного запроса. Этот бэкенд дополнительно хранит набор
+    прав в кеше Django на PERMISSIONS_CACHE_TIMEOUT секунд, поэтому
+    проверка прав в PermissionRequiredMixin не обращается к базе.
+    Кеш сбрасывается сигналами при изменении групп и прав.
+    """
+
+    def get_all_permissions(self, user_obj, obj=None) -> set[str]:
+        """
+        Возвращает все права пользователя, используя общий кеш.
+
+        Args:
+            user_obj (User): Пользователь.
+            obj (Model | None): Объект для объектных прав.
+
+        Returns:
+            set[str]: Права в виде "app_label.codename".
+        """
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, "_perm_cache"):
+            key = PermissionCacheService.get_key(user_obj)
+            permissions = cache.get(key)
+            if permissions is None:
+                permissions = super().get_all_permissions(user_obj)
+                cache.set(key, permissions, settings.PERMISSIONS_CACHE_TIMEOUT)
+            user_obj._perm_cache = permissions
+        return user_obj._perm_cache
@@ -1,9 +1,17 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
+from django.utils.functional import cached_property
+
+from .roles import ADMIN, GROUP_ROLES
 
 
 class User(AbstractUser):
     """
     Модель пользователя с расширенными полями.
+
+    Роли пользователя определяются его группами, суперпользователь
+    дополнительно получает роль администратора.
     """
 
     class Meta:
@@ -27,3 +35,41 @@ class User(AbstractUser):
             str: Имя пользователя.
         """
         return str(self.username)
+
+    @cached_property
+    def roles(self) -> frozenset[str]:
+        """
+        Возвращает роли пользователя.
+
+        Роли кешируются на объекте пользователя, то есть вычисляются
+        один раз за запрос, и в кеше Django вместе с правами
+        пользователя, поэтому сбрасываются при изменении групп.
+
+        Returns:
+            frozenset[str]: Роли пользователя.
+        """
+        from .services import PermissionCacheService
+
+        key = f"{PermissionCacheService.get_key(self)}:roles"
+        roles = cache.get(key)
+        if roles is None:
+            group_names = self.groups.values_list("name", flat=True)
+            roles = frozenset(
+                GROUP_ROLES[name] for name in group_names if name in GROUP_ROLES
+            )
+            if self.is_superuser:
+                roles |= {ADMIN}
+            cache.set(key, roles, settings.PERMISSIONS_CACHE_TIMEOUT)
+        return roles
+
+    def has_role(self, *roles: str) -> bool:
+        """
+        Проверяет, есть ли у пользователя хотя бы одна из ролей.
+
+        Args:
+            *roles (str): Проверяемые роли.
+
+        Returns:
+            bool: True, если пользователь имеет одну из ролей.
+        """
+        return not self.roles.isdisjoint(roles)
@@ -1,4 +1,6 @@
-from rest_framework.permissions import BasePermission
+from rest_framework.permissions import BasePermission, DjangoModelPermissions
+
+from .roles import ADMIN, MANAGER, MARKETER, OPERATOR
 
 
 class RolePermission(BasePermission):
@@ -23,7 +25,8 @@ class RolePermission(BasePermission):
             bool: True, если пользователь имеет указанную роль,
             False иначе.
         """
-        return request.user.role == self.role
+        user = request.user
+        return user.is_authenticated and user.has_role(self.role)
 
 
 class IsAdmin(RolePermission):
@@ -31,7 +34,7 @@ class IsAdmin(RolePermission):
     Разрешение для администраторов.
     """
 
-    role = "admin"
+    role = ADMIN
 
 
 class IsOperator(RolePermission):
@@ -39,7 +42,7 @@ class IsOperator(RolePermission):
     Разрешение для операторов.
     """
 
-    role = "operator"
+    role = OPERATOR
 
 
 class IsMarketer(RolePermission):
@@ -47,7 +50,7 @@ class IsMarketer(RolePermission):
     Разрешение для маркетологов.
     """
 
-    role = "marketer"
+    role = MARKETER
 
 
 class IsManager(RolePermission):
@@ -55,4 +58,21 @@ class IsManager(RolePermission):
     Разрешение для менеджеров.
     """
 
-    role = "manager"
+    role = MANAGER
+
+
+class ModelPermissions(DjangoModelPermissions):
+    """
+    Разрешение на основе прав модели, как в HTML-представлениях CRM.
+
+    В отличие от DjangoModelPermissions, чтение тоже требует права view.
+
+    Attributes:
+        perms_map (dict): Права модели по HTTP-методам.
+    """
+
+    perms_map: dict = {
+        **DjangoModelPermissions.perms_map,
+        "GET": ["%(app_label)s.view_%(model_name)s"],
+        "HEAD": ["%(app_label)s.view_%(model_name)s"],
+    }
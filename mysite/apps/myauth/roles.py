@@ -0,0 +1,29 @@
+ADMIN: str = "admin"
+OPERATOR: str = "operator"
+MARKETER: str = "marketer"
+MANAGER: str = "manager"
+
+# Роли пользователей по названиям групп, которые создает MyauthConfig.
+GROUP_ROLES: dict[str, str] = {
+    "Operator": OPERATOR,
+    "Marketer": MARKETER,
+    "Manager": MANAGER,
+}
+
+# Права групп ролей: название группы -> приложение -> коды прав.
+ROLE_PERMISSIONS: dict[str, dict[str, list[str]]] = {
+    "Operator": {
+        "leads": ["view_lead", "add_lead", "change_lead"],
+        "ads": ["view_advertisement"],
+    },
+    "Marketer": {
+        "products": ["view_product", "add_product", "change_product"],
+        "ads": ["view_advertisement", "add_advertisement", "change_advertisement"],
+    },
+    "Manager": {
+        "contracts": ["view_contract", "add_contract", "change_contract"],
+        "leads": ["view_lead"],
+        "customers": ["view_customer", "add_customer", "change_customer"],
+        "ads": ["view_advertisement"],
+    },
+}
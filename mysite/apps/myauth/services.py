@@ -0,0 +1,158 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, models
+
+from apps.ads.models import Advertisement
+from apps.core.cache import ModelVersionService, get_or_set_versioned
+from apps.customers.models import Customer
+from apps.leads.models import Lead
+from apps.products.models import Product
+
+DASHBOARD_COUNTERS_KEY: str = "dashboard:counters"
+PERMISSIONS_KEY_PREFIX: str = "permissions"
+PERMISSIONS_VERSION_KEY: str = "permissions:version"
+
+
+class DashboardCountersService:
+    """
+    Сервис для получения счетчиков главной страницы.
+
+    Счетчики кешируются на DASHBOARD_COUNTERS_TIMEOUT секунд под ключом
+    с версиями считаемых моделей, поэтому после изменения объектов
+    счетчики считаются заново. Для таблиц, оценка
+    размера которых в pg_class превышает
+    DASHBOARD_APPROXIMATE_COUNT_THRESHOLD, вместо COUNT(*) используется
+    эта оценка.
+
+    Attributes:
+        counted_models (dict[str, type[models.Model]]): Имена счетчиков
+        и модели, записи которых они считают.
+    """
+
+    counted_models: dict[str, type[models.Model]] = {
+        "products_count": Product,
+        "advertisements_count": Advertisement,
+        "leads_count": Lead,
+        "customers_count": Customer,
+    }
+
+    @classmethod
+    def get_counters(cls) -> dict[str, int]:
+        """
+        Возвращает счетчики объектов из кеша или считает их заново.
+
+        Returns:
+            dict[str, int]: Количество объектов по именам счетчиков.
+        """
+        return get_or_set_versioned(
+            DASHBOARD_COUNTERS_KEY,
+            cls.counted_models.values(),
+            cls.count,
+            timeout=settings.DASHBOARD_COUNTERS_TIMEOUT,
+        )
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """
+        Сбрасывает закешированные счетчики, увеличивая версии считаемых
+        моделей. Нужно после записи, которая обходит сигналы моделей.
+        """
+        ModelVersionService.bump(*cls.counted_models.values())
+
+    @classmethod
+    def count(cls) -> dict[str, int]:
+        """
+        Считает объекты, используя оценку размера для больших таблиц.
+
+        Returns:
+            dict[str, int]: Количество объектов по именам счетчиков.
+        """
+        estimates = cls.estimate_rows()
+        threshold = settings.DASHBOARD_APPROXIMATE_COUNT_THRESHOLD
+        counters = {}
+        for name, model in cls.counted_models.items():
+            estimate = estimates.get(model._meta.db_table)
+            if threshold is not None and estimate is not None and estimate >= threshold:
+                counters[name] = estimate
+            else:
+                counters[name] = model.objects.count()
+        return counters
+
+    @classmethod
+    def estimate_rows(cls) -> dict[str, int]:
+        """
+        Возвращает оценку количества строк таблиц из статистики PostgreSQL.
+
+        Таблицы, для которых статистика еще не собиралась, пропускаются.
+        Для других СУБД и при отключенном приближенном режиме
+        возвращается пустой словарь.
+
+        Returns:
+            dict[str, int]: Оценка количества строк по именам таблиц.
+        """
+        if (
+            settings.DASHBOARD_APPROXIMATE_COUNT_THRESHOLD is None
+            or connection.vendor != "postgresql"
+        ):
+            return {}
+        tables = [model._meta.db_table for model in cls.counted_models.values()]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relname, reltuples::bigint FROM pg_class "
+                "WHERE oid = ANY(%s::regclass[])",
+                [tables],
+            )
+            return {table: rows for table, rows in cursor.fetchall() if rows >= 0}
+
+
+class PermissionCacheService:
+    """
+    Сервис для кеширования прав пользователей.
+
+    Права пользователя кешируются под ключом, в который входят ID
+    пользователя, признак суперпользователя и общая версия прав. Версия
+    увеличивается при любом изменении состава групп, прав групп или
+    собственных прав пользователей, после чего все прежние ключи
+    перестают использоваться. Как и в ModelVersionService, начальная
+    версия берется из текущего времени, поэтому версия, вытесненная
+    из кеша, не возвращается к значению, под которым еще могут храниться
+    права пользователей.
+    """
+
+    @classmethod
+    def get_version(cls) -> int:
+        """
+        Возвращает текущую версию прав.
+
+        Returns:
+            int: Версия прав.
+        """
+        return cache.get_or_set(PERMISSIONS_VERSION_KEY, time.time_ns, None)
+
+    @classmethod
+    def bump_version(cls) -> None:
+        """
+        Увеличивает версию прав, сбрасывая кеш прав всех пользователей.
+        """
+        try:
+            cache.incr(PERMISSIONS_VERSION_KEY)
+        except ValueError:
+            cache.set(PERMISSIONS_VERSION_KEY, time.time_ns(), None)
+
+    @classmethod
+    def get_key(cls, user) -> str:
+        """
+        Возвращает ключ кеша прав пользователя.
+
+        Args:
+            user (User): Пользователь.
+
+        Returns:
+            str: Ключ кеша.
+        """
+        return (
+            f"{PERMISSIONS_KEY_PREFIX}:{cls.get_version()}:"
+            f"{user.pk}:{int(user.is_superuser)}"
+        )
@@ -0,0 +1,82 @@
+import sys
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Q
+
+from .roles import ROLE_PERMISSIONS
+from .services import PermissionCacheService
+
+
+def permissions_changed(sender, action: str, **kwargs) -> None:
+    """
+    Сбрасывает кеш прав после изменения групп или прав.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        transaction.on_commit(PermissionCacheService.bump_version)
+
+
+def permission_owner_deleted(sender, instance, **kwargs) -> None:
+    """
+    Сбрасывает кеш прав после удаления группы или права.
+    """
+    transaction.on_commit(PermissionCacheService.bump_version)
+
+
+def create_role_groups(sender, apps=global_apps, using: str = "default", **kwargs):
+    """
+    Создает группы ролей и назначает им права из ROLE_PERMISSIONS.
+
+    Все нужные права загружаются одним запросом, а права групп
+    выставляются через set(), поэтому повторный запуск ничего не меняет.
+    Сообщения пишутся в stdout команды migrate.
+    """
+    try:
+        group_model = apps.get_model("auth", "Group")
+        permission_model = apps.get_model("auth", "Permission")
+    except LookupError:
+        return
+
+    condition = Q()
+    for app_permissions in ROLE_PERMISSIONS.values():
+        for app_label, codenames in app_permissions.items():
+            condition |= Q(content_type__app_label=app_label, codename__in=codenames)
+    permission_ids = {
+        (app_label, codename): pk
+        for pk, app_label, codename in permission_model.objects.using(using)
+        .filter(condition)
+        .values_list("pk", "content_type__app_label", "codename")
+    }
+
+    groups = {
+        group.name: group
+        for group in group_model.objects.using(using).filter(name__in=ROLE_PERMISSIONS)
+    }
+    missing_groups = [name for name in ROLE_PERMISSIONS if name not in groups]
+    if missing_groups:
+        group_model.objects.using(using).bulk_create(
+            [group_model(name=name) for name in missing_groups],
+            ignore_conflicts=True,
+        )
+        groups.update(
+            (group.name, group)
+            for group in group_model.objects.using(using).filter(
+                name__in=missing_groups
+            )
+        )
+
+    stdout = kwargs.get("stdout", sys.stdout)
+    for name, app_permissions in ROLE_PERMISSIONS.items():
+        ids = []
+        for app_label, codenames in app_permissions.items():
+            for codename in codenames:
+                pk = permission_ids.get((app_label, codename))
+                if pk is None:
+                    if kwargs.get("verbosity", 1) >= 1:
+                        stdout.write(
+                            f"Permission {app_label}.{codename} does not exist yet.\n"
+                        )
+                else:
+                    ids.append(pk)
+        groups[name].permissions.set(ids)
+    PermissionCacheService.bump_version()
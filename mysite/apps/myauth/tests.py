@@ -1,3 +1,201 @@
-from django.test import TestCase
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.leads.models import Lead
+from apps.products.models import Product
+
+from . import roles
+from .models import User
+from .services import PERMISSIONS_VERSION_KEY, DashboardCountersService
+from .signals import create_role_groups
+
+
+class PermissionCacheTest(TestCase):
+    """
+    Проверяет, что права пользователя кешируются между запросами
+    и кеш сбрасывается при изменении групп.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.group = Group.objects.create(name="Readers")
+        cls.user = User.objects.create_user(username="reader", password="reader")
+        cls.user.groups.add(cls.group)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.client.force_login(self.user)
+        self.url = reverse("products:product_list")
+
+    def permission_queries(self) -> list[str]:
+        """
+        Загружает список продуктов и возвращает запросы к таблицам прав.
+
+        Returns:
+            list[str]: SQL запросов к таблицам прав.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        return [query["sql"] for query in queries if "auth_permission" in query["sql"]]
+
+    def test_permissions_are_loaded_once(self) -> None:
+        self.assertTrue(self.permission_queries())
+        self.assertEqual(self.permission_queries(), [])
+
+    def test_group_change_invalidates_cache(self) -> None:
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.add(Permission.objects.get(codename="view_product"))
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_evicted_version_does_not_restore_old_permissions(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.add(Permission.objects.get(codename="view_product"))
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        # Права остаются в кеше под прежней версией, а сама версия
+        # вытесняется и начинается заново.
+        cache.delete(PERMISSIONS_VERSION_KEY)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.remove(self.group)
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_membership_change_invalidates_cache(self) -> None:
+        self.group.permissions.add(Permission.objects.get(codename="view_product"))
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.remove(self.group)
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+
+class DashboardCountersTest(TestCase):
+    """
+    Проверяет выбор между оценкой размера таблицы и COUNT(*)
+    и кеширование счетчиков главной страницы.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        Product.objects.create(name="Услуга", description="", cost=1)
+        Lead.objects.create(
+            first_name="Иван", last_name="Иванов", phone="1", email="a@example.com"
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_estimate_is_used_only_for_large_tables(self) -> None:
+        estimates = {Lead._meta.db_table: 1000, Product._meta.db_table: 9}
+        with mock.patch.object(
+            DashboardCountersService, "estimate_rows", return_value=estimates
+        ):
+            with override_settings(DASHBOARD_APPROXIMATE_COUNT_THRESHOLD=10):
+                counters = DashboardCountersService.count()
+            self.assertEqual(counters["leads_count"], 1000)
+            self.assertEqual(counters["products_count"], 1)
+            self.assertEqual(counters["customers_count"], 0)
+
+            with override_settings(DASHBOARD_APPROXIMATE_COUNT_THRESHOLD=None):
+                self.assertEqual(DashboardCountersService.count()["leads_count"], 1)
+
+    def test_estimate_is_skipped_outside_postgresql(self) -> None:
+        with override_settings(DASHBOARD_APPROXIMATE_COUNT_THRESHOLD=0):
+            with self.assertNumQueries(0):
+                self.assertEqual(DashboardCountersService.estimate_rows(), {})
+
+    def test_counters_are_cached_until_invalidated(self) -> None:
+        with mock.patch.object(
+            DashboardCountersService, "count", wraps=DashboardCountersService.count
+        ) as count:
+            counters = DashboardCountersService.get_counters()
+            self.assertEqual(counters["leads_count"], 1)
+            with self.assertNumQueries(0):
+                self.assertEqual(DashboardCountersService.get_counters(), counters)
+            self.assertEqual(count.call_count, 1)
+
+            DashboardCountersService.invalidate()
+            DashboardCountersService.get_counters()
+            self.assertEqual(count.call_count, 2)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                Lead.objects.create(
+                    first_name="Петр",
+                    last_name="Петров",
+                    phone="2",
+                    email="b@example.com",
+                )
+            self.assertEqual(DashboardCountersService.get_counters()["leads_count"], 2)
+            self.assertEqual(count.call_count, 3)
+
+
+class UserRolesTest(TestCase):
+    """
+    Проверяет роли пользователей, полученные из групп.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(username="worker", password="worker")
+        cls.user.groups.add(
+            Group.objects.get_or_create(name="Operator")[0],
+            Group.objects.get_or_create(name="Manager")[0],
+        )
+        cls.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="admin"
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def test_roles_come_from_groups(self) -> None:
+        user = User.objects.get(pk=self.user.pk)
+        self.assertEqual(user.roles, {roles.OPERATOR, roles.MANAGER})
+        self.assertTrue(user.has_role(roles.MANAGER, roles.ADMIN))
+        self.assertFalse(user.has_role(roles.ADMIN))
+
+    def test_roles_are_resolved_once(self) -> None:
+        User.objects.get(pk=self.user.pk).roles
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            user.roles
+            user.has_role(roles.OPERATOR)
+
+    def test_user_view_requires_admin_role(self) -> None:
+        url = reverse("users")
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_repeated_migrate_keeps_role_groups(self) -> None:
+        def snapshot() -> dict[str, set[str]]:
+            return {
+                group.name: {
+                    permission.codename for permission in group.permissions.all()
+                }
+                for group in Group.objects.filter(name__in=roles.ROLE_PERMISSIONS)
+            }
+
+        before = snapshot()
+        self.assertEqual(set(before), set(roles.ROLE_PERMISSIONS))
+        output = StringIO()
+        call_command("migrate", verbosity=0, stdout=output)
+        self.assertEqual(snapshot(), before)
+        self.assertEqual(output.getvalue(), "")
+
+        permissions = {"Operator": {"leads": ["view_lead", "missing_permission"]}}
+        with mock.patch.dict(roles.ROLE_PERMISSIONS, permissions, clear=True):
+            create_role_groups(None, stdout=output)
+        self.assertEqual(
+            output.getvalue(),
+            "Permission leads.missing_permission does not exist yet.\n",
+        )
+        self.assertEqual(snapshot()["Operator"], {"view_lead"})
@@ -13,5 +13,6 @@ urlpatterns = [
         name="login",
     ),
     path("accounts/logout/", views.custom_logout, name="logout"),
+    path("api/users/", views.UserView.as_view(), name="users"),
     path("", views.index, name="index"),
 ]
@@ -2,15 +2,12 @@ from django.contrib.auth import logout
 from django.contrib.auth.decorators import login_required
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.ads.models import Advertisement
-from apps.customers.models import Customer
-from apps.leads.models import Lead
-from apps.products.models import Product
-
 from .permissions import IsAdmin
+from .services import DashboardCountersService
 
 
 class UserView(APIView):
@@ -24,10 +21,13 @@ class UserView(APIView):
 
     permission_classes: list = [IsAdmin]
 
-    def get(self) -> Response:
+    def get(self, request: Request) -> Response:
         """
         Возвращает список пользователей.
 
+        Args:
+            request (Request): Запрос.
+
         Returns:
             Response: Ответ с сообщением.
         """
@@ -65,17 +65,7 @@ def index(request: HttpRequest) -> HttpResponse:
         или сообщение об ошибке.
     """
     try:
-        products_count: int = Product.objects.count()
-        advertisements_count: int = Advertisement.objects.count()
-        leads_count: int = Lead.objects.count()
-        customers_count: int = Customer.objects.count()
-
-        context: dict = {
-            "products_count": products_count,
-            "advertisements_count": advertisements_count,
-            "leads_count": leads_count,
-            "customers_count": customers_count,
-        }
+        context: dict = DashboardCountersService.get_counters()
 
         return render(request, "users/index.html", context)
     except Exception:
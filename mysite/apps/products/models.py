@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from django.db import models
 
 
@@ -9,6 +11,7 @@ class Product(models.Model):
         name (str): Название продукта.
         description (str): Описание продукта.
         cost (Decimal): Стоимость продукта.
+        updated_at (datetime): Время последнего изменения продукта.
     """
 
     name: str = models.CharField(max_length=200, verbose_name="Название")
@@ -16,6 +19,7 @@ class Product(models.Model):
     cost: models.DecimalField = models.DecimalField(
         max_digits=10, decimal_places=2, verbose_name="Стоимость"
     )
+    updated_at: datetime = models.DateTimeField(auto_now=True, verbose_name="Изменен")
 
     class Meta:
         """
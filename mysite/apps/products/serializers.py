@@ -0,0 +1,13 @@
+from apps.core.api import SparseFieldsetSerializer
+
+from .models import Product
+
+
+class ProductSerializer(SparseFieldsetSerializer):
+    """
+    Сериализатор услуги для API.
+    """
+
+    class Meta:
+        model = Product
+        fields = ["id", "name", "description", "cost", "updated_at"]
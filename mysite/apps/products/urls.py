@@ -1,6 +1,7 @@
 from django.urls import path
 
 from .views import (
+    ProductAutocompleteView,
     ProductCreateView,
     ProductDeleteView,
     ProductDetailView,
@@ -13,6 +14,9 @@ app_name = "products"
 
 urlpatterns = [
     path("", ProductListView.as_view(), name="product_list"),
+    path(
+        "autocomplete/", ProductAutocompleteView.as_view(), name="product_autocomplete"
+    ),
     path("new/", ProductCreateView.as_view(), name="product_create"),
     path("<int:pk>/", ProductDetailView.as_view(), name="product_detail"),
     path("<int:pk>/edit/", ProductUpdateView.as_view(), name="product_update"),
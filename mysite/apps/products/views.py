@@ -10,11 +10,19 @@ from django.views.generic import (
     UpdateView,
 )
 
+from apps.core.api import CrmModelViewSet
+from apps.core.mixins import QueryShapeMixin, SearchMixin
+from apps.core.pagination import KeysetPaginationMixin
+from apps.core.views import AutocompleteView
+
 from .forms import ProductForm
 from .models import Product
+from .serializers import ProductSerializer
 
 
-class ProductListView(PermissionRequiredMixin, ListView):
+class ProductListView(
+    PermissionRequiredMixin, QueryShapeMixin, KeysetPaginationMixin, ListView
+):
     """
     Представление для отображения списка продуктов.
 
@@ -25,12 +33,14 @@ class ProductListView(PermissionRequiredMixin, ListView):
         для списка продуктов.
         permission_required (str): Необходимое разрешение
         для доступа к представлению.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
     """
 
     model: Product = Product
     template_name: str = "products-list.html"
     context_object_name: str = "products"
     permission_required: str = "products.view_product"
+    only_fields: tuple[str, ...] = ("id", "name")
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
@@ -40,7 +50,7 @@ class ProductListView(PermissionRequiredMixin, ListView):
         return redirect(reverse_lazy("index"))
 
 
-class ProductDetailView(PermissionRequiredMixin, DetailView):
+class ProductDetailView(PermissionRequiredMixin, QueryShapeMixin, DetailView):
     """
     Представление для отображения детальной информации о продукте.
 
@@ -51,12 +61,14 @@ class ProductDetailView(PermissionRequiredMixin, DetailView):
         для объекта продукта.
         permission_required (str): Необходимое разрешение
         для доступа к представлению.
+        only_fields (tuple[str, ...]): Поля, которые использует шаблон.
     """
 
     model: Product = Product
     template_name: str = "products-detail.html"
     context_object_name: str = "object"
     permission_required: str = "products.view_product"
+    only_fields: tuple[str, ...] = ("id", "name", "description", "cost")
 
     def handle_no_permission(self) -> HttpResponseRedirect:
         """
@@ -152,3 +164,43 @@ class ProductDeleteView(PermissionRequiredMixin, DeleteView):
         Перенаправляет пользователя на список продуктов.
         """
         return redirect(reverse_lazy("products:product_list"))
+
+
+class ProductAutocompleteView(AutocompleteView):
+    """
+    Эндпоинт автодополнения для выбора услуг в формах.
+
+    Attributes:
+        model (Product): Модель, по которой идет поиск.
+        permission_required (tuple[str, ...]): Права, любого из которых
+        достаточно для доступа: просмотр услуг или работа с формами
+        контрактов и рекламных кампаний, в которых выбирается услуга.
+        search_fields (tuple[str, ...]): Поля для поиска по префиксу.
+        only_fields (tuple[str, ...]): Поля, нужные для названия объекта.
+    """
+
+    model: Product = Product
+    permission_required: tuple[str, ...] = (
+        "products.view_product",
+        "contracts.add_contract",
+        "contracts.change_contract",
+        "ads.add_advertisement",
+        "ads.change_advertisement",
+    )
+    search_fields: tuple[str, ...] = ("name",)
+    only_fields: tuple[str, ...] = ("id", "name")
+
+
+class ProductViewSet(SearchMixin, CrmModelViewSet):
+    """
+    API услуг.
+
+    Attributes:
+        queryset (QuerySet): Услуги.
+        serializer_class (type): Сериализатор услуги.
+        search_fields (tuple[str, ...]): Поля для поиска ?q=.
+    """
+
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    search_fields: tuple[str, ...] = ("name",)
@@ -11,16 +11,20 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "rest_framework",
     "apps.ads.apps.AdsConfig",
     "apps.contracts.apps.ContractsConfig",
     "apps.customers.apps.CustomersConfig",
     "apps.leads.apps.LeadsConfig",
     "apps.products.apps.ProductsConfig",
     "apps.myauth.apps.MyauthConfig",
+    "apps.core.apps.CoreConfig",
     "django_cleanup",
 ]
 
 MIDDLEWARE = [
+    "apps.core.middleware.MetricsMiddleware",
+    "apps.core.routers.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -34,7 +38,7 @@ ROOT_URLCONF = "mysite.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "apps.core.template_backends.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "templates/base"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -80,3 +84,68 @@ LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/accounts/login/"
 
 AUTH_USER_MODEL = "myauth.User"
+
+# Общий кеш CRM. В prod.py вместо памяти процесса можно выбрать Redis
+# или файловый кеш, общий для всех процессов сервера
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "KEY_PREFIX": "crm",
+    }
+}
+# Время жизни значений, ключи которых зависят от версий моделей
+# (apps.core.cache), в секундах. После изменения модели такие значения
+# не сбрасываются, а перестают использоваться и вытесняются по времени
+VERSIONED_CACHE_TIMEOUT = 300
+
+# Время жизни кеша счетчиков главной страницы, в секундах
+DASHBOARD_COUNTERS_TIMEOUT = 60
+# Таблицы, в которых по статистике PostgreSQL больше строк,
+# считаются приблизительно по pg_class.reltuples (None - всегда точно)
+DASHBOARD_APPROXIMATE_COUNT_THRESHOLD = None
+
+# Сколько кампаний можно запросить в одном запросе временных рядов
+ADS_SERIES_MAX_CAMPAIGNS = 50
+
+# Максимальный размер документа контракта, в байтах
+CONTRACT_DOCUMENT_MAX_SIZE = 50 * 1024 * 1024
+# Префикс internal location nginx, через который документы отдаются
+# заголовком X-Accel-Redirect (None - файл отдает сам Django)
+CONTRACT_DOCUMENT_ACCEL_REDIRECT = None
+# За сколько дней до окончания контракт считается истекающим
+CONTRACT_EXPIRING_DAYS = 30
+
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
+}
+
+# Максимальное количество элементов в одном запросе массовой записи API
+API_BULK_MAX_ITEMS = 1000
+
+AUTHENTICATION_BACKENDS = ["apps.myauth.backends.CachedModelBackend"]
+# Время жизни кеша прав пользователей, в секундах. Кеш сбрасывается
+# при изменении групп и прав; для нескольких процессов нужен общий
+# бэкенд кеша
+PERMISSIONS_CACHE_TIMEOUT = 300
+
+# Доля запросов, для которых MetricsMiddleware собирает метрики
+# (0 - выключено, 1 - все запросы)
+METRICS_SAMPLE_RATE = 0.1
+# Токен для сбора метрик Prometheus без входа в CRM (None - только администраторы)
+METRICS_TOKEN = None
+# Сколько раз один и тот же запрос должен выполниться за запрос к странице,
+# чтобы попасть в лог как возможный N+1 (None - не писать в лог)
+METRICS_DUPLICATE_QUERY_THRESHOLD = 10
+
+DATABASE_ROUTERS = ["apps.core.routers.ReplicaRouter"]
+# Псевдонимы баз-реплик из DATABASES, с которых читают отчетные
+# представления, выгрузки и сервисы статистики (пустой список - все
+# запросы идут в default)
+DATABASE_REPLICAS: list[str] = []
+# Сколько секунд после изменяющего запроса клиент читает только
+# с основной базы, чтобы видеть свои изменения до того, как их получит реплика
+REPLICA_PIN_SECONDS = 5
+REPLICA_PIN_COOKIE = "primary_pin"
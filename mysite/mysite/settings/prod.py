@@ -1,3 +1,5 @@
+import os
+
 from .base import *
 
 DEBUG = True
@@ -22,7 +24,69 @@ DATABASES = {
         "PASSWORD": PASSWORD,
         "HOST": "localhost",
         "PORT": "5432",
+        # Соединение переиспользуется между запросами CONN_MAX_AGE секунд
+        # и проверяется перед повторным использованием
+        "CONN_MAX_AGE": int(os.environ.get("DATABASE_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": os.environ.get("DATABASE_CONN_HEALTH_CHECKS", "1") == "1",
+        # За PgBouncer в режиме transaction серверные курсоры
+        # (QuerySet.iterator()) нужно отключить
+        "DISABLE_SERVER_SIDE_CURSORS": os.environ.get(
+            "DATABASE_DISABLE_SERVER_SIDE_CURSORS", "0"
+        )
+        == "1",
+        "OPTIONS": {},
+    }
+}
+
+# Пул соединений Django 5.1 (нужен psycopg 3: pip install "psycopg[pool]").
+# С пулом постоянные соединения отключаются: соединение возвращается
+# в пул в конце каждого запроса
+if os.environ.get("DATABASE_POOL", "0") == "1":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.environ.get("DATABASE_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.environ.get("DATABASE_POOL_MAX_SIZE", "10")),
+        # Сколько секунд запрос ждет свободное соединение
+        "timeout": float(os.environ.get("DATABASE_POOL_TIMEOUT", "10")),
+        # Через сколько секунд простоя лишние соединения закрываются
+        "max_idle": float(os.environ.get("DATABASE_POOL_MAX_IDLE", "600")),
+        # Через сколько секунд соединение пересоздается
+        "max_lifetime": float(os.environ.get("DATABASE_POOL_MAX_LIFETIME", "3600")),
     }
+
+# Реплики для чтения отчетов: хосты через запятую (host или host:port)
+# с теми же базой и пользователем, что у default
+DATABASE_REPLICAS = []
+for number, address in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_HOSTS", "").split(",")), start=1
+):
+    host, _, port = address.strip().partition(":")
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+# Общий кеш: CACHE_BACKEND=redis (нужен пакет redis, адрес в CACHE_LOCATION)
+# или file (каталог в CACHE_LOCATION); без переменной - память процесса
+CACHE_BACKENDS = {
+    "redis": (
+        "django.core.cache.backends.redis.RedisCache",
+        "redis://127.0.0.1:6379/1",
+    ),
+    "file": (
+        "django.core.cache.backends.filebased.FileBasedCache",
+        str(BASE_DIR / "cache"),
+    ),
 }
+if os.environ.get("CACHE_BACKEND") in CACHE_BACKENDS:
+    backend, location = CACHE_BACKENDS[os.environ["CACHE_BACKEND"]]
+    CACHES["default"].update(
+        BACKEND=backend, LOCATION=os.environ.get("CACHE_LOCATION", location)
+    )
 
 STATIC_ROOT = BASE_DIR / "staticfiles"
@@ -17,9 +17,26 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from apps.ads.views import AdvertisementViewSet
+from apps.contracts.views import ContractViewSet
+from apps.core.views import MetricsView
+from apps.customers.views import CustomerViewSet
+from apps.leads.views import LeadViewSet
+from apps.products.views import ProductViewSet
+
+router = DefaultRouter()
+router.register("products", ProductViewSet, basename="api-product")
+router.register("ads", AdvertisementViewSet, basename="api-advertisement")
+router.register("leads", LeadViewSet, basename="api-lead")
+router.register("contracts", ContractViewSet, basename="api-contract")
+router.register("customers", CustomerViewSet, basename="api-customer")
 
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path("api/", include(router.urls)),
     path("ads/", include("apps.ads.urls")),
     path("contracts/", include("apps.contracts.urls")),
     path("customers/", include("apps.customers.urls")),